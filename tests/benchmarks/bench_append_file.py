@@ -0,0 +1,92 @@
+"""
+Benchmark comparing the methods used to concatenate VOD parts into merged.ts.
+
+Creates a synthetic VOD of 5,000 parts and times concatenating them with reflinks, copy_file_range(), sendfile()
+and copying through Python. Reflinks are only supported on copy-on-write filesystems such as btrfs or XFS, so run
+with `--directory` on one of these to include them.
+
+Usage: python -m tests.benchmarks.bench_append_file [--parts 5000] [--part-size 262144] [--directory DIR]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from twitcharchiver.utils import (
+    _copy_buffered,
+    _copy_file_range,
+    _reflink,
+    _sendfile,
+    append_file,
+)
+
+
+def create_parts(parts_dir: Path, parts: int, part_size: int):
+    """
+    Writes random parts of the given size to the parts directory.
+    """
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    for _id in range(parts):
+        Path(parts_dir, f"{_id:05d}.ts").write_bytes(os.urandom(part_size))
+
+
+def concatenate(parts_dir: Path, merged_path: Path, methods: list):
+    """
+    Concatenates every part into the merged file using the given copy methods, returning the time taken.
+    """
+    _start = perf_counter()
+    with open(merged_path, "wb") as _merged_file:
+        for _part in sorted(parts_dir.glob("*.ts")):
+            append_file(_part, _merged_file, methods)
+
+        os.fsync(_merged_file.fileno())
+
+    return perf_counter() - _start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--parts", type=int, default=5000)
+    parser.add_argument("--part-size", type=int, default=262144)
+    parser.add_argument("--directory", type=str, default=None)
+    args = parser.parse_args()
+
+    _work_dir = Path(tempfile.mkdtemp(dir=args.directory))
+    try:
+        _parts_dir = Path(_work_dir, "parts")
+        create_parts(_parts_dir, args.parts, args.part_size)
+        _total = args.parts * args.part_size
+        print(
+            f"{args.parts} parts, {_total / 1048576:.0f} MiB total, in '{_work_dir}'."
+        )
+
+        for _name, _methods in [
+            ("reflink", [_reflink]),
+            ("copy_file_range", [_copy_file_range]),
+            ("sendfile", [_sendfile]),
+            ("copyfileobj", [_copy_buffered]),
+        ]:
+            _merged_path = Path(_work_dir, "merged.ts")
+            try:
+                _elapsed = concatenate(_parts_dir, _merged_path, _methods)
+
+            except OSError as exc:
+                print(f"{_name:>16}: not supported ({exc.strerror})")
+                continue
+
+            finally:
+                _merged_path.unlink(missing_ok=True)
+
+            print(
+                f"{_name:>16}: {_elapsed:.2f}s ({_total / 1048576 / _elapsed:.0f} MiB/s)"
+            )
+
+    finally:
+        shutil.rmtree(_work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
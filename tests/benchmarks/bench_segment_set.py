@@ -0,0 +1,58 @@
+"""
+Benchmark comparing the memory used and gap search time of segment bookkeeping.
+
+Creates the completed segments of a synthetic VOD (17,280 segments for a 48 hour stream) with a few missing, and
+compares a set of MpegSegments searched with set(range()) to a SegmentSet bitmap.
+
+Usage: python -m tests.benchmarks.bench_segment_set [--segments 17280] [--gaps 10]
+"""
+
+import argparse
+import random
+import tracemalloc
+from time import perf_counter
+
+from twitcharchiver.twitch import MpegSegment, SegmentSet
+
+
+def measure(build, find_gaps):
+    """
+    Builds a collection of segments and searches it for gaps, returning the memory used, search time and gaps found.
+    """
+    tracemalloc.start()
+    _segments = build()
+    _memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    _start = perf_counter()
+    _gaps = find_gaps(_segments)
+    return _memory, perf_counter() - _start, sorted(_gaps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segments", type=int, default=17280)
+    parser.add_argument("--gaps", type=int, default=10)
+    args = parser.parse_args()
+
+    _missing = set(random.sample(range(args.segments - 1), args.gaps))
+    _ids = [_id for _id in range(args.segments) if _id not in _missing]
+
+    def _find_set_gaps(segments):
+        _final_id = max(_s.id for _s in segments)
+        return set(range(_final_id + 1)).difference(_s.id for _s in segments)
+
+    _results = {
+        "set[MpegSegment]": measure(
+            lambda: {MpegSegment(_id, 10) for _id in _ids}, _find_set_gaps
+        ),
+        "SegmentSet": measure(lambda: SegmentSet(_ids), lambda s: s.missing()),
+    }
+
+    for _name, (_memory, _elapsed, _gaps) in _results.items():
+        assert _gaps == sorted(_missing)
+        print(f"{_name:<18} {_memory / 1024:10.1f} KiB {_elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from twitcharchiver.api import Api, GQL_BATCH_SIZE
+from twitcharchiver.exceptions import TwitchAPIError
+from twitcharchiver.vod import Vod
+
+
+def _response(json):
+    _r = MagicMock()
+    _r.json.return_value = json
+    return _r
+
+
+def _video_result(**video):
+    return {"data": {"video": video}}
+
+
+class TestGqlBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        # results aren't cached between tests
+        _patcher = patch.object(Api(), "cache", None)
+        _patcher.start()
+        self.addCleanup(_patcher.stop)
+
+    def test_results_returned_in_order(self):
+        _operations = [Api.gql_operation(f"Op{_i}", "hash", {}) for _i in range(3)]
+        _results = [{"data": {"n": _i}} for _i in range(3)]
+
+        with patch.object(
+            Api, "post_request", return_value=_response(_results)
+        ) as mock_post:
+            self.assertEqual(_results, Api().gql_batch(_operations))
+
+        mock_post.assert_called_once()
+        self.assertEqual(_operations, mock_post.call_args.kwargs["j"])
+
+    def test_operations_split_into_batches(self):
+        _operations = [{"query": str(_i)} for _i in range(GQL_BATCH_SIZE + 5)]
+
+        def _post(url, j=None, h=None):
+            return _response([{"data": _op["query"]} for _op in j])
+
+        with patch.object(Api, "post_request", side_effect=_post) as mock_post:
+            _results = Api().gql_batch(_operations)
+
+        self.assertEqual(2, mock_post.call_count)
+        self.assertEqual(
+            [str(_i) for _i in range(GQL_BATCH_SIZE + 5)],
+            [_r["data"] for _r in _results],
+        )
+
+    @patch("twitcharchiver.api.sleep")
+    def test_only_failed_operations_retried(self, mock_sleep):
+        _operations = [{"query": "a"}, {"query": "b"}]
+        _responses = [
+            _response([{"data": "a"}, {"errors": ["service error"]}]),
+            _response([{"data": "b"}]),
+        ]
+
+        with patch.object(
+            Api, "post_request", side_effect=_responses
+        ) as mock_post:
+            _results = Api().gql_batch(_operations)
+
+        self.assertEqual([{"data": "a"}, {"data": "b"}], _results)
+        self.assertEqual([{"query": "b"}], mock_post.call_args.kwargs["j"])
+
+    def test_mismatched_results_raise_error(self):
+        with patch.object(
+            Api, "post_request", return_value=_response([{"data": "a"}])
+        ):
+            with self.assertRaises(TwitchAPIError):
+                Api().gql_batch([{"query": "a"}, {"query": "b"}])
+
+    def test_errors_returned_after_final_attempt(self):
+        with patch.object(
+            Api, "post_request", return_value=_response([{"errors": ["failed"]}])
+        ) as mock_post:
+            _results = Api().gql_batch([{"query": "a"}], attempts=1)
+
+        mock_post.assert_called_once()
+        self.assertEqual([{"errors": ["failed"]}], _results)
+
+
+class TestVodPrefetch(unittest.TestCase):
+    def setUp(self) -> None:
+        _patcher = patch.object(Api(), "cache", None)
+        _patcher.start()
+        self.addCleanup(_patcher.stop)
+
+        self.results = [
+            # metadata
+            _video_result(
+                id="1",
+                game={"id": "743", "name": "Chess"},
+                lengthSeconds=60,
+                publishedAt="2024-01-01T00:00:00Z",
+                previewThumbnailURL="https://static-cdn.jtvnw.net/cf_vods/d2nvs31859zcd8/abc_user_123_456/thumb/thumb0-320x180.jpg",
+                title="title",
+                viewCount=0,
+            ),
+            # streaming
+            _video_result(game={"id": "743", "name": "Chess"}, owner=None),
+            # chapters
+            {"errors": ["service error"]},
+            # muted segments
+            _video_result(muteInfo={"mutedSegmentConnection": None}),
+            # seek preview
+            _video_result(seekPreviewsURL=""),
+            # access token
+            {"data": {"videoPlaybackAccessToken": {"value": "v", "signature": "s"}}},
+        ]
+
+    def test_vod_resolved_in_single_request(self):
+        with patch.object(
+            Api, "post_request", return_value=_response(self.results)
+        ) as mock_post, patch.object(Api, "gql_request") as mock_gql:
+            _vod = Vod(1)
+
+            self.assertEqual("title", _vod.title)
+            self.assertEqual("Chess", _vod.get_category().name)
+            self.assertEqual([], _vod.get_muted_segments())
+            self.assertEqual(
+                {"value": "v", "signature": "s"}, _vod._get_playback_access_token()
+            )
+            self.assertFalse(_vod.channel)
+
+        mock_post.assert_called_once()
+        self.assertEqual(6, len(mock_post.call_args.kwargs["j"]))
+        mock_gql.assert_not_called()
+
+    def test_failed_operation_requested_individually(self):
+        _chapters = _video_result(
+            moments={
+                "edges": [
+                    {
+                        "node": {
+                            "id": "1",
+                            "description": "Chess",
+                            "type": "GAME_CHANGE",
+                            "positionMilliseconds": 0,
+                            "durationMilliseconds": 60000,
+                        }
+                    }
+                ]
+            }
+        )
+
+        with patch.object(
+            Api, "post_request", return_value=_response(self.results)
+        ), patch.object(
+            Api, "gql_request", return_value=_response([_chapters])
+        ) as mock_gql:
+            _vod = Vod(1)
+            self.assertEqual(["Chess"], [_m.description for _m in _vod.chapters])
+
+        self.assertEqual(
+            "VideoPlayer_ChapterSelectButtonVideo", mock_gql.call_args.args[0]
+        )
+
+    @patch("twitcharchiver.vod.monotonic")
+    def test_prefetched_results_expire(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        with patch.object(Api, "post_request", return_value=_response(self.results)):
+            _vod = Vod(1)
+
+        mock_monotonic.return_value = 1000.0
+        with patch.object(
+            Api,
+            "gql_request",
+            return_value=_response(
+                [_video_result(muteInfo={"mutedSegmentConnection": None})]
+            ),
+        ) as mock_gql:
+            _vod.get_muted_segments()
+
+        mock_gql.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
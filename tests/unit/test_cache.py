@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from itertools import count
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from twitcharchiver.api import Api
+from twitcharchiver.cache import ResponseCache
+
+
+def _operation(name: str, vod_id: str = "1"):
+    return Api.gql_operation(name, "hash", {"videoID": vod_id})
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(
+            Path(self._dir.name, "cache.db"), {"Cached": 60}, max_entries=2
+        )
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self._dir.cleanup()
+
+    def test_result_cached_until_expired(self):
+        with patch("twitcharchiver.cache.time", return_value=100.0):
+            self.cache.put(_operation("Cached"), {"data": 1})
+            self.assertEqual({"data": 1}, self.cache.get(_operation("Cached")))
+            self.assertIsNone(self.cache.get(_operation("Cached", "2")))
+
+        with patch("twitcharchiver.cache.time", return_value=161.0):
+            self.assertIsNone(self.cache.get(_operation("Cached")))
+
+    def test_operations_without_ttl_not_cached(self):
+        self.cache.put(_operation("Uncached"), {"data": 1})
+        self.cache.put({"query": "{}"}, {"data": 1})
+
+        self.assertIsNone(self.cache.get(_operation("Uncached")))
+        self.assertIsNone(self.cache.get({"query": "{}"}))
+
+    def test_live_operations_use_live_ttl(self):
+        cache = ResponseCache(
+            Path(self._dir.name, "live.db"), {"Cached": 60}, live_ttls={"Cached": 5}
+        )
+        _live = Api.gql_operation("Cached", "hash", {"channel": "a", "isLive": True})
+
+        with patch("twitcharchiver.cache.time", return_value=100.0):
+            cache.put(_live, {"data": 1})
+            cache.put(_operation("Cached"), {"data": 2})
+
+        with patch("twitcharchiver.cache.time", return_value=106.0):
+            self.assertIsNone(cache.get(_live))
+            self.assertEqual({"data": 2}, cache.get(_operation("Cached")))
+
+        cache.close()
+
+    def test_least_recently_used_evicted(self):
+        with patch("twitcharchiver.cache.time", side_effect=count(1.0)):
+            self.cache.put(_operation("Cached", "1"), {"data": 1})
+            self.cache.put(_operation("Cached", "2"), {"data": 2})
+            # VOD 1 is used more recently than VOD 2
+            self.cache.get(_operation("Cached", "1"))
+            self.cache.put(_operation("Cached", "3"), {"data": 3})
+
+            self.assertIsNotNone(self.cache.get(_operation("Cached", "1")))
+            self.assertIsNone(self.cache.get(_operation("Cached", "2")))
+            self.assertIsNotNone(self.cache.get(_operation("Cached", "3")))
+
+    def test_invalidate_vod(self):
+        self.cache.put(_operation("Cached", "1"), {"data": 1})
+        self.cache.put(_operation("Cached", "2"), {"data": 2})
+        self.cache.invalidate(vod_id=1)
+
+        self.assertIsNone(self.cache.get(_operation("Cached", "1")))
+        self.assertIsNotNone(self.cache.get(_operation("Cached", "2")))
+
+    def test_cached_results_used_by_api(self):
+        _result = {"data": {"video": None}}
+        _r = MagicMock()
+        _r.json.return_value = [_result]
+
+        with patch.object(Api(), "cache", self.cache), patch.object(
+            Api, "gql_request", return_value=_r
+        ) as mock_gql, patch.object(Api, "post_request") as mock_post:
+            self.assertEqual(_result, Api().gql_query(_operation("Cached")))
+            self.assertEqual(_result, Api().gql_query(_operation("Cached")))
+            self.assertEqual([_result], Api().gql_batch([_operation("Cached")]))
+
+        mock_gql.assert_called_once()
+        mock_post.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
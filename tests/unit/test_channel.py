@@ -1,6 +1,11 @@
+import tempfile
 import tracemalloc
 import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
 
+from twitcharchiver.api import Api
+from twitcharchiver.cache import ResponseCache
 from twitcharchiver.channel import Channel
 from twitcharchiver.exceptions import StreamOfflineError
 
@@ -42,5 +47,136 @@ class TestChannel(unittest.TestCase):
         self.assertEqual(745, len(self.channel_b.get_channel_archives()))
 
 
+class TestChannelListing(unittest.TestCase):
+    """
+    Tests listing a channel's videos against mocked pages of 3 videos, newest first.
+    """
+
+    def setUp(self) -> None:
+        self.channel = Channel()
+        self.channel.name = "channel"
+        self.pages = [[12, 11, 10], [9, 8, 7], [6, 5, 4], [3, 2, 1]]
+
+    def _page(self, operation, query_hash, variables, *args):
+        _index = int(variables.get("cursor", 0))
+        _r = MagicMock()
+        _r.json.return_value = [
+            {
+                "data": {
+                    "user": {
+                        "videos": {
+                            "edges": [
+                                {
+                                    "cursor": str(_index + 1),
+                                    "node": {
+                                        "id": str(_id),
+                                        "game": None,
+                                        "lengthSeconds": 0,
+                                        "publishedAt": "2024-01-01T00:00:00Z",
+                                        "previewThumbnailURL": "",
+                                        "title": "",
+                                        "viewCount": 0,
+                                    },
+                                }
+                                for _id in self.pages[_index]
+                            ],
+                            "pageInfo": {
+                                "hasNextPage": _index + 1 < len(self.pages)
+                            },
+                        }
+                    }
+                }
+            }
+        ]
+        return _r
+
+    def _list(self, *args):
+        with patch.object(Api, "gql_request", side_effect=self._page) as mock_gql:
+            _videos = self.channel.get_channel_archives(*args)
+
+        return [_v.v_id for _v in _videos], mock_gql.call_count
+
+    def test_full_listing(self):
+        self.assertEqual((list(range(12, 0, -1)), 4), self._list())
+
+    def test_listing_stops_at_known_vod(self):
+        self.assertEqual((list(range(12, 6, -1)), 2), self._list({8, 5}))
+
+    def test_listing_continues_to_oldest_required(self):
+        self.assertEqual((list(range(12, 3, -1)), 3), self._list({8}, 5))
+
+
+class TestChannelWatchCache(unittest.TestCase):
+    """
+    Tests that a channel's state is only requested once by consecutive checks within the watch mode poll interval.
+    """
+
+    _results = {
+        "ChannelShell": {
+            "data": {
+                "userOrError": {
+                    "id": "1",
+                    "login": "channel",
+                    "displayName": "Channel",
+                    "stream": None,
+                }
+            }
+        },
+        "ComscoreStreamingQuery": {"data": {"user": None}},
+        "FilterableVideoTower_Videos": {
+            "data": {
+                "user": {"videos": {"edges": [], "pageInfo": {"hasNextPage": False}}}
+            }
+        },
+    }
+
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(Path(self._dir.name, "cache.db"))
+        self.channel = Channel(owner=self._results["ChannelShell"]["data"]["userOrError"])
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self._dir.cleanup()
+
+    def _post(self, url, j, h):
+        _r = MagicMock()
+        _r.json.return_value = [self._results[j[0]["operationName"]]]
+        return _r
+
+    def _poll(self, mock_post, now, force_refresh=False):
+        with patch("twitcharchiver.cache.time", return_value=now):
+            self.channel.get_channel_archives()
+            self.channel.get_stream_info()
+            self.channel.is_live(force_refresh=force_refresh)
+
+        return [_c.kwargs["j"][0]["operationName"] for _c in mock_post.call_args_list]
+
+    def test_two_polls_make_one_request(self):
+        with patch.object(Api(), "cache", self.cache), patch.object(
+            Api, "post_request", side_effect=self._post
+        ) as mock_post, patch("twitcharchiver.channel.time_since_date", return_value=61):
+            _operations = self._poll(mock_post, 100.0)
+            self.assertEqual(_operations, self._poll(mock_post, 105.0))
+
+            # results are fetched again by the next check
+            self.assertEqual(_operations * 2, self._poll(mock_post, 110.0))
+
+        self.assertEqual(
+            ["FilterableVideoTower_Videos", "ComscoreStreamingQuery", "ChannelShell"],
+            _operations,
+        )
+
+    def test_forced_live_check_bypasses_cache(self):
+        with patch.object(Api(), "cache", self.cache), patch.object(
+            Api, "post_request", side_effect=self._post
+        ) as mock_post:
+            self._poll(mock_post, 100.0, force_refresh=True)
+            _operations = self._poll(mock_post, 105.0, force_refresh=True)
+
+        self.assertEqual(2, _operations.count("ChannelShell"))
+        self.assertEqual(1, _operations.count("ComscoreStreamingQuery"))
+
+
 if __name__ == "__main__":
     unittest.main()
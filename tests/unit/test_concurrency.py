@@ -0,0 +1,62 @@
+import pickle
+import unittest
+
+from twitcharchiver.concurrency import AdaptiveConcurrency
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def test_additive_increase(self):
+        controller = AdaptiveConcurrency(initial=4, minimum=1, maximum=10)
+        # one full round of successful downloads adds roughly one slot
+        for _ in range(4):
+            controller.record_success(1048576, 1.0)
+
+        self.assertEqual(4, controller.limit)
+        controller.record_success(1048576, 1.0)
+        self.assertEqual(5, controller.limit)
+
+    def test_increase_capped_at_maximum(self):
+        controller = AdaptiveConcurrency(initial=4, minimum=1, maximum=5)
+        for _ in range(100):
+            controller.record_success(1048576, 1.0)
+
+        self.assertEqual(5, controller.limit)
+
+    def test_multiplicative_decrease_once_per_round(self):
+        controller = AdaptiveConcurrency(initial=16, minimum=2, maximum=32)
+        controller.record_error()
+        self.assertEqual(8, controller.limit)
+
+        # further errors within the same round are ignored
+        controller.record_error()
+        self.assertEqual(8, controller.limit)
+
+    def test_decrease_capped_at_minimum(self):
+        controller = AdaptiveConcurrency(initial=4, minimum=3, maximum=32)
+        controller.record_error()
+        self.assertEqual(3, controller.limit)
+
+    def test_slow_downloads_decrease_limit(self):
+        controller = AdaptiveConcurrency(initial=10, minimum=1, maximum=32)
+        for _ in range(20):
+            controller.record_success(1048576, 1.0)
+        _limit = controller.limit
+
+        for _ in range(5):
+            controller.record_success(1048576, 10.0)
+
+        self.assertLess(controller.limit, _limit)
+
+    def test_pickle(self):
+        controller = AdaptiveConcurrency(initial=4, minimum=1, maximum=10)
+        controller.acquire()
+
+        copy = pickle.loads(pickle.dumps(controller))
+        self.assertEqual(4, copy.limit)
+        # slots held in the original process aren't carried over
+        with copy:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
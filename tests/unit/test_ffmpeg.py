@@ -0,0 +1,104 @@
+import io
+import subprocess
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from twitcharchiver.ffmpeg import MAX_PROCESSES, FFmpeg
+
+
+def _mock_process(stdout: bytes, stderr: bytes, returncode: int = 0):
+    _process = MagicMock()
+    _process.__enter__.return_value = _process
+    _process.stdout = io.BytesIO(stdout)
+    _process.stderr = io.BytesIO(stderr)
+    _process.returncode = returncode
+    return _process
+
+
+class TestFFmpeg(TestCase):
+    """
+    Class containing unit tests for the FFmpeg runner.
+    """
+
+    def test_arguments_passed_without_shell(self):
+        _ffmpeg = FFmpeg(["-i", "my vod.ts", "-c", "copy"])
+        with patch(
+            "twitcharchiver.ffmpeg.subprocess.Popen",
+            return_value=_mock_process(b"", b""),
+        ) as mock_popen:
+            self.assertEqual(0, _ffmpeg.run())
+
+        _args, _kwargs = mock_popen.call_args
+        self.assertEqual(
+            ["ffmpeg", "-hide_banner", "-nostats", "-progress", "pipe:1"],
+            _args[0][:5],
+        )
+        self.assertEqual(["-i", "my vod.ts", "-c", "copy"], _args[0][5:])
+        self.assertNotIn("shell", _kwargs)
+        self.assertEqual(subprocess.DEVNULL, _kwargs["stdin"])
+
+    def test_progress_reported_for_each_block(self):
+        _progress = []
+        FFmpeg._read_progress(
+            io.BytesIO(
+                b"frame=10\nout_time_us=1500000\nprogress=continue\n"
+                b"out_time_ms=3000000\nout_time_us=N/A\nprogress=end\n"
+            ),
+            _progress.append,
+        )
+        self.assertEqual([1.5, 3.0], _progress)
+
+    def test_log_is_bounded(self):
+        _lines = []
+        _ffmpeg = FFmpeg([], log_lines=3)
+        _stderr = "".join(f"line {_i}\n" for _i in range(10)).encode()
+        with patch(
+            "twitcharchiver.ffmpeg.subprocess.Popen",
+            return_value=_mock_process(b"", _stderr, 1),
+        ):
+            self.assertEqual(1, _ffmpeg.run(on_output=_lines.append))
+
+        self.assertEqual(10, len(_lines))
+        self.assertEqual(["line 7", "line 8", "line 9"], list(_ffmpeg.log))
+
+    def test_output_callback_error_kills_process(self):
+        _process = _mock_process(b"", b"non-existing PPS 0 referenced\n")
+
+        def _on_output(line):
+            raise ValueError(line)
+
+        with patch("twitcharchiver.ffmpeg.subprocess.Popen", return_value=_process):
+            with self.assertRaises(ValueError):
+                FFmpeg([]).run(on_output=_on_output)
+
+        _process.kill.assert_called_once()
+
+    def test_process_count_capped(self):
+        _release = threading.Event()
+        _started = []
+
+        def _popen(*args, **kwargs):
+            _started.append(args)
+            _release.wait(5)
+            return _mock_process(b"", b"")
+
+        FFmpeg.set_max_processes(1)
+        try:
+            with patch("twitcharchiver.ffmpeg.subprocess.Popen", side_effect=_popen):
+                _threads = [
+                    threading.Thread(target=FFmpeg([]).run) for _ in range(2)
+                ]
+                for _thread in _threads:
+                    _thread.start()
+
+                _threads[0].join(0.2)
+                self.assertEqual(1, len(_started))
+
+                _release.set()
+                for _thread in _threads:
+                    _thread.join(5)
+                self.assertEqual(2, len(_started))
+
+        finally:
+            FFmpeg.set_max_processes(MAX_PROCESSES)
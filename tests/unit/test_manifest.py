@@ -0,0 +1,118 @@
+import json
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase, skipIf
+
+from twitcharchiver import manifest as manifest_module
+from twitcharchiver.manifest import LOCK_NAME, MANIFEST_NAME, SegmentManifest
+
+
+class TestSegmentManifest(TestCase):
+    """
+    Class containing unit tests for the per-VOD segment manifest.
+    """
+
+    def setUp(self) -> None:
+        self._parts_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._parts_dir, ignore_errors=True)
+
+    def _write_part(self, segment_id, data=b"data"):
+        Path(self._parts_dir, f"{segment_id:05d}.ts").write_bytes(data)
+
+    def test_missing_manifest_is_rebuilt_from_parts(self):
+        self._write_part(0)
+        self._write_part(1, b"longer data")
+
+        manifest = SegmentManifest(self._parts_dir)
+
+        self.assertEqual({0, 1}, manifest.load())
+        self.assertEqual(11, manifest.get(1)["size"])
+        self.assertTrue(Path(self._parts_dir, MANIFEST_NAME).exists())
+
+    def test_rebuild_skips_files_other_than_segments(self):
+        self._write_part(0)
+        Path(self._parts_dir, "merged.ts").write_bytes(b"data")
+
+        self.assertEqual({0}, SegmentManifest(self._parts_dir).load())
+
+    def test_refresh_reads_only_new_entries(self):
+        self._write_part(0)
+        manifest = SegmentManifest(self._parts_dir)
+        manifest.load()
+
+        # entries appended by another archiver are picked up on refresh
+        other = SegmentManifest(self._parts_dir)
+        other.add(1, 4, "abc")
+        other.add(2, 4, "def")
+        other.remove(1)
+
+        self.assertEqual({2}, manifest.refresh())
+        self.assertEqual(set(), manifest.refresh())
+        self.assertNotIn(1, manifest)
+        self.assertEqual("def", manifest.get(2)["hash"])
+
+    def test_partial_line_is_read_once_complete(self):
+        manifest = SegmentManifest(self._parts_dir)
+        manifest.load()
+
+        _line = json.dumps({"id": 3, "size": 4, "hash": ""}) + "\n"
+        with open(Path(self._parts_dir, MANIFEST_NAME), "a", encoding="utf8") as _f:
+            _f.write(_line[:5])
+        self.assertEqual(set(), manifest.refresh())
+
+        with open(Path(self._parts_dir, MANIFEST_NAME), "a", encoding="utf8") as _f:
+            _f.write(_line[5:])
+        self.assertEqual({3}, manifest.refresh())
+
+    def test_inconsistent_manifest_is_rebuilt(self):
+        self._write_part(0)
+        manifest = SegmentManifest(self._parts_dir)
+        manifest.load()
+
+        # manifest records a segment which is no longer present
+        manifest.add(5, 4)
+
+        self.assertEqual({0}, SegmentManifest(self._parts_dir).load())
+
+    def test_refresh_after_rebuild_by_other_archiver(self):
+        self._write_part(0)
+        manifest = SegmentManifest(self._parts_dir)
+        manifest.load()
+        manifest.add(5, 4)
+
+        # another archiver finds the manifest inconsistent and replaces it
+        SegmentManifest(self._parts_dir).load()
+
+        self.assertEqual({0}, manifest.refresh())
+        self.assertNotIn(5, manifest)
+
+        # entries are appended to the rebuilt manifest
+        self._write_part(1)
+        manifest.add(1, 4)
+        self.assertEqual({0, 1}, SegmentManifest(self._parts_dir).load())
+
+    @skipIf(manifest_module.fcntl is None, "file locks not supported")
+    def test_writes_wait_for_lock_held_by_other_process(self):
+        fcntl = manifest_module.fcntl
+        self._write_part(1)
+        manifest = SegmentManifest(self._parts_dir)
+        _done = threading.Event()
+
+        def _add():
+            manifest.add(1, 4)
+            _done.set()
+
+        with open(Path(self._parts_dir, LOCK_NAME), "a", encoding="utf8") as _f:
+            fcntl.flock(_f, fcntl.LOCK_EX)
+            _thread = threading.Thread(target=_add)
+            _thread.start()
+            self.assertFalse(_done.wait(0.2))
+            fcntl.flock(_f, fcntl.LOCK_UN)
+
+        _thread.join(5)
+        self.assertTrue(_done.is_set())
+        self.assertIn(1, SegmentManifest(self._parts_dir).load())
@@ -0,0 +1,55 @@
+import shutil
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+from twitcharchiver.mp4 import read_mp4_duration
+
+
+def _box(box_type: bytes, contents: bytes = b""):
+    return struct.pack(">I4s", 8 + len(contents), box_type) + contents
+
+
+def _header(timescale: int, duration: int, version: int = 0):
+    if version == 1:
+        return bytes([1, 0, 0, 0]) + struct.pack(">QQIQ", 0, 0, timescale, duration)
+    return bytes(4) + struct.pack(">IIII", 0, 0, timescale, duration)
+
+
+class TestReadMp4Duration(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+        self.path = Path(self._temp_dir, "vod.mp4")
+
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def _write(self, moov: bytes):
+        # 64-bit sized media data before the movie box, as written by ffmpeg without faststart
+        _mdat = struct.pack(">I4sQ", 1, b"mdat", 16 + 4096) + bytes(4096)
+        self.path.write_bytes(_box(b"ftyp", b"isom") + _mdat + moov)
+
+    def test_movie_header(self):
+        self._write(_box(b"moov", _box(b"mvhd", _header(1000, 3600500))))
+        self.assertEqual(3600.5, read_mp4_duration(self.path))
+
+    def test_version_1_movie_header(self):
+        self._write(_box(b"moov", _box(b"mvhd", _header(90000, 90000 * 100000, 1))))
+        self.assertEqual(100000, read_mp4_duration(self.path))
+
+    def test_falls_back_to_longest_track(self):
+        _trak = lambda duration: _box(
+            b"trak", _box(b"mdia", _box(b"mdhd", _header(48000, duration)))
+        )
+        self._write(
+            _box(
+                b"moov",
+                _box(b"mvhd", _header(1000, 0)) + _trak(48000 * 10) + _trak(48000 * 12),
+            )
+        )
+        self.assertEqual(12, read_mp4_duration(self.path))
+
+    def test_missing_movie_box(self):
+        self._write(b"")
+        self.assertIsNone(read_mp4_duration(self.path))
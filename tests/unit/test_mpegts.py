@@ -0,0 +1,105 @@
+import unittest
+
+from twitcharchiver.mpegts import TsValidator, find_start_pts, find_ts_corruption
+
+
+def _packet(pid: int, counter: int, payload: bytes = b"", start: bool = False):
+    _header = bytes([0x47, (0x40 if start else 0) | pid >> 8, pid & 0xFF, 0x10 | counter])
+    return _header + payload + b"\xff" * (184 - len(payload))
+
+
+def _timestamp(prefix: int, value: int):
+    return bytes(
+        [
+            prefix | (value >> 29) & 0x0E | 1,
+            (value >> 22) & 0xFF,
+            (value >> 14) & 0xFE | 1,
+            (value >> 7) & 0xFF,
+            (value << 1) & 0xFE | 1,
+        ]
+    )
+
+
+def _pes(pts: int, dts: int):
+    return (
+        b"\x00\x00\x01\xe0\x00\x00\x80\xc0\x0a"
+        + _timestamp(0x30, pts)
+        + _timestamp(0x10, dts)
+    )
+
+
+class TestFindTsCorruption(unittest.TestCase):
+    def test_valid_segment(self):
+        data = (
+            _packet(0, 0, b"\x00\x00\xb0", start=True)
+            + _packet(256, 0, _pes(9000, 6000), start=True)
+            + _packet(256, 1)
+            + _packet(256, 1)
+            + _packet(0x1FFF, 7)
+        )
+        self.assertIsNone(find_ts_corruption(data))
+
+    def test_truncated_segment(self):
+        self.assertIn("multiple of 188", find_ts_corruption(_packet(256, 0)[:-1]))
+
+    def test_missing_sync_byte(self):
+        data = _packet(256, 0) + b"\x00" + _packet(256, 1)[1:]
+        self.assertEqual("Packet 1 is missing its sync byte.", find_ts_corruption(data))
+
+    def test_transport_error_indicator(self):
+        data = bytearray(_packet(256, 0))
+        data[1] |= 0x80
+        self.assertIn("transport error", find_ts_corruption(bytes(data)))
+
+    def test_continuity_counter_gap(self):
+        data = _packet(256, 0) + _packet(256, 2)
+        self.assertIn("expected 1", find_ts_corruption(data))
+
+    def test_validated_in_chunks(self):
+        data = b"".join(_packet(256, _i & 0x0F) for _i in range(20)) + _packet(256, 5)
+
+        # chunks split packets, with problems reported against their index in the whole stream
+        _validator = TsValidator()
+        for _start in range(0, len(data), 1000):
+            _validator.update(data[_start : _start + 1000])
+
+        self.assertEqual(find_ts_corruption(data), _validator.result())
+        self.assertIn("Packet 20 ", _validator.result())
+
+        _validator.reset()
+        _validator.update(data[:500])
+        self.assertIn("multiple of 188", _validator.result())
+        _validator.update(data[500:564])
+        self.assertIsNone(_validator.result())
+
+    def test_counter_wraps(self):
+        self.assertIsNone(find_ts_corruption(_packet(256, 15) + _packet(256, 0)))
+
+    def test_pts_before_dts(self):
+        data = _packet(256, 0, _pes(6000, 9000), start=True)
+        self.assertIn("before its DTS", find_ts_corruption(data))
+
+    def test_invalid_marker_bits(self):
+        data = bytearray(_packet(256, 0, _pes(9000, 6000), start=True))
+        data[4 + 13] &= 0xFE
+        self.assertIn("invalid PTS", find_ts_corruption(bytes(data)))
+
+    def test_missing_pes_start_code(self):
+        data = _packet(256, 0, _pes(9000, 6000), start=True) + _packet(
+            256, 1, b"\x12\x34", start=True
+        )
+        self.assertIn("start code missing", find_ts_corruption(data))
+
+
+class TestFindStartPts(unittest.TestCase):
+    def test_lowest_first_pts_of_each_stream(self):
+        data = (
+            _packet(0, 0, b"\x00\x00\xb0", start=True)
+            + _packet(256, 0, _pes(900000, 894000), start=True)
+            + _packet(257, 0, _pes(897000, 897000), start=True)
+            + _packet(257, 1, _pes(100, 100), start=True)
+        )
+        self.assertEqual(897000, find_start_pts(data))
+
+    def test_no_pes_packets(self):
+        self.assertIsNone(find_start_pts(_packet(0, 0, b"\x00\x00\xb0", start=True)))
@@ -1,12 +1,21 @@
+import threading
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+from twitcharchiver.api import Api
 from twitcharchiver.channel import Channel
+from twitcharchiver.exceptions import RequestError, VideoFormatUnsupported
 from twitcharchiver.processing import Processing
 from twitcharchiver.vod import ArchivedVod
 
 
 class TestProcessing(unittest.TestCase):
+    def setUp(self) -> None:
+        # results aren't cached between tests
+        _patcher = patch.object(Api(), "cache", None)
+        _patcher.start()
+        self.addCleanup(_patcher.stop)
+
     def _minimal_conf(self, directory: str = "/tmp/test") -> dict:
         return {
             "quiet": True,
@@ -17,12 +26,24 @@ class TestProcessing(unittest.TestCase):
             "live_only": False,
             "real_time_archiver": False,
             "unsorted": True,
+            "full_listing": False,
             "config_dir": "/tmp",
             "directory": directory,
             "discord_webhook": "",
             "pushbullet_key": "",
             "quality": "best",
             "threads": 1,
+            "engine": "threads",
+            "merge_mode": "concat",
+            "parallel_vods": 1,
+            "ffmpeg_processes": 2,
+            "parallel_channels": 4,
+            "adaptive_threads": False,
+            "min_threads": 2,
+            "max_threads": 100,
+            "bandwidth_limit": 0,
+            "vod_bandwidth_limit": 0,
+            "channel_bandwidth_limit": 0,
             "force_no_archive": False,
         }
 
@@ -91,5 +112,162 @@ class TestProcessing(unittest.TestCase):
         )
 
 
+    @patch("twitcharchiver.processing.Database")
+    def test_api_cache_unchanged(self, mock_db):
+        """
+        Verify that creating a Processing instance doesn't replace the cache of the shared Api.
+        """
+        Processing(self._minimal_conf())
+        self.assertIsNone(Api().cache)
+
+    @patch("twitcharchiver.processing.Database")
+    def test_ffmpeg_processes_configured(self, mock_db):
+        """
+        Verify that the number of FFmpeg processes allowed at once also sets the number of post-processing workers.
+        """
+        conf = self._minimal_conf()
+        conf["ffmpeg_processes"] = 3
+
+        with patch("twitcharchiver.processing.FFmpeg") as mock_ffmpeg, \
+             patch("twitcharchiver.processing.PostProcessor") as mock_post_processor:
+            process = Processing(conf)
+            mock_post_processor.return_value.exit_code = None
+            process.vod_downloader([])
+
+        mock_ffmpeg.set_max_processes.assert_called_once_with(3)
+        self.assertEqual(3, mock_post_processor.call_args.kwargs["workers"])
+
+    @patch("twitcharchiver.processing.Database")
+    def test_database_insert_waits_for_post_processing(self, mock_db):
+        """
+        Verify that a VOD handed to the post-processor keeps its download handler open until merged, and that a
+        failed merge closes the handler with the error so the VOD isn't added to the database.
+        """
+        process = Processing(self._minimal_conf())
+        downloader = MagicMock()
+        post_processor = MagicMock()
+
+        with patch("twitcharchiver.processing.DownloadHandler") as mock_handler:
+            mock_handler.return_value.__exit__.return_value = False
+            process._start_download(downloader, post_processor)
+
+            downloader.start.assert_called_once()
+            downloader.merge.assert_not_called()
+            mock_handler.return_value.__exit__.assert_not_called()
+
+            downloader.merge.side_effect = VideoFormatUnsupported
+            process._finish_download(*post_processor.put.call_args.args)
+
+        self.assertIs(
+            VideoFormatUnsupported,
+            mock_handler.return_value.__exit__.call_args.args[-3],
+        )
+        downloader.cleanup_temp_files.assert_called_once()
+
+    @patch("twitcharchiver.processing.Database")
+    def test_vod_id_downloader_starts_before_all_vods_resolved(self, mock_db):
+        """
+        Verify that VODs provided by ID are downloaded oldest first, with the first download starting before the
+        remaining VODs are resolved.
+        """
+        conf = self._minimal_conf()
+        conf["unsorted"] = False
+        conf["chat"] = False
+        # VODs are downloaded in turn without the scheduler
+        conf["engine"] = "async"
+        process = Processing(conf)
+        events = []
+
+        def _resolve(vod_ids):
+            for vod_id in vod_ids:
+                events.append(("resolved", int(vod_id)))
+                yield self._fake_vod(int(vod_id), "channelA")
+
+        def _start_download(downloader, post_processor=None):
+            events.append(("downloaded", downloader.vod.v_id))
+
+        with patch("twitcharchiver.processing.VodResolver") as mock_resolver, \
+             patch("twitcharchiver.processing.Video") as mock_video, \
+             patch.object(process, "_start_download", side_effect=_start_download), \
+             patch.object(Channel, "is_live", return_value=False):
+            mock_resolver.return_value.resolve.side_effect = _resolve
+            mock_video.side_effect = lambda vod, *args: MagicMock(vod=vod)
+            process.vod_id_downloader(["3", "2", "1"])
+
+        self.assertEqual(
+            [
+                ("resolved", 1),
+                ("downloaded", 1),
+                ("resolved", 2),
+                ("downloaded", 2),
+                ("resolved", 3),
+                ("downloaded", 3),
+            ],
+            events,
+        )
+
+    @patch("twitcharchiver.processing.Database")
+    def test_listing_bounds(self, mock_db):
+        """
+        Verify that VODs missing a requested format are listed even when complete VODs are newer.
+        """
+        conf = self._minimal_conf()
+        conf["chat"] = False
+        process = Processing(conf)
+
+        downloaded = [
+            self._fake_vod(5, "channelA"),
+            self._fake_vod(4, "channelA"),
+            self._fake_vod(3, "channelA"),
+        ]
+        downloaded[0].video_archived = True
+        downloaded[2].video_archived = True
+
+        self.assertEqual(({5, 3}, 4), process._get_listing_bounds(downloaded))
+
+        downloaded[1].video_archived = True
+        self.assertEqual(({5, 4, 3}, 0), process._get_listing_bounds(downloaded))
+
+    @patch("twitcharchiver.processing.Database")
+    def test_channels_polled_concurrently(self, mock_db):
+        """
+        Verify that channels are polled at the same time, and that a channel which fails to be polled doesn't
+        prevent VODs from the other channels being downloaded in the order channels were provided.
+        """
+        conf = self._minimal_conf()
+        conf["chat"] = False
+        process = Processing(conf)
+        # each successful channel waits for the other, so polling one at a time fails
+        barrier = threading.Barrier(2, timeout=5)
+
+        def _channel(name: str, vod_ids: list[int], error: Exception = None):
+            channel = MagicMock(spec=Channel)
+            channel.name = name
+            channel.id = 123
+            channel.is_live.return_value = False
+
+            def _get_archives(*args):
+                if error:
+                    raise error
+                barrier.wait()
+                return [self._fake_vod(_v, name) for _v in vod_ids]
+
+            channel.get_channel_archives.side_effect = _get_archives
+            return channel
+
+        channels = [
+            _channel("channelA", [2, 1]),
+            _channel("channelB", [], RequestError("url", "failed")),
+            _channel("channelC", [4, 3]),
+        ]
+
+        with patch.object(process, "vod_downloader") as mock_downloader:
+            process.get_channel(channels)
+
+        self.assertEqual(
+            [2, 1, 4, 3], [_v.v_id for _v in mock_downloader.call_args.args[0]]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,83 @@
+import pickle
+import unittest
+from unittest.mock import MagicMock, patch
+
+from twitcharchiver.ratelimit import BandwidthLimiter, TokenBucket, limit_bandwidth
+
+
+class TestTokenBucket(unittest.TestCase):
+    @patch("twitcharchiver.ratelimit.monotonic", return_value=100.0)
+    def test_burst_allowed_then_delayed(self, mock_monotonic):
+        bucket = TokenBucket(1000)
+
+        # full bucket allows one second's worth without waiting
+        self.assertEqual(0.0, bucket.reserve(1000))
+        # further bytes must wait for the bucket to refill
+        self.assertAlmostEqual(0.5, bucket.reserve(500))
+
+        # bucket refills at `rate` bytes per second
+        mock_monotonic.return_value = 101.0
+        self.assertAlmostEqual(0.0, bucket.reserve(500))
+
+    @patch("twitcharchiver.ratelimit.monotonic", return_value=100.0)
+    def test_refill_capped_at_burst(self, mock_monotonic):
+        bucket = TokenBucket(1000, burst=2000)
+        mock_monotonic.return_value = 200.0
+
+        self.assertEqual(0.0, bucket.reserve(2000))
+        self.assertAlmostEqual(1.0, bucket.reserve(1000))
+
+    def test_local_bucket_can_be_pickled(self):
+        bucket = pickle.loads(pickle.dumps(TokenBucket(1000)))
+        self.assertEqual(0.0, bucket.reserve(10))
+
+
+class TestBandwidthLimiter(unittest.TestCase):
+    def tearDown(self) -> None:
+        BandwidthLimiter.set_global_limiter(None)
+
+    @staticmethod
+    def _vod(v_id, channel="channel"):
+        vod = MagicMock()
+        vod.v_id = v_id
+        vod.channel.name = channel
+        return vod
+
+    @patch("twitcharchiver.ratelimit.monotonic", return_value=100.0)
+    def test_per_vod_limits_are_separate(self, mock_monotonic):
+        limiter = BandwidthLimiter(vod_rate=1000)
+
+        self.assertEqual(0.0, limiter.reserve(1000, self._vod(1)))
+        self.assertEqual(0.0, limiter.reserve(1000, self._vod(2)))
+        self.assertAlmostEqual(1.0, limiter.reserve(1000, self._vod(1)))
+
+    @patch("twitcharchiver.ratelimit.monotonic", return_value=100.0)
+    def test_channel_limit_shared_by_vods(self, mock_monotonic):
+        limiter = BandwidthLimiter(channel_rate=1000)
+
+        self.assertEqual(0.0, limiter.reserve(1000, self._vod(1)))
+        self.assertAlmostEqual(1.0, limiter.reserve(1000, self._vod(2)))
+        self.assertEqual(0.0, limiter.reserve(1000, self._vod(3, "other")))
+
+    @patch("twitcharchiver.ratelimit.monotonic", return_value=100.0)
+    def test_longest_delay_is_used(self, mock_monotonic):
+        limiter = BandwidthLimiter(rate=4000, vod_rate=1000)
+
+        limiter.reserve(1000, self._vod(1))
+        self.assertAlmostEqual(2.0, limiter.reserve(2000, self._vod(1)))
+
+    @patch("twitcharchiver.ratelimit.sleep")
+    def test_no_global_limiter(self, mock_sleep):
+        limit_bandwidth(10**9)
+        mock_sleep.assert_not_called()
+
+    @patch("twitcharchiver.ratelimit.sleep")
+    @patch("twitcharchiver.ratelimit.monotonic", return_value=100.0)
+    def test_global_limiter_sleeps(self, mock_monotonic, mock_sleep):
+        BandwidthLimiter.create_global_limiter(rate=1000)
+
+        limit_bandwidth(1000)
+        mock_sleep.assert_not_called()
+
+        limit_bandwidth(1000)
+        mock_sleep.assert_called_once_with(1.0)
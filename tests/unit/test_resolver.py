@@ -0,0 +1,105 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from twitcharchiver.api import Api
+from twitcharchiver.exceptions import RequestError
+from twitcharchiver.resolver import VodResolver
+
+
+def _response(json):
+    _r = MagicMock()
+    _r.json.return_value = json
+    return _r
+
+
+def _metadata(vod_id: str):
+    return {
+        "data": {
+            "video": {
+                "id": vod_id,
+                "game": {"id": "743", "name": "Chess"},
+                "lengthSeconds": 60,
+                "publishedAt": "2024-01-01T00:00:00Z",
+                "previewThumbnailURL": "",
+                "title": f"VOD {vod_id}",
+                "viewCount": 0,
+            }
+        }
+    }
+
+
+def _streaming(owner_id: str = None):
+    return {"data": {"video": {"owner": {"id": owner_id} if owner_id else None}}}
+
+
+def _post(url, j=None, h=None):
+    """
+    Returns metadata for each VOD in a batch, with VOD 3 having been deleted.
+    """
+    _results = []
+    for _operation in j:
+        _variables = _operation["variables"]
+        _vod_id = _variables.get("videoID") or _variables["vodID"]
+        if _operation["operationName"] != "VideoMetadata":
+            _results.append(_streaming())
+        elif _vod_id == "3":
+            _results.append({"data": {"video": None}})
+        else:
+            _results.append(_metadata(_vod_id))
+
+    return _response(_results)
+
+
+class TestVodResolver(unittest.TestCase):
+    def setUp(self) -> None:
+        # results aren't cached between tests
+        _patcher = patch.object(Api(), "cache", None)
+        _patcher.start()
+        self.addCleanup(_patcher.stop)
+
+    def test_vods_returned_in_order(self):
+        with patch.object(Api, "post_request", side_effect=_post) as mock_post:
+            _resolver = VodResolver(max_requests=2, batch_size=2)
+            _vods = list(_resolver.resolve(range(1, 8)))
+
+        self.assertEqual([1, 2, 4, 5, 6, 7], [_v.v_id for _v in _vods])
+        self.assertEqual("VOD 5", _vods[3].title)
+        # 7 VODs in batches of 2
+        self.assertEqual(4, mock_post.call_count)
+
+    def test_vods_fetched_individually_if_batch_fails(self):
+        with patch.object(
+            Api, "post_request", side_effect=RequestError("url", "failed")
+        ), patch.object(
+            Api,
+            "gql_request",
+            side_effect=lambda op, query_hash, variables, *args: _response(
+                [_metadata(variables["videoID"])]
+            ),
+        ) as mock_gql:
+            _vods = list(VodResolver().resolve([1, 2]))
+
+        self.assertEqual([1, 2], [_v.v_id for _v in _vods])
+        self.assertEqual(2, mock_gql.call_count)
+
+    @patch("twitcharchiver.resolver.Channel")
+    def test_channel_fetched_once_per_owner(self, mock_channel):
+        _results = [_metadata("1"), _streaming("10"), _metadata("2"), _streaming("10")]
+
+        with patch.object(Api, "post_request", return_value=_response(_results)):
+            _vods = list(VodResolver().resolve([1, 2]))
+
+        mock_channel.assert_called_once_with(channel_id=10)
+        self.assertIs(_vods[0].channel, _vods[1].channel)
+
+    def test_only_limited_batches_fetched_ahead(self):
+        with patch.object(Api, "post_request", side_effect=_post) as mock_post:
+            _vods = VodResolver(max_requests=1, batch_size=1).resolve(range(10, 20))
+            next(_vods)
+            _vods.close()
+
+        self.assertLessEqual(mock_post.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import threading
+from contextlib import ExitStack
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from twitcharchiver.scheduler import PostProcessor, VodScheduler
+
+
+class TestVodScheduler(TestCase):
+    """
+    Class containing unit tests for downloading several VODs at once.
+    """
+
+    def test_next_vod_starts_once_segments_queued(self):
+        scheduler = VodScheduler(4, max_vods=2)
+        _events = []
+        _release = threading.Event()
+
+        def _job(downloader):
+            _events.append(f"start {downloader}")
+            if downloader == "a":
+                # the next VOD can't start until all of this VOD's segments are queued
+                threading.Timer(0.1, scheduler.segments_queued, ["a"]).start()
+                _release.wait(5)
+                _events.append("end a")
+
+            else:
+                _events.append(f"end {downloader}")
+                _release.set()
+
+        scheduler.run(["a", "b"], _job)
+        self.assertEqual(["start a", "start b", "end b", "end a"], _events)
+
+    def test_next_vod_overlaps_drain_by_default(self):
+        scheduler = VodScheduler(4)
+        _events = []
+        _release = threading.Event()
+
+        def _job(downloader):
+            _events.append(f"start {downloader}")
+            if downloader == "a":
+                # the first VOD is still downloading its final segments when the next one starts
+                scheduler.segments_queued("a")
+                _release.wait(5)
+                _events.append("end a")
+
+            else:
+                _events.append(f"end {downloader}")
+                _release.set()
+
+        scheduler.run(["a", "b"], _job)
+        self.assertEqual(["start a", "start b", "end b", "end a"], _events)
+
+    def test_queueing_vods_capped(self):
+        scheduler = VodScheduler(4, max_vods=1)
+        _queueing = []
+        _max_queueing = []
+        _lock = threading.Lock()
+
+        def _job(downloader):
+            with _lock:
+                _queueing.append(downloader)
+                _max_queueing.append(len(_queueing))
+                _queueing.remove(downloader)
+
+            scheduler.segments_queued(downloader)
+
+        scheduler.run(list(range(5)), _job)
+        self.assertEqual([1] * 5, _max_queueing)
+
+    def test_merging_vod_frees_place(self):
+        scheduler = VodScheduler(4, max_vods=1)
+        _merging = threading.Event()
+        _started = []
+
+        def _job(downloader):
+            _started.append(downloader)
+            scheduler.download_finished(downloader)
+            if downloader == "a":
+                # merge of the first VOD runs while the second downloads
+                _merging.wait(5)
+
+            else:
+                _merging.set()
+
+        scheduler.run(["a", "b"], _job)
+        self.assertEqual(["a", "b"], _started)
+
+    def test_exit_stops_queue(self):
+        scheduler = VodScheduler(4, max_vods=1)
+        _started = []
+
+        def _job(downloader):
+            _started.append(downloader)
+            raise SystemExit(1)
+
+        with self.assertRaises(SystemExit) as _raised:
+            scheduler.run(["a", "b"], _job)
+
+        self.assertEqual(1, _raised.exception.code)
+        self.assertEqual(["a"], _started)
+
+    def test_pool_shared(self):
+        scheduler = VodScheduler(4, concurrency=MagicMock(maximum=8))
+        self.assertIs(scheduler.get_pool(), scheduler.get_pool())
+        self.assertEqual(8, scheduler.get_pool()._max_workers)
+        scheduler.run([], MagicMock())
+        self.assertIsNone(scheduler._pool)
+
+
+class TestPostProcessor(TestCase):
+    """
+    Class containing unit tests for post-processing downloaded VODs in the background.
+    """
+
+    def test_queued_vods_processed(self):
+        _processed = []
+
+        def _job(downloader, context):
+            with context:
+                _processed.append(downloader)
+
+        post_processor = PostProcessor(_job, workers=2, max_queued=1)
+        post_processor.start()
+        for _id in range(5):
+            post_processor.put(_id, ExitStack())
+        post_processor.stop()
+
+        self.assertEqual(list(range(5)), sorted(_processed))
+        self.assertIsNone(post_processor.exit_code)
+
+    def test_exit_code_recorded(self):
+        def _job(downloader, context):
+            raise SystemExit(1)
+
+        post_processor = PostProcessor(_job, workers=1)
+        post_processor.start()
+        post_processor.put(MagicMock(), ExitStack())
+        post_processor.stop()
+
+        self.assertEqual(1, post_processor.exit_code)
+
+    def test_cancel_closes_queued_contexts_as_failed(self):
+        _handler = MagicMock()
+        _context = ExitStack()
+        _context.enter_context(_handler)
+
+        post_processor = PostProcessor(MagicMock(), workers=1)
+        post_processor.put(MagicMock(), _context)
+        post_processor.stop(cancel=True)
+
+        self.assertIs(KeyboardInterrupt, _handler.__exit__.call_args.args[-3])
@@ -0,0 +1,89 @@
+import pickle
+import threading
+import unittest
+
+from twitcharchiver.twitch import MpegSegment, SegmentSet
+
+
+class TestMpegSegment(unittest.TestCase):
+    def test_no_instance_dict(self):
+        _segment = MpegSegment(5, 10, "https://example.com/5.ts", True)
+        self.assertFalse(hasattr(_segment, "__dict__"))
+        self.assertEqual(50, _segment.position)
+
+        _copy = pickle.loads(pickle.dumps(_segment))
+        self.assertEqual(_segment, _copy)
+        self.assertTrue(_copy.muted)
+        self.assertEqual(_segment.url, _copy.url)
+
+
+class TestSegmentSet(unittest.TestCase):
+    def test_add_and_contains(self):
+        _set = SegmentSet([MpegSegment(3), 10])
+        _set.add(MpegSegment(3))
+
+        self.assertEqual(2, len(_set))
+        self.assertIn(3, _set)
+        self.assertIn(MpegSegment(10), _set)
+        self.assertNotIn(MpegSegment(4), _set)
+        self.assertNotIn(1000, _set)
+        self.assertNotIn(-1, _set)
+        self.assertEqual([3, 10], list(_set))
+        self.assertEqual(10, _set.max())
+
+    def test_discard_and_remove(self):
+        _set = SegmentSet(range(20))
+        _set.discard(5)
+        _set.discard(100)
+        _set.remove(MpegSegment(19))
+
+        self.assertEqual(18, len(_set))
+        self.assertEqual(18, _set.max())
+        with self.assertRaises(KeyError):
+            _set.remove(5)
+
+        _set.clear()
+        self.assertFalse(_set)
+        self.assertIsNone(_set.max())
+
+    def test_missing(self):
+        _set = SegmentSet(_id for _id in range(100) if _id not in (0, 9, 50))
+        self.assertEqual([0, 9, 50], _set.missing())
+        self.assertEqual([0, 9, 50, 100, 101], _set.missing(102))
+        self.assertEqual([], SegmentSet().missing())
+        self.assertEqual([], SegmentSet(range(16)).missing())
+
+    def test_pickle(self):
+        _set = SegmentSet([1, 2, 17280])
+        _restored = pickle.loads(pickle.dumps(_set))
+        self.assertEqual(_set, _restored)
+
+        # restored sets have their own lock
+        _restored.add(3)
+        self.assertEqual(4, len(_restored))
+
+    def test_concurrent_changes(self):
+        _set = SegmentSet()
+
+        # each thread changes ids sharing bytes of the bitmap with those of the other threads
+        def _run(change):
+            _threads = [
+                threading.Thread(
+                    target=lambda start: [change(_id) for _id in range(start, 8000, 4)],
+                    args=(_i,),
+                )
+                for _i in range(4)
+            ]
+            for _thread in _threads:
+                _thread.start()
+
+            for _thread in _threads:
+                _thread.join()
+
+        _run(_set.add)
+        self.assertEqual(8000, len(_set))
+        self.assertEqual(list(range(8000)), list(_set))
+
+        _run(_set.discard)
+        self.assertEqual(0, len(_set))
+        self.assertIsNone(_set.max())
@@ -0,0 +1,124 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from twitcharchiver.mpegts import TsValidator
+from twitcharchiver.utils import (
+    _copy_buffered,
+    _copy_file_range,
+    _reflink,
+    _sendfile,
+    HashingWriter,
+    append_file,
+    get_hash,
+    hash_algorithm,
+    hashes_match,
+)
+
+
+class TestAppendFile(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+        self.src = Path(self._temp_dir, "src.ts")
+        self.src.write_bytes(b"0123456789" * 1000)
+        self.dst = Path(self._temp_dir, "dst.ts")
+        self.dst.write_bytes(b"header")
+
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def _append(self, methods=None):
+        with open(self.dst, "r+b") as _dst:
+            _dst.seek(0, 2)
+            self.assertEqual(10000, append_file(self.src, _dst, methods))
+            self.assertEqual(10006, _dst.tell())
+            _dst.write(b"end")
+
+        self.assertEqual(
+            b"header" + b"0123456789" * 1000 + b"end", self.dst.read_bytes()
+        )
+
+    def test_append_default(self):
+        self._append()
+
+    def test_append_each_method(self):
+        for _method in [_copy_file_range, _sendfile, _copy_buffered]:
+            with self.subTest(method=_method.__name__):
+                self.dst.write_bytes(b"header")
+                self._append([_method, _copy_buffered])
+
+    def test_unaligned_reflink_falls_back(self):
+        # cloning to an offset which isn't block-aligned is never supported
+        self._append([_reflink, _copy_buffered])
+
+    def test_short_copy_finished_by_next_method(self):
+        # kernel copy which stops partway, as copy_file_range() and sendfile() may
+        def _short_copy(src, dst, src_offset, dst_offset, size):
+            return _copy_buffered(src, dst, src_offset, dst_offset, 4000)
+
+        self._append([_short_copy, _copy_buffered])
+
+    def test_short_copy_raises(self):
+        def _no_copy(src, dst, src_offset, dst_offset, size):
+            return 0
+
+        with open(self.dst, "r+b") as _dst:
+            _dst.seek(0, 2)
+            with self.assertRaises(OSError):
+                append_file(self.src, _dst, [_no_copy])
+
+
+class TestHashingWriter(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.mkdtemp()
+        self.path = Path(self._temp_dir, "segment.ts")
+
+    def tearDown(self):
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def test_hash_matches_file(self):
+        with HashingWriter(self.path) as _f:
+            _f.write(b"0123456789" * 10000)
+            _f.write(b"end")
+
+        self.assertEqual(get_hash(self.path), _f.hexdigest())
+
+    def test_truncate_rehashes_kept_data(self):
+        with HashingWriter(self.path) as _f:
+            _f.write(b"corrupt")
+            _f.seek(0)
+            _f.truncate()
+            _f.write(b"0123456789")
+            # partial write discarded before resuming
+            _f.truncate(4)
+            _f.write(b"abcdef")
+
+        self.assertEqual(b"0123abcdef", self.path.read_bytes())
+        self.assertEqual(get_hash(self.path), _f.hexdigest())
+
+    def test_validator_updated_with_kept_data(self):
+        _packet = bytes([0x47, 0x01, 0x00, 0x10]) + b"\xff" * 184
+
+        with HashingWriter(self.path, TsValidator()) as _f:
+            _f.write(b"corrupt")
+            self.assertIsNotNone(_f.validator.result())
+
+            _f.seek(0)
+            _f.truncate()
+            _f.write(_packet[:100])
+            # partial write discarded before resuming
+            _f.truncate(50)
+            _f.write(_packet[50:])
+
+        self.assertIsNone(_f.validator.result())
+
+    def test_hashes_match_across_algorithms(self):
+        self.path.write_bytes(b"segment")
+        _md5 = get_hash(self.path, "md5")
+        _blake2 = get_hash(self.path, "blake2b")
+
+        self.assertEqual("md5", hash_algorithm(_md5.partition(":")[2]))
+        self.assertTrue(hashes_match(_blake2, self.path, _md5))
+        self.assertTrue(hashes_match(_blake2, self.path, _blake2))
+        self.assertFalse(hashes_match(_blake2, self.path, "blake2b:00"))
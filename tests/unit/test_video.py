@@ -1,14 +1,22 @@
+import io
 import os
 import tempfile
+from concurrent.futures import Future
 from pathlib import Path
 from unittest import TestCase
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from twitcharchiver.downloaders.video import Video
-from twitcharchiver.exceptions import VideoPartDownloadError
+import m3u8
+
+from twitcharchiver.downloaders.video import IncrementalMerger, Merger, SegmentMover, Video
+from twitcharchiver.exceptions import CorruptPartError, VideoPartDownloadError
 from twitcharchiver.twitch import MpegSegment
 from twitcharchiver.vod import Vod
 
+# valid transport stream packets used as segment contents
+_TS_PACKETS = [bytes([0x47, 0x01, 0x00, 0x10 | _cc]) + b"\xff" * 184 for _cc in range(2)]
+_TS_DATA = b"".join(_TS_PACKETS)
+
 
 class TestVideo(TestCase):
     """
@@ -28,9 +36,10 @@ class TestVideo(TestCase):
         self.mock_vod.is_live.return_value = False
         self.mock_vod.time_since_live.return_value = 9999
 
-        self.video = Video(self.mock_vod, parent_dir=Path(tempfile.gettempdir()), quiet=True)
-        self.video._s = MagicMock()
         self._temp_dir = tempfile.mkdtemp()
+        self.video = Video(self.mock_vod, parent_dir=Path(self._temp_dir), quiet=True)
+        self.video._s = MagicMock()
+        os.makedirs(Path(self.video.output_dir, "parts"))
         patch("twitcharchiver.downloaders.video.get_temp_dir", return_value=self._temp_dir).start()
         os.makedirs(Path(self._temp_dir, str(self.mock_vod.v_id)), exist_ok=True)
 
@@ -57,7 +66,7 @@ class TestVideo(TestCase):
 
         mock_response_200 = MagicMock()
         mock_response_200.status_code = 200
-        mock_response_200.iter_content.return_value = [b"fake_ts_data"]
+        mock_response_200.iter_content.return_value = [_TS_DATA]
 
         self.video._s.get.side_effect = [mock_response_404] * 6 + [mock_response_200]
 
@@ -65,8 +74,8 @@ class TestVideo(TestCase):
 
         # ensure both URLs were tried (6 retries on unmuted, 1 success on muted)
         self.assertEqual(self.video._s.get.call_count, 7)
-        self.video._s.get.assert_any_call("https://example.com/42.ts", stream=True, timeout=10)
-        self.video._s.get.assert_any_call("https://example.com/42-muted.ts", stream=True, timeout=10)
+        self.video._s.get.assert_any_call("https://example.com/42.ts", stream=True, timeout=10, headers={})
+        self.video._s.get.assert_any_call("https://example.com/42-muted.ts", stream=True, timeout=10, headers={})
 
         # segment should be marked as completed
         self.assertIn(unmuted_segment, self.video._completed_segments)
@@ -118,3 +127,714 @@ class TestVideo(TestCase):
 
         with self.assertRaises(VideoPartDownloadError):
             self.video._get_ts_segment(normal_segment)
+
+    @patch("twitcharchiver.downloaders.video.safe_move")
+    def test_interrupted_segment_resumed_with_range(self, mock_safe_move):
+        """
+        Test that a segment whose connection drops partway is resumed from the bytes already written.
+        """
+        import requests
+
+        segment = MpegSegment(segment_id=42, duration=10, url="https://example.com/42.ts")
+
+        def _interrupted():
+            yield _TS_PACKETS[0]
+            raise requests.exceptions.ConnectionError("connection reset")
+
+        mock_response_200 = MagicMock()
+        mock_response_200.status_code = 200
+        mock_response_200.headers = {"Content-Length": "376"}
+        mock_response_200.iter_content.return_value = _interrupted()
+
+        mock_response_206 = MagicMock()
+        mock_response_206.status_code = 206
+        mock_response_206.headers = {"Content-Range": "bytes 188-375/376"}
+        mock_response_206.iter_content.return_value = [_TS_PACKETS[1]]
+
+        self.video._s.get.side_effect = [mock_response_200, mock_response_206]
+
+        self.video._get_ts_segment(segment)
+
+        self.assertEqual(2, self.video._s.get.call_count)
+        self.assertEqual(
+            {"Range": "bytes=188-"}, self.video._s.get.call_args.kwargs["headers"]
+        )
+        self.assertIn(segment, self.video._completed_segments)
+        self.assertEqual(
+            _TS_DATA, Path(self._temp_dir, "12345", "42.ts").read_bytes()
+        )
+
+    @patch("twitcharchiver.downloaders.video.safe_move")
+    def test_short_segment_retried_and_range_ignored(self, mock_safe_move):
+        """
+        Test that a segment shorter than its Content-Length is retried, and the partial data is discarded if the
+        server responds to the range request with the whole segment.
+        """
+        segment = MpegSegment(segment_id=42, duration=10, url="https://example.com/42.ts")
+
+        mock_response_short = MagicMock()
+        mock_response_short.status_code = 200
+        mock_response_short.headers = {"Content-Length": "376"}
+        mock_response_short.iter_content.return_value = [_TS_PACKETS[0]]
+
+        mock_response_full = MagicMock()
+        mock_response_full.status_code = 200
+        mock_response_full.headers = {"Content-Length": "376"}
+        mock_response_full.iter_content.return_value = [_TS_DATA]
+
+        self.video._s.get.side_effect = [mock_response_short, mock_response_full]
+
+        self.video._get_ts_segment(segment)
+
+        self.assertIn(segment, self.video._completed_segments)
+        self.assertEqual(
+            _TS_DATA, Path(self._temp_dir, "12345", "42.ts").read_bytes()
+        )
+
+    @patch("twitcharchiver.downloaders.video.safe_move")
+    def test_corrupt_segment_downloaded_again(self, mock_safe_move):
+        """
+        Test that a segment which fails the integrity check is downloaded again in full.
+        """
+        segment = MpegSegment(segment_id=42, duration=10, url="https://example.com/42.ts")
+
+        mock_response_corrupt = MagicMock()
+        mock_response_corrupt.status_code = 200
+        mock_response_corrupt.headers = {}
+        mock_response_corrupt.iter_content.return_value = [_TS_PACKETS[1], _TS_PACKETS[0]]
+
+        mock_response_valid = MagicMock()
+        mock_response_valid.status_code = 200
+        mock_response_valid.headers = {}
+        mock_response_valid.iter_content.return_value = [_TS_DATA]
+
+        self.video._s.get.side_effect = [mock_response_corrupt, mock_response_valid]
+        self.video.concurrency = MagicMock()
+
+        self.video._get_ts_segment(segment)
+
+        self.assertEqual({}, self.video._s.get.call_args.kwargs["headers"])
+        self.assertEqual(
+            _TS_DATA, Path(self._temp_dir, "12345", "42.ts").read_bytes()
+        )
+        # corruption isn't treated as congestion
+        self.video.concurrency.record_error.assert_not_called()
+
+    def test_orphaned_part_recorded_on_resume(self):
+        """
+        Test that a part left on disk without a manifest entry is recorded as completed rather than ignored.
+        """
+        _parts_dir = Path(self.video.output_dir, "parts")
+        for _id in range(3):
+            Path(_parts_dir, f"{_id:05d}.ts").write_bytes(_TS_DATA)
+
+        # part 1 was moved into place but the archiver stopped before it was added to the manifest
+        self.video._manifest.add(0, len(_TS_DATA))
+        self.video._manifest.add(2, len(_TS_DATA))
+
+        video = Video(self.mock_vod, parent_dir=Path(self._temp_dir), quiet=True)
+        video._s = MagicMock()
+        self.assertEqual([0, 2], list(video._completed_segments))
+
+        video._get_ts_segment(MpegSegment(segment_id=1, duration=10, url="https://example.com/1.ts"))
+
+        video._s.get.assert_not_called()
+        self.assertEqual([0, 1, 2], list(video._completed_segments))
+        self.assertEqual(len(_TS_DATA), video._manifest.get(1)["size"])
+        self.assertTrue(video._manifest.get(1)["hash"])
+
+    @patch("twitcharchiver.downloaders.video.safe_move")
+    def test_invalid_orphaned_part_downloaded_again(self, mock_safe_move):
+        """
+        Test that an untracked part which is corrupt is discarded and the segment downloaded again.
+        """
+        segment = MpegSegment(segment_id=42, duration=10, url="https://example.com/42.ts")
+        _part_path = Path(self.video.output_dir, "parts", "00042.ts")
+        _part_path.write_bytes(_TS_PACKETS[0][:100])
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.iter_content.return_value = [_TS_DATA]
+        self.video._s.get.return_value = mock_response
+
+        self.video._get_ts_segment(segment)
+
+        self.assertFalse(_part_path.exists())
+        self.assertEqual(1, self.video._s.get.call_count)
+        self.assertIn(segment, self.video._completed_segments)
+
+
+    def test_refresh_only_parses_new_segments(self):
+        """
+        Test that refreshing a growing playlist only converts segments appended since the last refresh.
+        """
+        _header = "#EXTM3U\n#EXT-X-TWITCH-TOTAL-SECS:30.000\n"
+        self.mock_vod.get_index_playlist.side_effect = [
+            _header + "#EXTINF:10.000,\n0.ts\n#EXTINF:10.000,\n1.ts\n",
+            _header + "#EXTINF:10.000,\n0.ts\n#EXTINF:10.000,\n1.ts\n#EXTINF:10.000,\n2-muted.ts\n",
+        ]
+
+        self.video.refresh_playlist()
+        self.assertEqual({0, 1}, {_s.id for _s in self.video._build_buffer()})
+
+        with patch("twitcharchiver.downloaders.video.m3u8.loads", wraps=m3u8.loads) as mock_loads:
+            self.video.refresh_playlist()
+
+        self.assertEqual("\n#EXTINF:10.000,\n2-muted.ts\n", mock_loads.call_args[0][0])
+        self.assertEqual([0, 1, 2], [_s.id for _s in self.video._playlist_segments])
+        self.assertEqual([2], [_s.id for _s in self.video._new_segments])
+
+        # unfinished segments from the previous pass are still returned alongside new ones
+        self.assertEqual({0, 1, 2}, {_s.id for _s in self.video._build_buffer()})
+        self.assertIn(MpegSegment(2), self.video._muted_segments)
+
+    def test_refresh_reparses_if_final_segment_missing(self):
+        """
+        Test that the whole playlist is processed again if the previous final segment is no longer present.
+        """
+        self.mock_vod.get_index_playlist.side_effect = [
+            "#EXTM3U\n#EXTINF:10.000,\n0.ts\n#EXTINF:10.000,\n1.ts\n",
+            "#EXTM3U\n#EXTINF:10.000,\n0.ts\n#EXTINF:10.000,\n1-muted.ts\n",
+        ]
+
+        self.video.refresh_playlist()
+        self.video.refresh_playlist()
+
+        self.assertEqual([0, 1], [_s.id for _s in self.video._playlist_segments])
+        self.assertTrue(self.video._playlist_segments[1].muted)
+
+    def test_final_pass_reparses_whole_playlist(self):
+        """
+        Test that segments renamed after they were parsed are found by the final pass once the VOD has ended.
+        """
+        self.mock_vod.get_index_url.return_value = "https://example.com/index-dvr.m3u8"
+        self.mock_vod.is_live.side_effect = [True, False]
+        self.mock_vod.get_index_playlist.side_effect = [
+            "#EXTM3U\n#EXTINF:10.000,\n0.ts\n",
+            "#EXTM3U\n#EXTINF:10.000,\n0.ts\n#EXTINF:10.000,\n1.ts\n",
+            # segment 0 is muted once the stream has ended, while segment 1 is still the final segment
+            "#EXTM3U\n#EXTINF:10.000,\n0-muted.ts\n#EXTINF:10.000,\n1.ts\n",
+        ]
+
+        with patch.object(Video, "download_m3u8_playlist"), patch.object(Video, "_sleep"):
+            self.video.start()
+
+        self.assertEqual([0, 1], [_s.id for _s in self.video._playlist_segments])
+        self.assertTrue(self.video._playlist_segments[0].muted)
+
+    def test_segments_submitted_in_ascending_order_within_window(self):
+        """
+        Test that segments are handed to the workers lowest id first, with no more queued than the look-ahead window.
+        """
+        self.video.threads = 2
+        _futures = {}
+
+        def _submit(segment):
+            _futures[segment.id] = Future()
+            return _futures[segment.id]
+
+        self.video._submit_segment = _submit
+        self.video._start_mover = MagicMock()
+        self.video._submit_segments([MpegSegment(_id, 10) for _id in [7, 3, 9, 0, 5, 1]])
+
+        # window is 2 workers * 2 segments
+        self.assertEqual([0, 1, 3, 5], list(_futures))
+
+        _futures[1].set_result(None)
+        self.assertEqual([0, 1, 3, 5, 7], list(_futures))
+        self.assertNotIn(MpegSegment(1), self.video._pending)
+
+        self.video._shutdown_workers()
+        self.assertEqual([0, 1, 3, 5, 7], list(_futures))
+
+    def test_scheduler_workers_shared(self):
+        """
+        Test that a scheduled VOD uses the scheduler's workers, signalling once its backlog is queued and leaving the
+        workers running once finished.
+        """
+        scheduler = MagicMock()
+        self.video.scheduler = scheduler
+        self.video.threads = 1
+        _futures = {}
+
+        def _submit(segment):
+            _futures[segment.id] = Future()
+            return _futures[segment.id]
+
+        self.video._submit_segment = _submit
+        self.video._start_mover = MagicMock()
+        self.video._submit_segments([MpegSegment(_id, 10) for _id in range(3)])
+        scheduler.get_pool.assert_called_once()
+        scheduler.segments_queued.assert_not_called()
+
+        _futures[0].set_result(None)
+        scheduler.segments_queued.assert_called_once_with(self.video)
+
+        for _future in _futures.values():
+            if not _future.done():
+                _future.set_result(None)
+        self.video._shutdown_workers()
+        scheduler.get_pool.return_value.shutdown.assert_not_called()
+
+    def test_cancel_interrupts_wait(self):
+        """
+        Test that cancelling a download from another thread raises KeyboardInterrupt while waiting for segments.
+        """
+        _future = Future()
+        self.video._pending[MpegSegment(0, 10)] = _future
+        self.video.cancel()
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.video._wait_for_downloads()
+
+    def test_ready_prefix_tracks_contiguous_segments(self):
+        """
+        Test that the ready segment id only advances over segments which complete a contiguous prefix.
+        """
+        self.video._playlist_segments = [MpegSegment(_id, 10) for _id in range(4)]
+        self.assertIsNone(self.video.ready_segment_id)
+
+        self.video._manifest.add(1, 10)
+        self.assertIsNone(self.video.ready_segment_id)
+
+        self.video._manifest.add(0, 10)
+        self.assertEqual(1, self.video.ready_segment_id)
+
+        # skipped muted segments don't hold back the prefix
+        self.video._skipped_segments.add(MpegSegment(2))
+        self.video._manifest.add(3, 10)
+        self.assertEqual(3, self.video.ready_segment_id)
+
+class _FakeAsyncResponse:
+    """
+    Minimal stand-in for an aiohttp response used by the async engine tests.
+    """
+
+    def __init__(self, status, body=b""):
+        self.status = status
+        self._body = body
+        self.content = self
+        self.headers = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def text(self):
+        return ""
+
+    async def iter_chunked(self, _size):
+        yield self._body
+
+
+class _FakeAsyncSession:
+    """
+    Minimal stand-in for an aiohttp session returning queued responses.
+    """
+
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self.calls = []
+        self.closed = False
+
+    def get(self, url, headers=None):
+        self.calls.append(url)
+        return self._responses.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestVideoAsync(TestCase):
+    """
+    Class containing unit tests for the Video downloader's async engine.
+    """
+
+    def setUp(self) -> None:
+        self.mock_vod = MagicMock(spec=Vod)
+        self.mock_vod.v_id = 12345
+        self.mock_vod.title = "Test VOD"
+        self.mock_vod.created_at = 1609459200
+
+        self._temp_dir = tempfile.mkdtemp()
+        self.video = Video(
+            self.mock_vod,
+            parent_dir=Path(self._temp_dir),
+            quiet=True,
+            engine="async",
+        )
+        os.makedirs(Path(self.video.output_dir, "parts"))
+        patch("twitcharchiver.downloaders.video.get_temp_dir", return_value=self._temp_dir).start()
+        os.makedirs(Path(self._temp_dir, str(self.mock_vod.v_id)), exist_ok=True)
+
+    def tearDown(self) -> None:
+        import shutil
+        self.video._shutdown_workers()
+        patch.stopall()
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    @patch("twitcharchiver.downloaders.video.safe_move")
+    def test_unmuted_segment_tries_muted_fallback(self, mock_safe_move):
+        """
+        Test that the async engine falls back to the muted URL and moves the completed segment.
+        """
+        segment = MpegSegment(segment_id=42, duration=10, url="https://example.com/42.ts")
+        session = _FakeAsyncSession(
+            [_FakeAsyncResponse(404)] * 5 + [_FakeAsyncResponse(200, _TS_DATA)]
+        )
+
+        with patch.object(Video, "_create_async_session", AsyncMock(return_value=session)):
+            self.video._submit_segments({segment})
+            self.video._wait_for_downloads()
+
+        self.assertEqual(6, len(session.calls))
+        self.assertEqual("https://example.com/42-muted.ts", session.calls[-1])
+        self.assertIn(segment, self.video._completed_segments)
+        mock_safe_move.assert_called_once()
+
+    @patch("twitcharchiver.downloaders.video.safe_move")
+    def test_non_muted_segment_failure_is_collected(self, mock_safe_move):
+        """
+        Test that failures in the async engine are raised once all queued downloads finish.
+        """
+        segment = MpegSegment(segment_id=42, duration=10, url="https://example.com/42.ts")
+        session = _FakeAsyncSession([_FakeAsyncResponse(404)] * 10)
+
+        with patch.object(Video, "_create_async_session", AsyncMock(return_value=session)):
+            self.video._submit_segments({segment})
+            with self.assertRaises(VideoPartDownloadError):
+                self.video._wait_for_downloads()
+
+        mock_safe_move.assert_not_called()
+
+    @patch("twitcharchiver.downloaders.video.safe_move")
+    def test_workers_persist_between_passes(self, mock_safe_move):
+        """
+        Test that segments queued on later passes reuse the same event loop and session.
+        """
+        session = _FakeAsyncSession(
+            [_FakeAsyncResponse(200, _TS_DATA) for _ in range(2)]
+        )
+
+        with patch.object(
+            Video, "_create_async_session", AsyncMock(return_value=session)
+        ) as mock_create:
+            self.video._submit_segments({MpegSegment(1, 10, "https://example.com/1.ts")})
+            _loop = self.video._async_loop
+            self.video._submit_segments({MpegSegment(2, 10, "https://example.com/2.ts")})
+            self.video._wait_for_downloads()
+
+            self.assertIs(_loop, self.video._async_loop)
+            mock_create.assert_called_once()
+
+        self.video._shutdown_workers()
+        self.assertIsNone(self.video._async_loop)
+        self.assertTrue(session.closed)
+        self.assertEqual(2, mock_safe_move.call_count)
+
+
+class TestSegmentMover(TestCase):
+    """
+    Class containing unit tests for the segment move workers.
+    """
+
+    def test_moves_all_queued_segments(self):
+        moved = []
+        mover = SegmentMover(lambda seg, path, digest: moved.append(seg.id), workers=2, max_queued=1)
+        mover.start()
+        for _id in range(10):
+            mover.put(MpegSegment(_id, 10), Path(f"{_id}.ts"))
+
+        self.assertEqual([], mover.stop())
+        self.assertEqual(list(range(10)), sorted(moved))
+
+    def test_join_leaves_workers_running(self):
+        moved = []
+        mover = SegmentMover(lambda seg, path, digest: moved.append(seg.id), workers=2)
+        mover.start()
+        mover.put(MpegSegment(1, 10), Path("1.ts"))
+        self.assertEqual([], mover.join())
+        self.assertEqual([1], moved)
+
+        mover.put(MpegSegment(2, 10), Path("2.ts"))
+        self.assertEqual([], mover.stop())
+        self.assertEqual([1, 2], moved)
+
+    def test_move_errors_are_returned(self):
+        def _fail(segment, path, digest):
+            raise VideoPartDownloadError(f"failed {segment.id}")
+
+        mover = SegmentMover(_fail, workers=1)
+        mover.start()
+        mover.put(MpegSegment(1, 10), Path("1.ts"))
+
+        errors = mover.stop()
+        self.assertEqual(1, len(errors))
+        self.assertIsInstance(errors[0], VideoPartDownloadError)
+
+
+class TestIncrementalMerger(TestCase):
+    """
+    Class containing unit tests for appending segments to merged.ts while downloading.
+    """
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.mkdtemp()
+        self.parts_dir = Path(self._temp_dir, "parts")
+        os.makedirs(self.parts_dir)
+        for _id in range(4):
+            Path(self.parts_dir, f"{_id:05d}.ts").write_bytes(bytes([_id]) * (_id + 1))
+
+    def tearDown(self) -> None:
+        import shutil
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def test_append_and_resume(self):
+        merger = IncrementalMerger(Path(self._temp_dir))
+        merger.append(0)
+        merger.append(1)
+
+        self.assertEqual(b"\x00\x01\x01", merger.path.read_bytes())
+        self.assertFalse(Path(self.parts_dir, "00000.ts").exists())
+
+        # data written after the last recorded segment is discarded on resume
+        with open(merger.path, "ab") as _f:
+            _f.write(b"partial")
+
+        resumed = IncrementalMerger(Path(self._temp_dir))
+        self.assertEqual({0, 1}, resumed.load())
+        self.assertEqual(3, resumed.size)
+        self.assertEqual(b"\x00\x01\x01", resumed.path.read_bytes())
+
+    def test_restore_moves_segments_back_to_parts(self):
+        merger = IncrementalMerger(Path(self._temp_dir))
+        for _id in range(3):
+            merger.append(_id)
+
+        self.assertEqual([(1, 2, ""), (2, 3, "")], merger.restore(1))
+        self.assertEqual(b"\x00", merger.path.read_bytes())
+        self.assertEqual(b"\x02\x02\x02", Path(self.parts_dir, "00002.ts").read_bytes())
+
+        resumed = IncrementalMerger(Path(self._temp_dir))
+        self.assertEqual({0}, resumed.load())
+
+    def test_restore_keeps_recorded_hashes(self):
+        merger = IncrementalMerger(Path(self._temp_dir))
+        merger.append(0, "blake2b:00")
+        merger.append(1, "blake2b:11")
+
+        resumed = IncrementalMerger(Path(self._temp_dir))
+        resumed.load()
+        self.assertEqual([(1, 2, "blake2b:11")], resumed.restore(1))
+
+    def test_merger_appends_remaining_parts(self):
+        merger = IncrementalMerger(Path(self._temp_dir))
+        merger.append(0)
+        merger.append(1)
+
+        _merger = Merger(
+            MagicMock(spec=Vod),
+            self._temp_dir,
+            {MpegSegment(_id, 10) for _id in range(4)},
+            set(),
+            True,
+            incremental=merger,
+        )
+        _merger._completed_parts = _merger.get_completed_parts()
+        _merger._combine_vod_parts()
+
+        self.assertEqual(b"\x00\x01\x01\x02\x02\x02\x03\x03\x03\x03", merger.path.read_bytes())
+
+    @patch("twitcharchiver.downloaders.video.FFmpeg")
+    def test_merge_with_discontinuity(self, mock_ffmpeg):
+        merger = IncrementalMerger(Path(self._temp_dir))
+        merger.append(0)
+        merger.append(1)
+        Path(self.parts_dir, "00002.ts").unlink()
+
+        # the concat demuxer writes to a temporary file in 'parts' before it replaces the incrementally merged file
+        def _run(*args, **kwargs):
+            _output = Path(mock_ffmpeg.call_args[0][0][-1])
+            if _output == Path(self.parts_dir, "merged.ts.tmp"):
+                _output.write_bytes(b"rewritten")
+            return 0
+
+        mock_ffmpeg.return_value.run.side_effect = _run
+        mock_vod = MagicMock(spec=Vod)
+        mock_vod.thumbnail_url = ""
+        _merger = Merger(
+            mock_vod,
+            self._temp_dir,
+            {MpegSegment(_id, 10) for _id in [0, 1, 3]},
+            set(),
+            True,
+            incremental=merger,
+        )
+
+        with patch.object(Merger, "_probe_start_time", return_value=0) as mock_probe:
+            _merger.merge()
+
+        # offset is read from merged.ts before it is rewritten
+        self.assertEqual(Path(self._temp_dir, "merged.ts"), mock_probe.call_args[0][0])
+        self.assertEqual(b"rewritten", merger.path.read_bytes())
+        self.assertFalse(Path(self.parts_dir, "merged.ts.tmp").exists())
+        self.assertTrue(merger.is_rewritten)
+        self.assertEqual(["00003.ts"], _merger.get_completed_parts())
+
+        self.assertEqual({0, 1}, merger.discard())
+        self.assertFalse(merger.path.exists())
+        self.assertNotIn(0, merger)
+
+    def test_video_merges_ready_prefix(self):
+        mock_vod = MagicMock(spec=Vod)
+        mock_vod.v_id = 12345
+        mock_vod.title = "Test VOD"
+        mock_vod.created_at = 1609459200
+        video = Video(mock_vod, parent_dir=Path(self._temp_dir), quiet=True, merge_mode="incremental")
+        os.makedirs(Path(video.output_dir, "parts"))
+        for _id in range(3):
+            Path(video.output_dir, "parts", f"{_id:05d}.ts").write_bytes(b"ts")
+
+        video._playlist_segments = [MpegSegment(_id, 10) for _id in range(3)]
+        video._manifest.add(0, 2)
+        video._manifest.add(2, 2)
+        self.assertEqual(0, video.ready_segment_id)
+        self.assertIn(0, video._merger)
+        self.assertNotIn(0, video._manifest)
+
+        video._manifest.add(1, 2)
+        self.assertEqual(2, video.ready_segment_id)
+        self.assertEqual(b"ts" * 3, Path(video.output_dir, "merged.ts").read_bytes())
+
+
+class TestMergerPipe(TestCase):
+    """
+    Class containing unit tests for passing parts straight to ffmpeg.
+    """
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.mkdtemp()
+        os.makedirs(Path(self._temp_dir, "parts"))
+        for _id in [0, 1, 3]:
+            Path(self._temp_dir, "parts", f"{_id:05d}.ts").write_bytes(bytes([_id]) * 2)
+
+    def tearDown(self) -> None:
+        import shutil
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    def _merger(self, segment_ids, **kwargs):
+        return Merger(
+            MagicMock(spec=Vod),
+            self._temp_dir,
+            {MpegSegment(_id, 10) for _id in segment_ids},
+            set(),
+            True,
+            pipe_parts=True,
+            **kwargs,
+        )
+
+    def test_contiguous_parts_written_to_stdin(self):
+        merger = self._merger([0, 1])
+        _input, _feed = merger._get_convert_input()
+        self.assertEqual(["-f", "mpegts", "-i", "pipe:0"], _input)
+        self.assertEqual(["00000.ts", "00001.ts"], _feed)
+
+        _stdin = io.BytesIO()
+        _stdin.close = MagicMock()
+        merger._feed_parts(_stdin, _feed)
+        self.assertEqual(b"\x00\x00\x01\x01", _stdin.getvalue())
+        _stdin.close.assert_called_once()
+
+    @patch("twitcharchiver.downloaders.video.FFmpeg")
+    def test_missing_part_raised_after_ffmpeg_exits(self, mock_ffmpeg):
+        _stdin = io.BytesIO()
+        _stdin.close = MagicMock()
+
+        def _run(on_progress, on_output, feed_stdin):
+            feed_stdin(_stdin)
+            return 0
+
+        mock_ffmpeg.return_value.run.side_effect = _run
+        Path(self._temp_dir, "parts", "00001.ts").unlink()
+        merger = self._merger([0, 1])
+
+        with patch.object(merger, "_get_dts_offset", return_value=0):
+            with self.assertRaises(FileNotFoundError):
+                merger._convert_vod()
+
+        # stdin is closed so ffmpeg doesn't wait for the rest of the input
+        _stdin.close.assert_called_once()
+        self.assertEqual(b"\x00\x00", _stdin.getvalue())
+
+    def test_dts_offset_read_from_first_part(self):
+        # PES header with a PTS of 1,000,000 and no DTS
+        Path(self._temp_dir, "parts", "00001.ts").write_bytes(
+            bytes([0x47, 0x41, 0x00, 0x10])
+            + b"\x00\x00\x01\xe0\x00\x00\x80\x80\x05\x21\x00\x3d\x84\x81"
+            + b"\xff" * 170
+        )
+        merger = self._merger([1, 3])
+        self.assertEqual(1000000 - 900000, merger._get_dts_offset())
+
+    def test_discontinuity_uses_concat_demuxer(self):
+        merger = self._merger([0, 1, 3])
+        _input, _feed = merger._get_convert_input()
+        self.assertEqual(["-f", "concat"], _input[2:4])
+        self.assertEqual([], _feed)
+        self.assertEqual(
+            3, len(Path(self._temp_dir, "parts", "segments.txt").read_text().splitlines())
+        )
+
+    @patch("twitcharchiver.downloaders.video.FFmpeg")
+    def test_corrupt_packet_mapped_to_part(self, mock_ffmpeg):
+        def _run(on_progress, on_output, feed_stdin):
+            on_progress(20.0)
+            on_output("[mpegts] Packet corrupt (stream = 0, dts = 2700000).")
+            return 0
+
+        mock_ffmpeg.return_value.run.side_effect = _run
+        merger = self._merger([0, 1])
+
+        with patch.object(merger, "_get_dts_offset", return_value=0):
+            with self.assertRaises(CorruptPartError) as _raised:
+                merger._convert_vod()
+
+        self.assertEqual({MpegSegment(3, 10)}, _raised.exception.parts)
+        _args = mock_ffmpeg.call_args[0][0]
+        self.assertEqual(["-f", "mpegts", "-i", "pipe:0"], _args[1:5])
+
+
+class TestMergerVerifyLength(TestCase):
+    """
+    Class containing unit tests for verifying the length of a converted VOD.
+    """
+
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.mkdtemp()
+        self.mock_vod = MagicMock(spec=Vod)
+        self.mock_vod.duration = 3600
+        self.merger = Merger(self.mock_vod, self._temp_dir, set(), set(), True)
+
+    def tearDown(self) -> None:
+        import shutil
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+    @patch("twitcharchiver.downloaders.video.subprocess.run")
+    def test_length_read_from_mp4_header(self, mock_run):
+        _mvhd = bytes(4) + (0).to_bytes(8, "big") + (1000).to_bytes(4, "big") + (3601000).to_bytes(4, "big")
+        _moov = (16 + len(_mvhd)).to_bytes(4, "big") + b"moov" + (8 + len(_mvhd)).to_bytes(4, "big") + b"mvhd" + _mvhd
+        Path(self._temp_dir, "vod.mp4").write_bytes(_moov)
+
+        self.assertTrue(self.merger.verify_length())
+        mock_run.assert_not_called()
+
+    @patch("twitcharchiver.downloaders.video.subprocess.run")
+    def test_falls_back_to_ffprobe(self, mock_run):
+        Path(self._temp_dir, "vod.mp4").write_bytes(b"not an mp4")
+        mock_run.return_value = MagicMock(returncode=0, stdout="3500.0\n")
+
+        self.assertFalse(self.merger.verify_length())
+        mock_run.assert_called_once()
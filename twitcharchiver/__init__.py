@@ -38,15 +38,17 @@ from time import sleep
 
 from twitcharchiver.api import Api
 from twitcharchiver.arguments import Arguments
+from twitcharchiver.cache import ResponseCache
 from twitcharchiver.channel import Channel
 from twitcharchiver.configuration import Configuration
 from twitcharchiver.logger import Logger
 from twitcharchiver.processing import Processing
 from twitcharchiver.utils import (
-    getenv,
     check_update_available,
+    convert_to_bytes,
     get_latest_version,
     get_temp_dir,
+    getenv,
 )
 
 __version__ = "4.4.6"
@@ -133,6 +135,86 @@ def main():
         help="Number of video download threads. (default: %(default)s)",
         default=getenv("TWITCH_ARCHIVER_THREADS", 20),
     )
+    parser.add_argument(
+        "--adaptive-threads",
+        action="store_true",
+        help="Continually adjust the number of video segments downloaded at once based on their\n"
+        "throughput and error rate, starting from `--threads`.",
+        default=getenv("TWITCH_ARCHIVER_ADAPTIVE_THREADS", False, True),
+    )
+    parser.add_argument(
+        "--min-threads",
+        type=int,
+        action="store",
+        help="Lowest number of concurrent video downloads with `--adaptive-threads`. (default: %(default)s)",
+        default=getenv("TWITCH_ARCHIVER_MIN_THREADS", 2),
+    )
+    parser.add_argument(
+        "--max-threads",
+        type=int,
+        action="store",
+        help="Highest number of concurrent video downloads with `--adaptive-threads`. (default: %(default)s)",
+        default=getenv("TWITCH_ARCHIVER_MAX_THREADS", 100),
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        action="store",
+        choices=["threads", "async"],
+        help="Video segment download engine. 'async' downloads from a single thread, keeping up to\n"
+        "`--threads` requests in flight. Requires aiohttp. (default: %(default)s)",
+        default=getenv("TWITCH_ARCHIVER_ENGINE", "threads"),
+    )
+    parser.add_argument(
+        "--merge-mode",
+        type=str,
+        action="store",
+        choices=["concat", "incremental", "pipe"],
+        help="How downloaded video segments are merged. 'incremental' appends segments to the\n"
+        "merged file while downloading, deleting each part once appended, so merging\n"
+        "finishes sooner and needs less free space. 'pipe' passes segments straight to\n"
+        "FFmpeg without writing a merged file. (default: %(default)s)",
+        default=getenv("TWITCH_ARCHIVER_MERGE_MODE", "concat"),
+    )
+    parser.add_argument(
+        "--parallel-vods",
+        type=int,
+        action="store",
+        help="Number of VODs queueing segments at once, sharing the `--threads` download workers.\n"
+        "Each VOD makes way for the next once it has queued all of its segments, so their\n"
+        "downloads overlap, and VODs are merged while others download. (default: %(default)s)",
+        default=getenv("TWITCH_ARCHIVER_PARALLEL_VODS", 1),
+    )
+    parser.add_argument(
+        "--ffmpeg-processes",
+        type=int,
+        action="store",
+        help="Number of FFmpeg processes which may run at once, also setting how many downloaded\n"
+        "VODs are merged and converted at once. (default: %(default)s)",
+        default=getenv("TWITCH_ARCHIVER_FFMPEG_PROCESSES", 2),
+    )
+    parser.add_argument(
+        "--bandwidth-limit",
+        type=convert_to_bytes,
+        action="store",
+        help="Maximum download rate in bytes per second across all downloads, accepts K, M and G\n"
+        "suffixes (e.g 10M). (default: no limit)",
+        default=getenv("TWITCH_ARCHIVER_BANDWIDTH_LIMIT", 0),
+    )
+    parser.add_argument(
+        "--vod-bandwidth-limit",
+        type=convert_to_bytes,
+        action="store",
+        help="Maximum download rate for each VOD. (default: no limit)",
+        default=getenv("TWITCH_ARCHIVER_VOD_BANDWIDTH_LIMIT", 0),
+    )
+    parser.add_argument(
+        "--channel-bandwidth-limit",
+        type=convert_to_bytes,
+        action="store",
+        help="Maximum download rate for each channel. (default: no limit)",
+        default=getenv("TWITCH_ARCHIVER_CHANNEL_BANDWIDTH_LIMIT", 0),
+    )
     parser.add_argument(
         "-q",
         "--quality",
@@ -159,6 +241,20 @@ def main():
         help="Continually check every 10 seconds for new streams/VODs from a specified channel.",
         default=getenv("TWITCH_ARCHIVER_WATCH", False, True),
     )
+    parser.add_argument(
+        "--full-listing",
+        action="store_true",
+        help="Fetch every page of a channel's videos on each check rather than stopping once\n"
+        "VODs which are already archived are reached.",
+        default=getenv("TWITCH_ARCHIVER_FULL_LISTING", False, True),
+    )
+    parser.add_argument(
+        "--parallel-channels",
+        type=int,
+        action="store",
+        help="Number of channels checked for new streams/VODs at once. (default: %(default)s)",
+        default=getenv("TWITCH_ARCHIVER_PARALLEL_CHANNELS", 8),
+    )
     stream.add_argument(
         "-l",
         "--live-only",
@@ -311,6 +407,9 @@ def main():
         _api = Api()
         _api.oauth_token = config.get("oauth_token")
 
+    # cache Twitch API results which rarely change between runs and watch mode checks
+    Api().cache = ResponseCache(Path(config.get("config_dir"), "cache.db"))
+
     # create temp dir for downloads and lock files
     Path(get_temp_dir()).mkdir(exist_ok=True)
 
@@ -331,9 +430,7 @@ def main():
         log.info("Finished archiving channel(s).")
 
     elif args.get("vod") is not None:
-        vods = [ArchivedVod.convert_from_vod(Vod(v)) for v in args.get("vod")]
-
-        process.vod_downloader(vods)
+        process.vod_id_downloader(args.get("vod"))
 
         log.info("Finished archiving VOD(s).")
 
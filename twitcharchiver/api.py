@@ -6,13 +6,23 @@ from time import sleep
 
 import requests
 
+from twitcharchiver.cache import ResponseCache
 from twitcharchiver.exceptions import (
     RequestError,
     TwitchAPIError,
-    TwitchAPIErrorNotFound,
-    TwitchAPIErrorForbidden,
     TwitchAPIErrorBadRequest,
+    TwitchAPIErrorForbidden,
+    TwitchAPIErrorNotFound,
 )
+from twitcharchiver.ratelimit import limit_bandwidth
+
+GQL_URL = "https://gql.twitch.tv/gql"
+
+# default client ID, the only one accepted for non-authenticated clients
+GQL_CLIENT_ID = "ue6666qo983tsx6so1t0vnawi233wa"
+
+# maximum number of operations Twitch accepts in a single GQL request
+GQL_BATCH_SIZE = 35
 
 
 class Api:
@@ -36,6 +46,8 @@ class Api:
         self._session = requests.session()
         self._headers = {}
         self.oauth_token = ""
+        # optional cache of GQL operation results, set up by the caller
+        self.cache: ResponseCache = None
         self.logging = logging.getLogger()
 
     def __enter__(self):
@@ -50,6 +62,16 @@ class Api:
         Cleanly shutdown requests session.
         """
         self._session.close()
+        if self.cache:
+            self.cache.close()
+
+    def invalidate_cache(self, vod_id: int) -> None:
+        """Remove any cached results for a VOD, such as when it is live and its information is changing.
+
+        :param vod_id: ID of VOD
+        """
+        if self.cache:
+            self.cache.invalidate(vod_id=vod_id)
 
     def add_headers(self, headers: dict):
         """
@@ -96,6 +118,7 @@ class Api:
                 if _r.status_code != 200:
                     raise TwitchAPIError(_r)
 
+                limit_bandwidth(len(_r.content))
                 return _r
 
             # recoverable exceptions
@@ -144,6 +167,7 @@ class Api:
                 if _r.status_code != 200:
                     raise TwitchAPIError(_r)
 
+                limit_bandwidth(len(_r.content))
                 return _r
 
             except requests.exceptions.RequestException as err:
@@ -158,6 +182,38 @@ class Api:
                 sleep(_ * 10)
                 continue
 
+    def _gql_headers(self, include_oauth: bool = False) -> dict:
+        """Generate the headers sent with GQL requests.
+
+        :param include_oauth: bool whether to include oauth token in header
+        :return: GQL request headers
+        :rtype: dict
+        """
+        # Uses default client header
+        _h = {"Client-Id": GQL_CLIENT_ID}
+
+        # set authorization token if requested and configured
+        if include_oauth and self.oauth_token:
+            _h["Authorization"] = f"OAuth {self.oauth_token}"
+
+        return _h
+
+    @staticmethod
+    def gql_operation(operation: str, query_hash: str, variables: dict) -> dict:
+        """Generate a persisted GQL query operation.
+
+        :param operation: name of operation
+        :param query_hash: hash of operation
+        :param variables: dict of variable to post with request
+        :return: operation to post to the GQL API
+        :rtype: dict
+        """
+        return {
+            "extensions": {"persistedQuery": {"sha256Hash": query_hash, "version": 1}},
+            "operationName": operation,
+            "variables": variables,
+        }
+
     def gql_request(
         self,
         operation: str,
@@ -175,26 +231,12 @@ class Api:
         :return: entire request response
         :rtype: requests.Response
         """
-        # Uses default client header
-        _h = {"Client-Id": "ue6666qo983tsx6so1t0vnawi233wa"}
-
-        # set authorization token if requested and configured
-        if include_oauth and self.oauth_token:
-            _h["Authorization"] = f"OAuth {self.oauth_token}"
-
-        _q = [
-            {
-                "extensions": {
-                    "persistedQuery": {"sha256Hash": query_hash, "version": 1}
-                },
-                "operationName": operation,
-                "variables": variables,
-            }
-        ]
+        _h = self._gql_headers(include_oauth)
+        _q = [self.gql_operation(operation, query_hash, variables)]
 
         # retry loop for 'service error' responses
         for _ in range(6):
-            _r = self.post_request("https://gql.twitch.tv/gql", j=_q, h=_h)
+            _r = self.post_request(GQL_URL, j=_q, h=_h)
 
             if "errors" in _r.json()[0].keys():
                 if _ == 5:
@@ -212,3 +254,113 @@ class Api:
                 continue
 
             return _r
+
+    def gql_query(
+        self, operation: dict, include_oauth: bool = False, use_cache: bool = True
+    ) -> dict:
+        """Post a single persisted GQL query and return its result, using the response cache if enabled.
+
+        :param operation: operation from gql_operation()
+        :param include_oauth: bool whether to include oauth token in header
+        :param use_cache: whether a cached result may be returned
+        :return: result of operation
+        :rtype: dict
+        """
+        if self.cache and use_cache:
+            _result = self.cache.get(operation)
+            if _result is not None:
+                return _result
+
+        _result = self.gql_request(
+            operation["operationName"],
+            operation["extensions"]["persistedQuery"]["sha256Hash"],
+            operation["variables"],
+            include_oauth,
+        ).json()[0]
+
+        if self.cache:
+            self.cache.put(operation, _result)
+
+        return _result
+
+    def gql_batch(
+        self,
+        operations: list,
+        include_oauth: bool = False,
+        attempts: int = 6,
+        use_cache: bool = True,
+    ) -> list[dict]:
+        """Post several GQL operations at once, splitting them into requests of up to GQL_BATCH_SIZE operations.
+
+        Only operations which returned errors are retried.
+
+        :param operations: operations to post, either persisted queries from gql_operation() or {"query": ...}
+        :type operations: list[dict]
+        :param include_oauth: bool whether to include oauth token in header
+        :param attempts: number of times to post operations which return errors
+        :param use_cache: whether cached results may be returned in place of posting operations
+        :return: result of each operation in the same order, which contain an 'errors' key for any which failed on
+            every attempt
+        :rtype: list[dict]
+        """
+        _h = self._gql_headers(include_oauth)
+        _results: list[dict] = [{} for _ in operations]
+        _pending = list(range(len(operations)))
+
+        if self.cache and use_cache:
+            for _i, _operation in enumerate(operations):
+                _result = self.cache.get(_operation)
+                if _result is not None:
+                    _results[_i] = _result
+                    _pending.remove(_i)
+
+        for _attempt in range(attempts):
+            if not _pending:
+                break
+
+            _failed = []
+            for _start in range(0, len(_pending), GQL_BATCH_SIZE):
+                _batch = _pending[_start : _start + GQL_BATCH_SIZE]
+                _r = self.post_request(
+                    GQL_URL, j=[operations[_i] for _i in _batch], h=_h
+                )
+
+                # results which don't match the operations sent can't be paired with them
+                try:
+                    _batch_results = list(zip(_batch, _r.json(), strict=True))
+
+                except ValueError as exc:
+                    raise TwitchAPIError(_r) from exc
+
+                for _i, _result in _batch_results:
+                    _results[_i] = _result
+                    if "errors" in _result.keys():
+                        _failed.append(_i)
+
+                    elif self.cache:
+                        self.cache.put(operations[_i], _result)
+
+            if not _failed:
+                break
+
+            _errors = [_results[_i]["errors"] for _i in _failed]
+            # failures are returned for the caller to handle
+            if _attempt == attempts - 1:
+                self.logging.debug(
+                    "%s GQL operations failed after %s attempts. Error: %s",
+                    len(_failed),
+                    attempts,
+                    _errors,
+                )
+                break
+
+            self.logging.error(
+                "Error returned for %s of %s GQL operations, retrying. Error: %s",
+                len(_failed),
+                len(operations),
+                _errors,
+            )
+            _pending = _failed
+            sleep(_attempt * 10)
+
+        return _results
@@ -0,0 +1,294 @@
+"""Module for caching responses from the Twitch API on disk."""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from time import time
+
+# seconds for which results describing a channel's current state are cached, just under the 10 seconds between watch
+# mode checks so repeated requests within a check are shared without a check seeing the results of the last one
+WATCH_TTL = 9
+
+# seconds for which the results of each GQL operation are cached, operations not listed aren't cached
+CACHE_TTLS = {
+    "VideoMetadata": 3600,
+    "ComscoreStreamingQuery": 86400,
+    "VideoPlayer_ChapterSelectButtonVideo": 86400,
+    "VideoPlayer_MutedSegmentsAlertOverlay": 3600,
+    "VideoPlayer_VODSeekbarPreviewVideo": 86400,
+    "ChannelShell": WATCH_TTL,
+    "FilterableVideoTower_Videos": WATCH_TTL,
+}
+
+# seconds for which the results of operations about a live stream rather than a VOD (those with the 'isLive' variable
+# set) are cached, in place of CACHE_TTLS
+LIVE_CACHE_TTLS = {
+    "ComscoreStreamingQuery": WATCH_TTL,
+}
+
+# default maximum number of cached results, the least recently used are removed beyond this
+MAX_ENTRIES = 10000
+
+# variables which hold the ID of the VOD an operation retrieves
+_VOD_ID_VARIABLES = ("videoID", "vodID")
+
+_CREATE_TABLE = [
+    """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        operation TEXT NOT NULL,
+        vod_id INTEGER,
+        result TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);",
+    "CREATE INDEX IF NOT EXISTS responses_vod_id ON responses (vod_id);",
+]
+
+
+class ResponseCache:
+    """Least recently used cache of GQL operation results stored in an SQLite database.
+
+    Results are keyed by operation name, query hash and variables, and expire after a time-to-live set for each
+    operation, with a separate time-to-live for operations about a live stream. Only persisted queries are cached.
+
+    Errors accessing the database are logged and treated as a cache miss so requests are never prevented.
+    """
+
+    _log = logging.getLogger()
+
+    def __init__(
+        self,
+        path: Path,
+        ttls: dict = None,
+        max_entries: int = MAX_ENTRIES,
+        live_ttls: dict = None,
+    ) -> None:
+        """Class constructor.
+
+        :param path: path to cache database
+        :param ttls: seconds for which the results of each operation are cached, defaults to CACHE_TTLS
+        :param max_entries: maximum number of cached results
+        :param live_ttls: seconds for which the results of each operation about a live stream are cached, defaults to
+            LIVE_CACHE_TTLS
+        """
+        self.path: Path = Path(path)
+        self.ttls: dict[str, float] = CACHE_TTLS if ttls is None else ttls
+        self.live_ttls: dict[str, float] = (
+            LIVE_CACHE_TTLS if live_ttls is None else live_ttls
+        )
+        self.max_entries: int = max(1, max_entries)
+
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection = None
+
+    def __getstate__(self) -> dict:
+        """Copy the state to be pickled, leaving out the lock and connection which can't be passed on."""
+        _state = self.__dict__.copy()
+        del _state["_lock"]
+        _state["_connection"] = None
+        return _state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore pickled state, creating a new lock. The database is reconnected on first use."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database, creating it if needed. Must be called with the lock held.
+
+        :return: database connection
+        :rtype: sqlite3.Connection
+        """
+        if self._connection is None:
+            self._connection = sqlite3.connect(
+                str(self.path), timeout=10, check_same_thread=False
+            )
+            with self._connection:
+                for _query in _CREATE_TABLE:
+                    self._connection.execute(_query)
+
+        return self._connection
+
+    @staticmethod
+    def _key(operation: dict) -> str | None:
+        """Generate the key a persisted query's result is stored under.
+
+        :param operation: GQL operation
+        :return: cache key, or None if the operation can't be cached
+        :rtype: str or None
+        """
+        try:
+            return json.dumps(
+                [
+                    operation["operationName"],
+                    operation["extensions"]["persistedQuery"]["sha256Hash"],
+                    operation["variables"],
+                ],
+                sort_keys=True,
+            )
+
+        except KeyError:
+            return None
+
+    def _ttl(self, operation: dict) -> float | None:
+        """Fetch the number of seconds for which the result of an operation is cached.
+
+        :param operation: GQL operation
+        :return: time-to-live of the result, or None if it isn't cached
+        :rtype: float or None
+        """
+        if operation["variables"].get("isLive"):
+            return self.live_ttls.get(operation["operationName"])
+
+        return self.ttls.get(operation["operationName"])
+
+    def get(self, operation: dict) -> dict | None:
+        """Fetch the cached result of a GQL operation.
+
+        :param operation: GQL operation
+        :return: cached result, or None if not cached or expired
+        :rtype: dict or None
+        """
+        _key = self._key(operation)
+        if _key is None or not self._ttl(operation):
+            return None
+
+        _now = time()
+        try:
+            with self._lock:
+                _connection = self._connect()
+                with _connection:
+                    _row = _connection.execute(
+                        "SELECT result FROM responses WHERE key = ? AND expires_at > ?",
+                        (_key, _now),
+                    ).fetchone()
+                    if _row is None:
+                        return None
+
+                    _connection.execute(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                        (_now, _key),
+                    )
+
+        except sqlite3.Error as err:
+            self._log.debug("Failed to read from response cache. Error: %s", err)
+            return None
+
+        self._log.debug("Using cached result for %s.", operation["operationName"])
+        return json.loads(_row[0])
+
+    def put(self, operation: dict, result: dict) -> None:
+        """Store the result of a GQL operation if the operation is cached.
+
+        The least recently used results are removed if the cache is full.
+
+        :param operation: GQL operation
+        :param result: result of operation
+        """
+        _key = self._key(operation)
+        if _key is None:
+            return
+
+        _ttl = self._ttl(operation)
+        if not _ttl:
+            return
+
+        _vod_id = next(
+            (
+                int(operation["variables"][_v])
+                for _v in _VOD_ID_VARIABLES
+                if str(operation["variables"].get(_v, "")).isdigit()
+            ),
+            None,
+        )
+
+        _now = time()
+        try:
+            with self._lock:
+                _connection = self._connect()
+                with _connection:
+                    _connection.execute(
+                        "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            _key,
+                            operation["operationName"],
+                            _vod_id,
+                            json.dumps(result),
+                            _now + _ttl,
+                            _now,
+                        ),
+                    )
+                    _count = _connection.execute(
+                        "SELECT COUNT(*) FROM responses"
+                    ).fetchone()[0]
+
+                    # remove expired results before those least recently used
+                    if _count > self.max_entries:
+                        _count -= _connection.execute(
+                            "DELETE FROM responses WHERE expires_at <= ?", (_now,)
+                        ).rowcount
+
+                    if _count > self.max_entries:
+                        _connection.execute(
+                            "DELETE FROM responses WHERE key IN "
+                            "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                            (_count - self.max_entries,),
+                        )
+
+        except sqlite3.Error as err:
+            self._log.debug("Failed to write to response cache. Error: %s", err)
+
+    def invalidate(self, vod_id: int = None, operation: str = None) -> None:
+        """Remove cached results for a VOD, operation, or both.
+
+        Results of live VODs should be invalidated as they change while the VOD is being broadcast.
+
+        :param vod_id: ID of VOD to remove results for
+        :param operation: name of operation to remove results for
+        """
+        _conditions = []
+        _values = []
+        if vod_id:
+            _conditions.append("vod_id = ?")
+            _values.append(int(vod_id))
+        if operation:
+            _conditions.append("operation = ?")
+            _values.append(operation)
+
+        if not _conditions:
+            return
+
+        try:
+            with self._lock:
+                _connection = self._connect()
+                with _connection:
+                    _connection.execute(
+                        f"DELETE FROM responses WHERE {' AND '.join(_conditions)}",
+                        _values,
+                    )
+
+        except sqlite3.Error as err:
+            self._log.debug("Failed to invalidate response cache. Error: %s", err)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        try:
+            with self._lock:
+                _connection = self._connect()
+                with _connection:
+                    _connection.execute("DELETE FROM responses")
+
+        except sqlite3.Error as err:
+            self._log.debug("Failed to clear response cache. Error: %s", err)
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
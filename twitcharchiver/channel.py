@@ -84,22 +84,24 @@ class Channel:
         self.display_name = owner["displayName"]
         self.stream = owner["stream"]
 
-    def _fetch_metadata(self):
-        """
-        Fetches metadata from Twitch regarding the channel.
+    def _fetch_metadata(self, use_cache: bool = True) -> dict:
+        """Fetch metadata from Twitch regarding the channel.
 
+        :param use_cache: whether a cached result may be used
         :return: retrieved user data
         :rtype dict
         """
         if self.id and not self.name:
             self.name = self._user_from_id(self.id)["login"]
 
-        _r = self._api.gql_request(
-            "ChannelShell",
-            "580ab410bcd0c1ad194224957ae2241e5d252b2c5173d8e0cce9d32d5bb14efe",
-            {"login": f"{self.name}"},
-        )
-        _user_data = _r.json()[0]["data"]["userOrError"]
+        _user_data = self._api.gql_query(
+            Api.gql_operation(
+                "ChannelShell",
+                "580ab410bcd0c1ad194224957ae2241e5d252b2c5173d8e0cce9d32d5bb14efe",
+                {"login": f"{self.name}"},
+            ),
+            use_cache=use_cache,
+        )["data"]["userOrError"]
         self._log.debug("User data for %s: %s", self.name, _user_data)
 
         # failure return contains "userDoesNotExist" key
@@ -135,18 +137,20 @@ class Channel:
         """
         # refresh metadata if it was last updated more than 60 seconds ago
         if time_since_date(self._last_update) > 60 or force_refresh:
-            self.refresh_metadata()
+            self.refresh_metadata(use_cache=not force_refresh)
         return self.stream is not None
 
-    def refresh_metadata(self):
-        """
-        Refreshes all metadata for the channel.
+    def refresh_metadata(self, use_cache: bool = True) -> None:
+        """Refresh all metadata for the channel.
+
+        :param use_cache: whether a recently cached result may be used
         """
-        self._parse_dict(self._fetch_metadata())
+        self._parse_dict(self._fetch_metadata(use_cache))
 
-    def get_stream_info(self):
-        """Retrieves information relating to a channel if it is currently live.
+    def get_stream_info(self, force_refresh: bool = False) -> dict:
+        """Retrieve information relating to a channel if it is currently live.
 
+        :param force_refresh: True if a recently cached result is to be ignored
         :return: dictionary with information about a channel's live stream if any
         :rtype: dict
         """
@@ -159,13 +163,14 @@ class Channel:
             "vodID": "",
         }
 
-        _r = self._api.gql_request(
-            "ComscoreStreamingQuery",
-            "e1edae8122517d013405f237ffcc124515dc6ded82480a88daef69c83b53ac01",
-            _query_vars,
-        )
-
-        _stream_info = _r.json()[0]["data"]["user"]
+        _stream_info = self._api.gql_query(
+            Api.gql_operation(
+                "ComscoreStreamingQuery",
+                "e1edae8122517d013405f237ffcc124515dc6ded82480a88daef69c83b53ac01",
+                _query_vars,
+            ),
+            use_cache=not force_refresh,
+        )["data"]["user"]
 
         if _stream_info:
             self._log.debug("Stream info for %s: %s", self.name, _stream_info)
@@ -334,10 +339,15 @@ class Channel:
         if _videos:
             return _videos[0]
 
-    def get_channel_archives(self):
-        """
-        Retrieves all available VODs for the channel.
+    def get_channel_archives(
+        self, known_vods: set = None, oldest_required: int = 0
+    ) -> "list[Vod]":
+        """Retrieve all available VODs for the channel.
+
+        Only VODs newer than any already archived are retrieved if known VODs are provided.
 
+        :param known_vods: IDs of VODs which are already archived, listing stops once one is reached
+        :param oldest_required: ID of the oldest VOD which must be listed even if known VODs are reached first
         :return: list of all available VODs for the channel
         :rtype: list[Vod]
         """
@@ -348,7 +358,7 @@ class Channel:
             "videoSort": "TIME",
         }
 
-        videos = self._get_channel_videos(_query_vars)
+        videos = self._get_channel_videos(_query_vars, known_vods, oldest_required)
         # set VOD type as none is provided by this query
         for v in videos:
             v.type = "ARCHIVE"
@@ -357,10 +367,16 @@ class Channel:
 
         return videos
 
-    def get_channel_highlights(self):
-        """
-        Retrieves all available highlights for the channel.
+    def get_channel_highlights(
+        self, known_vods: set = None, oldest_required: int = 0
+    ) -> "list[Vod]":
+        """Retrieve all available highlights for the channel.
 
+        Only highlights newer than any already archived are retrieved if known highlights are provided.
+
+        :param known_vods: IDs of highlights which are already archived, listing stops once one is reached
+        :param oldest_required: ID of the oldest highlight which must be listed even if known highlights are reached
+            first
         :return: list of all available highlights for the channel
         :rtype: list[Vod]
         """
@@ -371,7 +387,7 @@ class Channel:
             "videoSort": "TIME",
         }
 
-        videos = self._get_channel_videos(_query_vars)
+        videos = self._get_channel_videos(_query_vars, known_vods, oldest_required)
         # set VOD type as none is provided by this query
         for v in videos:
             v.type = "HIGHLIGHT"
@@ -380,38 +396,61 @@ class Channel:
 
         return videos
 
-    def _get_channel_videos(self, _query_vars):
-        """
-        Retrieves all available videos for the channel.
+    def _get_channel_videos(
+        self, _query_vars: dict, known_vods: set = None, oldest_required: int = 0
+    ) -> "list[Vod]":
+        """Retrieve all available videos for the channel.
+
+        As videos are sorted newest first, pages are no longer fetched once a known video and the oldest required
+        video have both been reached.
 
+        :param known_vods: IDs of videos which are already archived
+        :param oldest_required: ID of the oldest video which must be listed
         :return: list of all available videos for the channel
         :rtype: list[Vod]
         """
         from twitcharchiver import Vod
 
         _channel_videos = []
+        _reached_known = False
+        known_vods = known_vods or set()
         while True:
-            _r = self._api.gql_request(
-                "FilterableVideoTower_Videos",
-                "67004f7881e65c297936f32c75246470629557a393788fb5a69d6d9a25a8fd5f",
-                _query_vars,
+            # pages are cached briefly, so the channel isn't listed again by each check in a watch mode poll
+            _result = self._api.gql_query(
+                Api.gql_operation(
+                    "FilterableVideoTower_Videos",
+                    "67004f7881e65c297936f32c75246470629557a393788fb5a69d6d9a25a8fd5f",
+                    _query_vars,
+                )
             )
 
             # retrieve list of videos from response
             _videos = [
                 Vod(vod_info=v["node"])
-                for v in _r.json()[0]["data"]["user"]["videos"]["edges"]
+                for v in _result["data"]["user"]["videos"]["edges"]
             ]
             _channel_videos.extend(_videos)
 
+            # stop once known videos are reached, unless older videos which are required haven't been reached yet
+            _ids = [_v.v_id for _v in _videos]
+            _reached_known = _reached_known or any(_id in known_vods for _id in _ids)
+            if _reached_known and not (
+                oldest_required and min(_ids, default=0) > oldest_required
+            ):
+                self._log.debug(
+                    "Reached previously archived videos for %s, stopping listing.",
+                    self.name,
+                )
+                break
+
             if (
-                _r.json()[0]["data"]["user"]["videos"]["pageInfo"]["hasNextPage"]
+                _result["data"]["user"]["videos"]["pageInfo"]["hasNextPage"]
                 is not False
             ):
                 # set cursor
-                _query_vars["cursor"] = _r.json()[0]["data"]["user"]["videos"]["edges"][
-                    -1
-                ]["cursor"]
+                _query_vars["cursor"] = _result["data"]["user"]["videos"]["edges"][-1][
+                    "cursor"
+                ]
 
             else:
                 break
@@ -0,0 +1,134 @@
+"""Module for controlling how many downloads are kept in flight at once."""
+
+import logging
+import threading
+from types import TracebackType
+
+
+class AdaptiveConcurrency:
+    """Additive-increase / multiplicative-decrease (AIMD) controller for the number of segments downloaded at once.
+
+    Each completed download raises the limit by 1 / limit (roughly one extra slot per 'round' of downloads). Errors,
+    or a rise in the time taken per MiB well above its long-term average, cut the limit by the decrease factor. Only
+    one cut is made per round so a single burst of failures doesn't collapse the limit to the minimum.
+    """
+
+    _log = logging.getLogger()
+
+    def __init__(
+        self,
+        initial: int = 20,
+        minimum: int = 2,
+        maximum: int = 100,
+        decrease_factor: float = 0.5,
+        latency_factor: float = 2.0,
+    ) -> None:
+        """Class constructor.
+
+        :param initial: number of downloads allowed in flight to begin with
+        :param minimum: lowest number of downloads the limit can be reduced to
+        :param maximum: highest number of downloads the limit can be raised to
+        :param decrease_factor: factor the limit is multiplied by when congestion is detected
+        :param latency_factor: how far above its long-term average the recent time per MiB can rise before it is
+            treated as congestion
+        """
+        self.minimum: int = max(1, int(minimum))
+        self.maximum: int = max(self.minimum, int(maximum))
+        self._limit: float = float(min(max(int(initial), self.minimum), self.maximum))
+        self._decrease_factor: float = decrease_factor
+        self._latency_factor: float = latency_factor
+
+        # seconds per MiB, averaged over the last few and the last few hundred downloads
+        self._short_cost: float = 0.0
+        self._long_cost: float = 0.0
+
+        # completed downloads since the last decrease
+        self._since_decrease: int = self.limit
+        self._in_flight: int = 0
+        self._cond = threading.Condition()
+
+    def __getstate__(self) -> dict:
+        """Copy the state to be pickled, leaving out the condition which can't be passed to a separate process."""
+        _state = self.__dict__.copy()
+        del _state["_cond"]
+        _state["_in_flight"] = 0
+        return _state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore pickled state, creating a new condition."""
+        self.__dict__.update(state)
+        self._cond = threading.Condition()
+
+    def __enter__(self) -> "AdaptiveConcurrency":
+        """Wait for a download slot."""
+        self.acquire()
+        return self
+
+    def __exit__(
+        self, exc_type: type, exc_val: BaseException, exc_tb: TracebackType
+    ) -> None:
+        """Release the download slot."""
+        self.release()
+
+    @property
+    def limit(self) -> int:
+        """Current number of downloads allowed in flight.
+
+        :rtype: int
+        """
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        """Block until fewer than `limit` downloads are in flight, then take a slot."""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        """Release a slot taken with acquire()."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def record_success(self, size: int, elapsed: float) -> None:
+        """Record a completed download, increasing the limit unless it was much slower than usual.
+
+        :param size: number of bytes downloaded
+        :param elapsed: time in seconds the download took
+        """
+        if size <= 0 or elapsed <= 0:
+            return
+
+        _cost = elapsed / (size / 1048576)
+        with self._cond:
+            if not self._long_cost:
+                self._short_cost = self._long_cost = _cost
+            else:
+                self._short_cost += 0.3 * (_cost - self._short_cost)
+                self._long_cost += 0.02 * (_cost - self._long_cost)
+
+            self._since_decrease += 1
+
+            if self._short_cost > self._long_cost * self._latency_factor:
+                self._decrease(f"download time rising to {self._short_cost:.2f}s/MiB")
+
+            else:
+                self._limit = min(self.maximum, self._limit + 1 / self._limit)
+                self._cond.notify_all()
+
+    def record_error(self) -> None:
+        """Record a failed download (timeout, connection error or server error), decreasing the limit."""
+        with self._cond:
+            self._decrease("download error")
+
+    def _decrease(self, reason: str) -> None:
+        # only decrease once per round of downloads
+        if self._since_decrease < self.limit:
+            return
+
+        self._since_decrease = 0
+        self._limit = max(self.minimum, self._limit * self._decrease_factor)
+        self._log.debug(
+            "Reducing concurrent downloads to %s due to %s.", self.limit, reason
+        )
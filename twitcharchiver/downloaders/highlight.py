@@ -2,13 +2,11 @@ import os
 import re
 from pathlib import Path
 
+from twitcharchiver.concurrency import AdaptiveConcurrency
+from twitcharchiver.downloaders.video import Merger, Video
 from twitcharchiver.exceptions import VideoMergeError
-from twitcharchiver.vod import ArchivedVod
-from twitcharchiver.downloaders.video import Merger
-import m3u8
-
-from twitcharchiver.vod import Vod
-from twitcharchiver.downloaders.video import Video
+from twitcharchiver.scheduler import VodScheduler
+from twitcharchiver.vod import ArchivedVod, Vod
 
 
 class Highlight(Video):
@@ -19,8 +17,22 @@ class Highlight(Video):
         quality: str = "best",
         threads: int = 20,
         quiet: bool = False,
+        engine: str = "threads",
+        concurrency: AdaptiveConcurrency = None,
+        merge_mode: str = "concat",
+        scheduler: VodScheduler = None,
     ):
-        super().__init__(vod, parent_dir, quality, threads, quiet)
+        super().__init__(
+            vod,
+            parent_dir,
+            quality,
+            threads,
+            quiet,
+            engine,
+            concurrency,
+            merge_mode,
+            scheduler,
+        )
 
     @staticmethod
     def _extract_base_url(index_url: str):
@@ -48,6 +60,8 @@ class Highlight(Video):
             self._quiet,
             ignore_discontinuity=True,
             ignore_corrupt_parts=True,
+            incremental=self._merger,
+            pipe_parts=self.merge_mode == "pipe",
         )
 
         # attempt to merge
@@ -76,21 +90,25 @@ class Highlight(Video):
         """
         Fetch new segments for video (if any).
         """
-        self._prev_index_playlist = self._index_playlist
-        _raw_playlist = self.vod.get_index_playlist(self._index_url)
-        self._index_playlist = m3u8.loads(_raw_playlist)
-
-        # some highlights have issues with the final segment not containing all the vod information which can be
-        # recovered by grabbing the segment by its id rather than the URL twitch provides (e.g 2269206784).
-        # See https://github.com/Brisppy/twitch-archiver/issues/44
-        if str(self.vod.v_id) in self._index_playlist.segments[-1].uri:
+        self._update_playlist(self.vod.get_index_playlist(self._index_url))
+
+        # we can't rely on the duration contained within the index playlist for all Highlights as VOD 4807348
+        # is only 27 seconds long, but has a playlist duration of 35233.3
+
+    def _fix_final_segment(self, uri: str) -> None:
+        """Replace the URL of the final segment with one using its id.
+
+        Some highlights have issues with the final segment not containing all the vod information which can be
+        recovered by grabbing the segment by its id rather than the URL twitch provides (e.g 2269206784).
+        See https://github.com/Brisppy/twitch-archiver/issues/44
+
+        :param uri: playlist uri of the final segment
+        """
+        if str(self.vod.v_id) in uri:
             # we need to check the part is available as some highlights end with a segment named like this but do not
             # have one without the VOD ID available (367046564).
-            new_segment_id = self._index_playlist.segments[-1].uri.split("-")[1]
+            new_segment_id = uri.split("-")[1]
             _r = self._s.get(self._base_url + new_segment_id)
 
             if _r.status_code == 200:
-                self._index_playlist.segments[-1].uri = new_segment_id
-
-        # we can't rely on the duration contained within the index playlist for all Highlights as VOD 4807348
-        # is only 27 seconds long, but has a playlist duration of 35233.3
+                self._playlist_segments[-1].url = self._base_url + new_segment_id
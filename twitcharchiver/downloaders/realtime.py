@@ -5,13 +5,15 @@ from time import sleep
 
 from twitcharchiver import Configuration
 from twitcharchiver.api import Api
+from twitcharchiver.concurrency import AdaptiveConcurrency
 from twitcharchiver.downloader import Downloader
 from twitcharchiver.downloaders.chat import Chat
 from twitcharchiver.downloaders.stream import Stream
 from twitcharchiver.downloaders.video import Video
-from twitcharchiver.logger import ProcessWithLogging, ProcessLogger
+from twitcharchiver.logger import ProcessLogger, ProcessWithLogging
+from twitcharchiver.ratelimit import BandwidthLimiter
 from twitcharchiver.utils import get_temp_dir
-from twitcharchiver.vod import Vod, ArchivedVod
+from twitcharchiver.vod import ArchivedVod, Vod
 
 
 class RealTime(Downloader):
@@ -31,9 +33,11 @@ class RealTime(Downloader):
         archive_chat: bool = True,
         quality: str = "best",
         threads: int = 20,
+        engine: str = "threads",
+        concurrency: AdaptiveConcurrency = None,
+        merge_mode: str = "concat",
     ):
-        """
-        Class constructor.
+        """Class constructor.
 
         :param vod: VOD to be downloaded
         :type vod: Vod
@@ -45,6 +49,12 @@ class RealTime(Downloader):
         :type quality: str
         :param threads: number of worker threads to use when downloading
         :type threads: int
+        :param engine: segment download engine used by the video archiver, either 'threads' or 'async'
+        :type engine: str
+        :param concurrency: optional adaptive controller for the number of segments downloaded at once
+        :type concurrency: AdaptiveConcurrency
+        :param merge_mode: how downloaded video segments are merged, either 'concat', 'incremental' or 'pipe'
+        :type merge_mode: str
         """
         super().__init__(parent_dir, True)
 
@@ -53,6 +63,9 @@ class RealTime(Downloader):
         self.archive_chat = archive_chat
         self.quality = quality
         self.threads = threads
+        self.engine = engine
+        self.concurrency = concurrency
+        self.merge_mode = merge_mode
 
         self.chat = None
         self.stream = None
@@ -74,7 +87,16 @@ class RealTime(Downloader):
         self.stream = Stream(
             self.vod.channel, self.vod, self.parent_dir, self.quality, True, True
         )
-        self.video = Video(self.vod, self.parent_dir, self.quality, self.threads, True)
+        self.video = Video(
+            self.vod,
+            self.parent_dir,
+            self.quality,
+            self.threads,
+            True,
+            self.engine,
+            self.concurrency,
+            self.merge_mode,
+        )
 
         Path(logging_dir).mkdir(exist_ok=True, parents=True)
         # logging directory is used and moved into as Windows doesn't properly share the global logger, so it is
@@ -85,6 +107,11 @@ class RealTime(Downloader):
         process_logger = ProcessLogger.create_global_logger()
         process_logger.start()
 
+        # per-VOD and per-channel limits need to be shared by the stream, video and chat processes
+        _limiter = BandwidthLimiter.get_global_limiter()
+        if _limiter:
+            _limiter.share(self.vod)
+
         workers = [
             ProcessWithLogging(target=self.stream.start),
             ProcessWithLogging(target=self.video.start, args=[_q]),
@@ -123,6 +150,9 @@ class RealTime(Downloader):
                 process_logger.stop()
                 process_logger.join()
 
+            if _limiter:
+                _limiter.unshare(self.vod)
+
     def _handle_errors(self, workers):
         errors = []
 
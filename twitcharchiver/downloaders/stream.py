@@ -15,24 +15,27 @@ import requests
 
 from twitcharchiver.channel import Channel
 from twitcharchiver.downloader import Downloader
-from twitcharchiver.downloaders.video import MpegSegment, Merger
+from twitcharchiver.downloaders.video import Merger, MpegSegment
 from twitcharchiver.exceptions import (
-    TwitchAPIErrorNotFound,
-    UnsupportedStreamPartDuration,
-    StreamSegmentDownloadError,
     StreamFetchError,
     StreamOfflineError,
-    VideoMergeError,
+    StreamSegmentDownloadError,
     TwitchAPIError,
+    TwitchAPIErrorNotFound,
+    UnsupportedStreamPartDuration,
+    VideoMergeError,
 )
+from twitcharchiver.manifest import SegmentManifest
+from twitcharchiver.ratelimit import limit_bandwidth
 from twitcharchiver.utils import (
-    time_since_date,
-    safe_move,
+    HashingWriter,
     build_output_dir_name,
-    write_json_file,
     get_temp_dir,
+    safe_move,
+    time_since_date,
+    write_json_file,
 )
-from twitcharchiver.vod import Vod, ArchivedVod
+from twitcharchiver.vod import ArchivedVod, Vod
 
 CHECK_INTERVAL = 4
 
@@ -264,6 +267,7 @@ class Stream(Downloader):
         self.has_ended = False
 
         self._unsupported_parts = set()
+        self._manifest: SegmentManifest = None
 
         # channel-specific vars
         self.channel: Channel = channel
@@ -409,7 +413,8 @@ class Stream(Downloader):
                         )
                         raise StreamOfflineError(self.channel)
 
-                    _stream_info = self.channel.get_stream_info()
+                    # retries must not be given the cached result of the previous attempt
+                    _stream_info = self.channel.get_stream_info(force_refresh=_ > 0)
                     if not _stream_info["stream"]:
                         sleep(5)
                         continue
@@ -433,11 +438,11 @@ class Stream(Downloader):
             build_output_dir_name(self.vod.title, self.vod.created_at, self.vod.v_id),
         )
 
+        self._manifest = SegmentManifest(Path(self.output_dir, "parts"))
         if self.output_dir.exists():
             # get existing parts to resume counting if archiving halted
             self._completed_segments = [
-                MpegSegment(int(Path(p).name.removesuffix(".ts")), 10)
-                for p in list(Path(self.output_dir, "parts").glob("*.ts"))
+                MpegSegment(_id, 10) for _id in sorted(self._manifest.load())
             ]
 
         self._init_download_queue()
@@ -453,7 +458,7 @@ class Stream(Downloader):
         #   if parts remain in the buffer, we need to download them whether there are 5 parts or not
         if time_since_date(self._last_part_announce) > 20:
             # perform secondary check to see if stream is actually offline
-            _stream_info = self.channel.get_stream_info()
+            _stream_info = self.channel.get_stream_info(force_refresh=True)
             # check channel stream id matches ours
             if _stream_info["stream"]:
                 self._update_chapters()
@@ -660,7 +665,7 @@ class Stream(Downloader):
             self._log.debug(
                 "Downloading segment %s to %s.", segment.id, _temp_buffer_file
             )
-            with open(_temp_buffer_file, "wb") as _tmp_file:
+            with HashingWriter(_temp_buffer_file) as _tmp_file:
                 # iterate through each part of the segment, downloading them in order
                 for _part in segment.parts:
                     try:
@@ -672,6 +677,7 @@ class Stream(Downloader):
                         # write part to file
                         for chunk in _r.iter_content(chunk_size=262144):
                             _tmp_file.write(chunk)
+                            limit_bandwidth(len(chunk), self.vod)
 
                     except requests.exceptions.RequestException as exc:
                         self._log.debug(
@@ -682,15 +688,20 @@ class Stream(Downloader):
                         _download_error = True
                         break
 
+                # hash of the segment, computed as it was written
+                _hash = _tmp_file.hexdigest()
+
             if not _download_error:
                 # move finished ts file to destination storage
                 try:
+                    _size = _temp_buffer_file.stat().st_size
                     safe_move(
                         Path(_temp_buffer_file),
                         Path(
                             self.output_dir, "parts", str(f"{segment.id:05d}" + ".ts")
                         ),
                     )
+                    self._manifest.add(segment.id, _size, _hash)
                     self._completed_segments.append(segment)
                     self._log.debug("Stream segment: %s completed.", segment.id)
                     break
@@ -2,52 +2,84 @@
 Module used for downloading the video for a given Twitch VOD.
 """
 
+import asyncio
+import heapq
 import json
 import logging
 import os
+import queue
 import re
 import shutil
 import subprocess
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from collections.abc import Callable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
+from functools import partial
 from math import floor
 from pathlib import Path
-from time import sleep
+from time import monotonic, sleep
+from typing import BinaryIO
 
 import m3u8
 import requests
 from requests import adapters
 
 from twitcharchiver.api import Api
+from twitcharchiver.concurrency import AdaptiveConcurrency
 from twitcharchiver.downloader import Downloader
 from twitcharchiver.exceptions import (
-    VideoPartDownloadError,
-    TwitchAPIErrorNotFound,
+    CorruptPartError,
+    CorruptSegmentError,
     TwitchAPIErrorForbidden,
-    VideoDownloadError,
+    TwitchAPIErrorNotFound,
     VideoConvertError,
-    CorruptPartError,
+    VideoDownloadError,
+    VideoFormatUnsupported,
     VideoMergeError,
+    VideoPartDownloadError,
     VideoVerificationError,
-    VideoFormatUnsupported,
 )
-from twitcharchiver.twitch import MpegSegment
+from twitcharchiver.ffmpeg import FFmpeg
+from twitcharchiver.manifest import SegmentManifest
+from twitcharchiver.mp4 import read_mp4_duration
+from twitcharchiver.mpegts import TsValidator, find_start_pts, find_ts_corruption
+from twitcharchiver.ratelimit import limit_bandwidth, limit_bandwidth_async
+from twitcharchiver.scheduler import VodScheduler
+from twitcharchiver.twitch import MpegSegment, SegmentSet
 from twitcharchiver.utils import (
+    HashingWriter,
     Progress,
-    safe_move,
+    append_file,
     build_output_dir_name,
-    get_hash,
     format_vod_chapters,
+    get_hash,
+    get_temp_dir,
+    hashes_match,
+    safe_move,
     time_since_date,
     write_json_file,
-    get_temp_dir,
-    sanitize_command,
 )
-from twitcharchiver.vod import Vod, ArchivedVod
+from twitcharchiver.vod import ArchivedVod, Vod
 
 # time in seconds between checking for new VOD parts if VOD is currently live and being updated
 CHECK_INTERVAL = 60
 
+# number of workers moving downloaded segments from $TMP to the output directory
+MOVE_THREADS = 4
+
+# number of attempts made to download each segment
+SEGMENT_ATTEMPTS = 5
+
+# number of segments per download worker which may be queued ahead of those being downloaded
+LOOKAHEAD = 2
+
+# number of bytes read from the start of the first part to find its start time
+START_PTS_READ_SIZE = 65536
+
+# journal of segments appended to merged.ts while downloading, stored in a VOD's 'parts' directory
+MERGE_JOURNAL_NAME = "merged.jsonl"
+
 
 class Video(Downloader):
     """
@@ -65,20 +97,34 @@ class Video(Downloader):
         quality: str = "best",
         threads: int = 20,
         quiet: bool = False,
+        engine: str = "threads",
+        concurrency: AdaptiveConcurrency = None,
+        merge_mode: str = "concat",
+        scheduler: VodScheduler = None,
     ):
-        """
-        Class used for downloading the video for a given Twitch VOD.
+        """Class used for downloading the video for a given Twitch VOD.
 
         :param vod: VOD to be downloaded
         :param parent_dir: path to parent directory for downloaded files
         :param quality: quality to download in the format [resolution]p[framerate], or either 'best' or 'worst'
         :param quiet: boolean whether to print progress
-        :param threads: number of worker threads to use when downloading
+        :param threads: number of worker threads (or concurrent requests with the async engine) to use when
+            downloading
+        :param engine: segment download engine, either 'threads' or 'async'
+        :param concurrency: optional adaptive controller for the number of segments downloaded at once, used in place
+            of a fixed number of threads
+        :param merge_mode: how downloaded segments are merged, either 'concat', 'incremental' or 'pipe'
+        :param scheduler: optional scheduler whose download workers are shared with other VODs being downloaded
         """
         # init downloader
         super().__init__(parent_dir, quiet)
 
         self.threads = threads
+        self.engine = engine
+        self.concurrency: AdaptiveConcurrency = concurrency
+        self.move_threads = MOVE_THREADS
+        self.merge_mode = merge_mode
+        self.scheduler: VodScheduler = scheduler
 
         # set quality
         self.__setattr__("_quality", quality)
@@ -92,40 +138,85 @@ class Video(Downloader):
 
         # buffers and progress tracking
         # collect previously downloaded segments (if any)
-        self._completed_segments: set[MpegSegment] = self.get_completed_segments(
-            self.output_dir
+        self._manifest: SegmentManifest = SegmentManifest(
+            Path(self.output_dir, "parts")
         )
-        self._muted_segments: set[MpegSegment] = set()
+        self._completed_segments: SegmentSet = SegmentSet(self._manifest.load())
+        self._muted_segments: SegmentSet = SegmentSet()
+
+        # segments already appended to merged.ts have their parts deleted, so are tracked by the incremental merger
+        self._merger: IncrementalMerger = None
+        if self.merge_mode == "incremental":
+            self._merger = IncrementalMerger(self.output_dir)
+            self._completed_segments.update(self._merger.load())
 
         # expand download https session pool
         self._s: requests.Session = requests.session()
-        _a = requests.adapters.HTTPAdapter(pool_connections=100, pool_maxsize=100)
+        _pool_size = max(100, self._max_workers())
+        _a = requests.adapters.HTTPAdapter(
+            pool_connections=_pool_size, pool_maxsize=_pool_size
+        )
         self._s.mount("https://", _a)
 
         # video segment containers and required params
         self._index_url: str = ""
         self._base_url: str = ""
-        self._index_playlist: m3u8 = None
-        self._prev_index_playlist: m3u8 = None
+
+        # playlist segments are tracked incrementally, with only the tail added since the last refresh being parsed
+        self._playlist_segments: list[MpegSegment] = []
+        self._new_segments: list[MpegSegment] = []
+        self._unfinished_segments: set[MpegSegment] = set()
+        self._last_segment_uri: str = ""
+
+        # long-lived download workers, created on first use and kept until the download finishes
+        self._worker_pool: ThreadPoolExecutor = None
+        self._async_loop: asyncio.AbstractEventLoop = None
+        self._async_thread: threading.Thread = None
+        self._async_session = None
+        self._async_gate: asyncio.Condition = None
+        self._async_running: int = 0
+
+        # segments waiting to be queued, queued / in-flight downloads and the errors of failed ones
+        self._backlog: list[MpegSegment] = []
+        self._backlog_set: SegmentSet = SegmentSet()
+        self._pending: dict[MpegSegment, Future] = {}
+        self._download_errors: dict[MpegSegment, Exception] = {}
+        self._schedule_lock = threading.RLock()
+
+        # index into playlist segments of the first segment which isn't yet ready in the output directory
+        self._ready_index: int = 0
+        self._skipped_segments: SegmentSet = SegmentSet()
+
+        # index into playlist segments of the first segment not yet appended by the incremental merger
+        self._merge_index: int = 0
+        self._merge_paused: bool = False
+        self._merge_lock = threading.Lock()
+
+        # moves downloaded segments to the output directory while downloads are running
+        self._mover: SegmentMover = None
+
+        # set when the download is cancelled from another thread
+        self._cancelled = threading.Event()
+
+    def __getstate__(self) -> dict:
+        """Copy the state to be pickled, leaving out the locks which can't be passed to the parent process."""
+        _state = self.__dict__.copy()
+        del _state["_schedule_lock"]
+        del _state["_merge_lock"]
+        del _state["_cancelled"]
+        _state["scheduler"] = None
+        return _state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore pickled state, creating new locks."""
+        self.__dict__.update(state)
+        self._schedule_lock = threading.RLock()
+        self._merge_lock = threading.Lock()
+        self._cancelled = threading.Event()
 
     def export_metadata(self):
         write_json_file(self.vod.to_dict(), Path(self.output_dir, "vod.json"))
 
-    @staticmethod
-    def get_completed_segments(directory):
-        """
-        Fetches all segments which have been downloaded to the output directory.
-
-        :param directory: directory containing *.ts files
-        :type directory: str or Path
-        :return: set of segments inside directory
-        :rtype: set[MpegSegment]
-        """
-        return {
-            MpegSegment(int(Path(p).name.removesuffix(".ts")), 10)
-            for p in list(Path(directory, "parts").glob("*.ts"))
-        }
-
     def start(self, _q=None):
         """
         Begin downloading video segments for given VOD until all parts downloaded and stream has ended (if live).
@@ -145,13 +236,13 @@ class Video(Downloader):
                     "Delaying archival of VOD %s as VOD has been live for less than 5 minutes.",
                     self.vod.v_id,
                 )
-                sleep(300 - _time_since_start)
+                self._sleep(300 - _time_since_start)
 
             self._index_url = self.vod.get_index_url(self._quality)
             self._base_url = self._extract_base_url(self._index_url)
 
-            # download once
-            self._download()
+            # queue all available segments, these download in the background while checking for new ones
+            self._download(wait=False)
 
             # while VOD live, check for new parts every CHECK_INTERVAL seconds. if no new parts discovered after
             # CHECK_INTERVAL * VOD_OFFLINE_TIME seconds, or error returned when trying to check VOD status,
@@ -164,14 +255,14 @@ class Video(Downloader):
 
                 # refresh VOD metadata
                 self.vod.refresh_vod_metadata()
-                self._download()
+                self._download(wait=False)
 
                 # sleep if processing time < CHECK_INTERVAL before fetching new messages
                 _loop_time = int(
                     datetime.now(timezone.utc).timestamp() - _start_timestamp
                 )
                 if _loop_time < CHECK_INTERVAL:
-                    sleep(CHECK_INTERVAL - _loop_time)
+                    self._sleep(CHECK_INTERVAL - _loop_time)
 
             # delay final archive pass if stream just ended
             self.vod.refresh_vod_metadata()
@@ -179,11 +270,18 @@ class Video(Downloader):
                 self._log.debug(
                     "Stream ended less than 5m ago, delaying before final video archive attempt."
                 )
-                sleep(300)
+                self._sleep(300)
 
                 # refresh VOD metadata
                 self.vod.refresh_vod_metadata()
-                self._download()
+
+            # segments renamed since they were parsed (e.g. once muted) aren't found by only parsing the playlist's new
+            # tail, so the whole playlist is parsed again on the final pass
+            with self._schedule_lock, self._merge_lock:
+                self._reset_playlist()
+
+            # queue any segments added since the last pass and wait for everything to finish
+            self._download()
 
         except VideoFormatUnsupported as exc:
             raise VideoFormatUnsupported from exc
@@ -207,15 +305,37 @@ class Video(Downloader):
             raise VideoDownloadError(exc) from exc
 
         finally:
+            # stop download workers, which can't be passed back through the mp queue
+            self._shutdown_workers()
+            if self.scheduler:
+                self.scheduler.download_finished(self)
+
             # put self into mp queue if provided
             if _q:
                 _q.put(self, block=False)
 
+    def cancel(self) -> None:
+        """Cancel the download from another thread, causing it to raise KeyboardInterrupt on its own thread."""
+        self._cancelled.set()
+        with self._schedule_lock:
+            self._backlog = []
+            self._backlog_set.clear()
+            for _future in self._pending.values():
+                _future.cancel()
+
+    def _sleep(self, seconds: float) -> None:
+        """Wait for the given number of seconds, or until the download is cancelled.
+
+        :param seconds: number of seconds to wait
+        :raises KeyboardInterrupt: if the download is cancelled
+        """
+        if self._cancelled.wait(seconds):
+            raise KeyboardInterrupt
+
     def refresh_playlist(self):
         """
         Fetch new segments for video (if any).
         """
-        self._prev_index_playlist = self._index_playlist
         _raw_playlist = self.vod.get_index_playlist(self._index_url)
 
         # check playlist version
@@ -224,38 +344,114 @@ class Video(Downloader):
             self._log.debug("VOD uses HEVC.")
             raise NotImplementedError
 
-        self._index_playlist = m3u8.loads(_raw_playlist)
+        self._update_playlist(_raw_playlist)
 
         # update VOD duration
         try:
             self.vod.duration = floor(
                 float(
-                    re.findall(
-                        r"(?<=#EXT-X-TWITCH-TOTAL-SECS:).*(?=\n)", _raw_playlist
-                    )[0]
+                    re.search(r"(?<=#EXT-X-TWITCH-TOTAL-SECS:).*(?=\n)", _raw_playlist)[
+                        0
+                    ]
                 )
             )
         except Exception as exc:
             self._log.error("Failed to update VOD duration. Error: %s", exc)
 
-    def _download(self):
+    def _update_playlist(self, raw_playlist: str) -> None:
+        """Add segments which have been appended to the playlist since the last refresh.
+
+        Only the new tail of the playlist is parsed, falling back to parsing the whole playlist on the first refresh
+        or if the previous final segment can no longer be found.
+
+        :param raw_playlist: m3u8 playlist retrieved from Twitch
+        :raises VideoFormatUnsupported: if the playlist uses an unsupported segment format
         """
-        Begin downloading segments, fetching new segments as they come out (if VOD live) until stream/VOD ends.
+        _tail_start = self._find_playlist_tail(raw_playlist)
+
+        if _tail_start is None:
+            _segments = m3u8.loads(raw_playlist).segments
+            self._reset_playlist()
+
+            # some old vods use a different URI format
+            if _segments and len(_segments[0].uri.split("-")) == 4:
+                raise VideoFormatUnsupported
+
+            # another old vod format
+            elif _segments and "start_offset" in _segments[0].uri:
+                raise VideoFormatUnsupported
+
+        else:
+            _segments = m3u8.loads(raw_playlist[_tail_start:]).segments
+
+        _converted = [
+            MpegSegment.convert_m3u8_segment(_s, self._base_url) for _s in _segments
+        ]
+        self._new_segments.extend(_converted)
+        self._playlist_segments.extend(_converted)
+
+        if _segments:
+            self._last_segment_uri = _segments[-1].uri
+            self._fix_final_segment(_segments[-1].uri)
+
+    def _find_playlist_tail(self, raw_playlist: str) -> int | None:
+        """Find where segments added since the last refresh begin in a playlist.
+
+        :param raw_playlist: m3u8 playlist retrieved from Twitch
+        :return: index of the first character after the previous final segment, or None if it wasn't found
+        :rtype: int or None
         """
-        self.refresh_playlist()
-        self.download_m3u8_playlist()
+        if not self._last_segment_uri:
+            return None
+
+        # new segments are appended to the end of the playlist, so search backwards for the previous final segment
+        _pos = raw_playlist.rfind("\n" + self._last_segment_uri)
+        if _pos == -1:
+            return None
+
+        _end = _pos + len(self._last_segment_uri) + 1
+        if _end < len(raw_playlist) and raw_playlist[_end] not in "\r\n":
+            return None
+
+        return _end
+
+    def _reset_playlist(self) -> None:
+        """Discard tracked playlist segments so the whole playlist is processed on the next refresh."""
+        self._playlist_segments = []
+        self._new_segments = []
+        self._unfinished_segments = set()
+        self._last_segment_uri = ""
+        self._ready_index = 0
+        self._merge_index = 0
+
+    def _fix_final_segment(self, uri: str) -> None:
+        """Replace the URL of the final segment with one using its id.
 
-        # refresh mpegts segment playlist
+        Some highlights have issues with the final segment not containing all the vod information which can be
+        recovered by grabbing the segment by its id rather than the URL twitch provides (e.g 2269206784).
+        See https://github.com/Brisppy/twitch-archiver/issues/44
+
+        :param uri: playlist uri of the final segment
+        """
+        if str(self.vod.v_id) in uri:
+            self._playlist_segments[-1].url = self._base_url + uri.split("-")[1]
+
+    def _download(self, wait: bool = True) -> None:
+        """Refresh the playlist and queue any new (or previously failed) segments on the download workers.
+
+        :param wait: whether to wait for all queued segments to finish downloading
+        """
+        _known_segments = len(self._playlist_segments)
         self.refresh_playlist()
 
-        # fetch downloaded files in-case being run in parallel with stream archiver so we don't try and
+        # fetch segments added to the manifest in-case being run in parallel with stream archiver so we don't try and
         # download anything already completed
-        self._completed_segments = self.get_completed_segments(self.output_dir)
+        self._completed_segments.update(self._manifest.refresh())
 
-        # if new segments found, download them
-        if len(self._prev_index_playlist.segments) < len(self._index_playlist.segments):
+        if _known_segments and self._new_segments:
             self._log.debug("New VOD parts found.")
-            self.download_m3u8_playlist()
+
+        self.download_m3u8_playlist(wait)
 
     @staticmethod
     def _extract_base_url(index_url: str):
@@ -269,84 +465,490 @@ class Video(Downloader):
         return index_url.replace(_m, "")
 
     def _build_buffer(self):
-        buffer: set[MpegSegment] = set()
-
-        # process all segments in playlist
-        for segment in [
-            MpegSegment.convert_m3u8_segment(_s, self._base_url)
-            for _s in self._index_playlist.segments
-        ]:
-            # add segment to download buffer if it isn't completed
-            if segment not in self._completed_segments:
-                buffer.add(segment)
+        # only segments added by the last refresh, or which weren't finished on a previous pass, are checked
+        _candidates = self._unfinished_segments.union(self._new_segments)
+        self._new_segments = []
 
+        for segment in _candidates:
             if segment.muted:
                 self._muted_segments.add(segment)
 
+        self._unfinished_segments = {
+            _s for _s in _candidates if _s not in self._completed_segments
+        }
+
+        # add segment to download buffer if it isn't completed or already queued
+        with self._schedule_lock:
+            buffer: list[MpegSegment] = sorted(
+                _s
+                for _s in self._unfinished_segments
+                if _s not in self._pending and _s not in self._backlog_set
+            )
+
         return buffer
 
-    def download_m3u8_playlist(self):
-        """Downloads the video for a specified m3u8 playlist.
+    def download_m3u8_playlist(self, wait: bool = True) -> None:
+        """Download the video for a specified m3u8 playlist.
 
+        :param wait: whether to wait for all queued segments to finish downloading
         :raises vodPartDownloadError: error returned when downloading vod parts
         """
         # rare issue with VODs with no parts (e.g 40800466)
-        if len(self._index_playlist.segments) == 0:
+        if len(self._playlist_segments) == 0:
             return
 
-        # some old vods use a different URI format
-        if len(self._index_playlist.segments[0].uri.split("-")) == 4:
-            raise VideoFormatUnsupported
+        _buffer = self._build_buffer()
 
-        # another old vod format
-        elif "start_offset" in self._index_playlist.segments[0].uri:
-            raise VideoFormatUnsupported
+        if _buffer:
+            self._submit_segments(_buffer)
 
-        # some highlights have issues with the final segment not containing all the vod information which can be
-        # recovered by grabbing the segment by its id rather than the URL twitch provides (e.g 2269206784).
-        # See https://github.com/Brisppy/twitch-archiver/issues/44
-        if str(self.vod.v_id) in self._index_playlist.segments[-1].uri:
-            self._index_playlist.segments[-1].uri = self._index_playlist.segments[
-                -1
-            ].uri.split("-")[1]
+        elif self.scheduler:
+            self.scheduler.segments_queued(self)
 
-        _buffer = self._build_buffer()
+        if wait:
+            self._wait_for_downloads()
 
-        if _buffer:
-            _worker_pool = ThreadPoolExecutor(max_workers=self.threads)
-            download_error = []
-            futures = []
-            try:
-                # add orders to worker pool
-                for segment in _buffer:
-                    futures.append(_worker_pool.submit(self._get_ts_segment, segment))
+    @property
+    def ready_segment_id(self) -> int | None:
+        """Highest segment id for which it and every segment before it in the playlist are in the output directory.
+
+        Skipped segments count as moved, allowing the segments to be used before the whole VOD is downloaded.
+
+        :return: segment id, or None if the first segment isn't ready
+        :rtype: int or None
+        """
+        self._advance_ready_prefix()
+        if self._ready_index == 0:
+            return None
+
+        return self._playlist_segments[self._ready_index - 1].id
+
+    def _advance_ready_prefix(self) -> None:
+        """Advance the contiguous prefix of playlist segments which are ready in the output directory."""
+        with self._schedule_lock:
+            while self._ready_index < len(self._playlist_segments):
+                segment = self._playlist_segments[self._ready_index]
+                if (
+                    segment.id not in self._manifest
+                    and segment not in self._skipped_segments
+                    and not (self._merger is not None and segment.id in self._merger)
+                ):
+                    break
+
+                self._ready_index += 1
+
+        self._merge_ready_segments()
+
+    def _merge_ready_segments(self) -> None:
+        """Append segments in the ready prefix to merged.ts when merging incrementally, deleting their parts."""
+        if self._merger is None or self._merge_paused:
+            return
 
-                progress = Progress()
+        with self._merge_lock:
+            while self._merge_index < self._ready_index:
+                segment = self._playlist_segments[self._merge_index]
+                if segment.id not in self._merger:
+                    # skipped segments leave a gap, so the remaining parts are merged once downloading finishes
+                    if segment.id not in self._manifest:
+                        return
 
-                # complete orders in worker pool
-                for future in futures:
-                    if future.exception():
-                        # append any returned errors
-                        download_error.append(future.exception())
+                    try:
+                        self._merger.append(
+                            segment.id, self._manifest.get(segment.id)["hash"]
+                        )
 
-                    if not self._quiet:
-                        progress.print_progress(
-                            len(self._completed_segments),
-                            len(self._index_playlist.segments),
+                    except OSError as exc:
+                        self._log.error(
+                            "Failed to append segment %s to merged VOD. Error: %s",
+                            segment.id,
+                            exc,
                         )
+                        return
+
+                    self._manifest.remove(segment.id)
+
+                self._merge_index += 1
+
+    def _lookahead(self) -> int:
+        """Fetch the number of segments which may be queued on the download workers at once.
+
+        :rtype: int
+        """
+        return self._max_workers() * LOOKAHEAD
+
+    def _submit_segments(self, buffer: list[MpegSegment]) -> None:
+        """Queue the provided segments for download, starting the workers if they aren't already running.
+
+        Workers are kept for the lifetime of the download so segments found on later playlist refreshes go straight
+        into the same pool.
+
+        Segments are handed to the workers lowest id first, with only a bounded number queued ahead of those being
+        downloaded, so the VOD completes roughly in order.
+
+        :param buffer: segments to download
+        """
+        if self._mover is None:
+            self._start_mover()
+
+        if self.engine == "async" and self._async_loop is None:
+            self._start_async_workers()
+
+        elif self.engine != "async" and self._worker_pool is None:
+            if self.scheduler:
+                self._worker_pool = self.scheduler.get_pool()
+
+            else:
+                self._worker_pool = ThreadPoolExecutor(max_workers=self._max_workers())
+
+        with self._schedule_lock:
+            for segment in buffer:
+                heapq.heappush(self._backlog, segment)
+                self._backlog_set.add(segment)
+
+        self._fill_window()
+
+    def _fill_window(self) -> None:
+        """Move the lowest segments from the backlog onto the download workers until the look-ahead window is full."""
+        with self._schedule_lock:
+            while self._backlog and len(self._pending) < self._lookahead():
+                segment = heapq.heappop(self._backlog)
+                self._backlog_set.discard(segment)
+
+                _future = self._submit_segment(segment)
+                self._pending[segment] = _future
+                _future.add_done_callback(partial(self._segment_done, segment))
+
+            # the next VOD can start filling the shared workers while this one drains
+            if not self._backlog and self.scheduler:
+                self.scheduler.segments_queued(self)
+
+    def _submit_segment(self, segment: MpegSegment) -> Future:
+        """Submit a single segment to the download workers of the selected engine.
+
+        :param segment: segment to download
+        :return: future for the segment download
+        :rtype: concurrent.futures.Future
+        """
+        if self.engine == "async":
+            return asyncio.run_coroutine_threadsafe(
+                self._get_ts_segment_gated(segment), self._async_loop
+            )
+
+        # with adaptive concurrency, workers wait for a free slot before downloading
+        if self.concurrency:
+            return self._worker_pool.submit(self._get_ts_segment_adaptive, segment)
+
+        return self._worker_pool.submit(self._get_ts_segment, segment)
+
+    def _segment_done(self, segment: MpegSegment, future: Future) -> None:
+        """Record the outcome of a finished segment download and queue the next segment from the backlog.
+
+        :param segment: segment which was downloaded
+        :param future: future of the finished download
+        """
+        with self._schedule_lock:
+            # outcome may already have been recorded while waiting for downloads
+            if self._pending.get(segment) is not future:
+                return
+
+            del self._pending[segment]
+            if future.cancelled():
+                return
+
+            # a failed segment is retried on the next pass, so only keep the error of its latest attempt
+            if future.exception():
+                self._download_errors[segment] = future.exception()
+
+            else:
+                self._download_errors.pop(segment, None)
+
+            self._fill_window()
+
+    def _wait_for_downloads(self) -> None:
+        """Wait for all queued segments to be downloaded and moved to the output directory.
+
+        :raises VideoPartDownloadError: if any segment failed to download
+        """
+        progress = Progress()
+
+        try:
+            while True:
+                if self._cancelled.is_set():
+                    raise KeyboardInterrupt
+
+                with self._schedule_lock:
+                    _pending = dict(self._pending)
+
+                if not _pending:
+                    break
+
+                wait(_pending.values(), return_when=FIRST_COMPLETED)
+
+                # done callbacks may still be running, so record outcomes here as well
+                for segment, _future in _pending.items():
+                    if _future.done():
+                        self._segment_done(segment, _future)
+
+                if not self._quiet:
+                    progress.print_progress(
+                        len(self._completed_segments),
+                        len(self._playlist_segments),
+                    )
+
+            # wait for downloaded segments to finish moving
+            if self._mover:
+                self._mover.join()
+
+            self._advance_ready_prefix()
+
+        except KeyboardInterrupt as exc:
+            self._log.debug(
+                "M3U8 playlist downloader caught interrupt, shutting down workers..."
+            )
+            self._shutdown_workers()
+            raise KeyboardInterrupt from exc
+
+        with self._schedule_lock:
+            download_error = list(self._download_errors.values())
+            self._download_errors.clear()
+
+        if download_error:
+            raise VideoPartDownloadError(download_error)
+
+    def _shutdown_workers(self) -> None:
+        """Cancel any queued downloads and stop the download and move workers."""
+        with self._schedule_lock:
+            self._backlog = []
+            self._backlog_set.clear()
+            _pending = list(self._pending.values())
+
+        for _future in _pending:
+            _future.cancel()
+
+        # workers shared with other VODs are left running, only waiting for this VOD's downloads to finish
+        if self._worker_pool and self.scheduler:
+            wait(_pending)
+            self._worker_pool = None
+
+        elif self._worker_pool:
+            self._worker_pool.shutdown(wait=True, cancel_futures=True)
+            self._worker_pool = None
+
+        if self._async_loop:
+            asyncio.run_coroutine_threadsafe(
+                self._stop_async_workers(), self._async_loop
+            ).result()
+            self._async_loop.call_soon_threadsafe(self._async_loop.stop)
+            self._async_thread.join()
+            self._async_loop.close()
+            self._async_loop = None
+            self._async_thread = None
+            self._async_session = None
+            self._async_gate = None
+
+        self._pending.clear()
+        self._stop_mover()
+
+    def _start_async_workers(self) -> None:
+        """Start an event loop on a background thread.
+
+        The aiohttp session shared by all async segment downloads is created on the loop.
+
+        :raises VideoDownloadError: if aiohttp is not installed
+        """
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError as exc:
+            raise VideoDownloadError(
+                "The async download engine requires aiohttp. Install it with 'pip install twitch-archiver[async]'."
+            ) from exc
+
+        self._async_loop = asyncio.new_event_loop()
+        self._async_thread = threading.Thread(
+            target=self._async_loop.run_forever, daemon=True
+        )
+        self._async_thread.start()
+        self._async_gate = asyncio.Condition()
+        self._async_running = 0
+        self._async_session = asyncio.run_coroutine_threadsafe(
+            self._create_async_session(), self._async_loop
+        ).result()
+
+    async def _create_async_session(self) -> "aiohttp.ClientSession":
+        """Create the aiohttp session used for async segment downloads.
+
+        :return: aiohttp session
+        :rtype: aiohttp.ClientSession
+        """
+        import aiohttp
+
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self._max_workers()),
+            timeout=aiohttp.ClientTimeout(sock_connect=10, sock_read=10),
+        )
+
+    async def _stop_async_workers(self) -> None:
+        """Wait for cancelled segment downloads to finish on the event loop, then close the aiohttp session."""
+        _tasks = [_t for _t in asyncio.all_tasks() if _t is not asyncio.current_task()]
+        await asyncio.gather(*_tasks, return_exceptions=True)
+        await self._async_session.close()
+
+    async def _get_ts_segment_gated(self, segment: MpegSegment) -> None:
+        """Retrieve a specific ts file, limited by the adaptive concurrency controller.
+
+        The download waits until fewer than `threads` (or the adaptive concurrency limit) downloads are in flight.
+
+        :param segment: MPEGTS segment to download
+        """
+        async with self._async_gate:
+            await self._async_gate.wait_for(
+                lambda: self._async_running < self._concurrency_limit()
+            )
+            self._async_running += 1
+
+        try:
+            await self._get_ts_segment_async(self._async_session, segment)
 
-                if download_error:
-                    raise VideoPartDownloadError(download_error)
+        finally:
+            async with self._async_gate:
+                self._async_running -= 1
+                self._async_gate.notify_all()
+
+    def _max_workers(self) -> int:
+        """Fetch the highest number of segments which may be downloaded at once.
+
+        :rtype: int
+        """
+        if self.concurrency:
+            return self.concurrency.maximum
+
+        return self.threads
+
+    def _concurrency_limit(self) -> int:
+        """Fetch the number of segments which should currently be downloaded at once.
+
+        :rtype: int
+        """
+        if self.concurrency:
+            return self.concurrency.limit
+
+        return self.threads
+
+    def _record_attempt(self, status: int, size: int, started: float) -> None:
+        """Report the outcome of a segment request to the adaptive concurrency controller (if any).
+
+        :param status: HTTP status code of the response, or 0 if the request failed
+        :param size: number of bytes downloaded
+        :param started: monotonic time the request began
+        """
+        if not self.concurrency:
+            return
+
+        # timeouts, connection errors, rate limiting and server errors point to congestion, while 403 / 404 are
+        # expected when checking for muted segments
+        if status == 0 or status == 429 or status >= 500:
+            self.concurrency.record_error()
+
+        elif status == 200:
+            self.concurrency.record_success(size, monotonic() - started)
+
+    def _start_mover(self) -> None:
+        """Start the workers which move downloaded segments to the output directory."""
+        self._mover = SegmentMover(
+            self._move_queued_segment, self.move_threads, self.threads
+        )
+        self._mover.start()
+
+    def _stop_mover(self) -> list[Exception]:
+        """Wait for all queued segments to be moved and stop the move workers.
+
+        :return: list of exceptions raised while moving segments
+        :rtype: list[Exception]
+        """
+        if self._mover is None:
+            return []
+
+        _mover, self._mover = self._mover, None
+        return _mover.stop()
+
+    def _move_queued_segment(
+        self, segment: MpegSegment, tmp_path: Path, digest: str = ""
+    ) -> None:
+        """Move a segment handed over to the move workers.
+
+        Any failure is recorded against the segment so it is reported (or cleared if the segment is downloaded
+        again) along with download errors.
+
+        :param segment: segment which was downloaded
+        :param tmp_path: temporary file the segment was downloaded to
+        :param digest: hash of the segment computed while it was downloaded
+        """
+        try:
+            self._move_segment(segment, tmp_path, digest)
+            self._advance_ready_prefix()
+
+        except VideoPartDownloadError as exc:
+            # errors are also recorded by download callbacks on other threads
+            with self._schedule_lock:
+                self._download_errors[segment] = exc
+
+    def _segment_urls(self, segment: MpegSegment) -> list[str]:
+        """Generate the URLs to try for a given segment.
+
+        :param segment: segment to generate URLs for
+        :return: original url, falling back to muted url for unmuted segments
+        :rtype: list[str]
+        """
+        _urls = [segment.url]
+        if not segment.muted:
+            _urls.append(segment.url.replace(".ts", "-muted.ts"))
+
+        return _urls
+
+    def _segment_temp_path(self, segment: MpegSegment) -> Path:
+        """Generate the temporary path a segment is downloaded to before being moved to the output directory.
+
+        :param segment: segment to generate path for
+        :return: path of temporary segment file
+        :rtype: Path
+        """
+        return Path(get_temp_dir(), str(self.vod.v_id), f"{segment.id}.ts")
+
+    def _get_ts_segment_adaptive(self, segment: MpegSegment) -> None:
+        """Retrieve a specific ts file once the adaptive concurrency controller has a free slot.
 
-            except KeyboardInterrupt as exc:
+        :param segment: MPEGTS segment to download
+        """
+        with self.concurrency:
+            self._get_ts_segment(segment)
+
+    def _record_existing_part(self, segment: MpegSegment, segment_path: Path) -> bool:
+        """Record a segment whose part is already in the 'parts' directory.
+
+        A part missing from the manifest was left by an interrupted run (e.g. moved into place just before the
+        archiver stopped), so it is checked for corruption before being kept. Invalid parts are deleted so the segment
+        is downloaded again.
+
+        :param segment: segment to record
+        :param segment_path: path of the segment's part
+        :return: True if the part was kept, False if it needs to be downloaded again
+        :rtype: bool
+        """
+        if segment.id not in self._manifest:
+            _data = segment_path.read_bytes()
+            _problem = find_ts_corruption(_data)
+            if _problem is not None:
                 self._log.debug(
-                    "M3U8 playlist downloader caught interrupt, shutting down workers..."
+                    "Discarding untracked part %s. %s", segment_path, _problem
                 )
-                _worker_pool.shutdown(wait=False, cancel_futures=True)
-                raise KeyboardInterrupt from exc
+                segment_path.unlink(missing_ok=True)
+                return False
 
-            finally:
-                _worker_pool.shutdown(wait=False, cancel_futures=True)
+            self._manifest.add(segment.id, len(_data), get_hash(segment_path))
+            self._log.debug("Recorded untracked part %s.", segment_path)
+
+        self._completed_segments.add(segment)
+        return True
 
     def _get_ts_segment(self, segment: MpegSegment):
         """Retrieves a specific ts file.
@@ -360,81 +962,333 @@ class Video(Downloader):
         self._log.debug("Downloading segment %s to %s", segment.url, _segment_path)
 
         # don't bother if piece already downloaded
-        if os.path.exists(_segment_path):
+        if os.path.exists(_segment_path) and self._record_existing_part(
+            segment, Path(_segment_path)
+        ):
             return
 
-        # files are downloaded to $TMP, then moved to final destination
+        # files are downloaded to $TMP, then handed to a separate pool of workers which move them to the final
+        # destination, so download workers never wait on writes to slow (e.g. NAS) storage
         # takes 3:32 to download an hour long VOD to NAS, compared to 5:00 without using $TMP as download cache
-        #   a better method would be to have 20 workers downloading, and 20 moving temp
-        #   files from storage avoiding any downtime downloading
 
-        # try original url, falling back to muted url for unmuted segments
-        _urls = [segment.url]
-        if not segment.muted:
-            _urls.append(segment.url.replace(".ts", "-muted.ts"))
+        _tmp_path = self._segment_temp_path(segment)
+        # hash of the segment, computed as it is written
+        _digest = ""
 
-        for _url in _urls:
+        # try original url, falling back to muted url for unmuted segments
+        for _url in self._segment_urls(segment):
             # create temporary file for downloading to
-            with open(
-                Path(
-                    get_temp_dir(),
-                    str(self.vod.v_id),
-                    f"{segment.id}.ts",
-                ),
-                "wb",
-            ) as _tmp_ts_file:
-                for _ in range(6):
-                    if _ > 4:
-                        break
-
+            with HashingWriter(_tmp_path, TsValidator()) as _tmp_ts_file:
+                for _ in range(SEGMENT_ATTEMPTS):
+                    # resume from the end of any data written by a previous attempt
+                    _offset = _tmp_ts_file.tell()
+                    _started = monotonic()
                     try:
-                        _r = self._s.get(_url, stream=True, timeout=10)
+                        _r = self._s.get(
+                            _url,
+                            stream=True,
+                            timeout=10,
+                            headers=self._range_header(_offset),
+                        )
 
-                        # break on non 200 status code
-                        if _r.status_code != 200:
+                        # retry on unexpected status code
+                        if not self._start_segment_write(_tmp_ts_file, _r.status_code):
                             self._log.error(
                                 "HTTP status %s received. %s", _r.status_code, _r.text
                             )
+                            self._record_attempt(_r.status_code, 0, _started)
                             continue
 
-                        # write downloaded chunks to temporary file
-                        for _chunk in _r.iter_content(chunk_size=262144):
-                            _tmp_ts_file.write(_chunk)
+                        _length = self._get_segment_length(_r.status_code, _r.headers)
+
+                        # write downloaded chunks to temporary file
+                        for _chunk in _r.iter_content(chunk_size=262144):
+                            _tmp_ts_file.write(_chunk)
+                            limit_bandwidth(len(_chunk), self.vod)
+
+                        # connection closed early, retry for the remaining bytes
+                        if _length is not None and _tmp_ts_file.tell() < _length:
+                            raise requests.exceptions.ConnectionError(
+                                f"Received {_tmp_ts_file.tell()} of {_length} bytes."
+                            )
+
+                        _problem = self._check_segment_integrity(
+                            _tmp_ts_file, segment, _
+                        )
+                        if _problem:
+                            raise CorruptSegmentError(_problem)
+
+                        self._record_attempt(
+                            200, _tmp_ts_file.tell() - _offset, _started
+                        )
+                        self._log.debug(
+                            "Segment %s download completed.", Path(_segment_path).stem
+                        )
+                        _digest = _tmp_ts_file.hexdigest()
+                        self._completed_segments.add(segment)
+
+                        break
+
+                    except (
+                        requests.exceptions.RequestException,
+                        CorruptSegmentError,
+                    ) as exc:
+                        # corrupt data isn't a sign of congestion, so only failed requests are reported
+                        if not isinstance(exc, CorruptSegmentError):
+                            self._record_attempt(0, 0, _started)
+                        self._log.debug(
+                            "Segment %s download failed (Attempt %s). Error: %s)",
+                            Path(_segment_path).stem,
+                            _ + 1,
+                            str(exc),
+                        )
+                        sleep(0.1 * (_ + 1))
+                        continue
+
+            if segment in self._completed_segments:
+                break
+
+        self._finalize_segment(segment, _tmp_path, _digest)
+
+    async def _get_ts_segment_async(
+        self, session: "aiohttp.ClientSession", segment: MpegSegment
+    ) -> None:
+        """Retrieve a specific ts file using the provided aiohttp session.
+
+        Retries, resuming, muted-url fallback and downloading to $TMP before moving match `_get_ts_segment`.
+
+        :param session: aiohttp.ClientSession (or compatible) used for requests
+        :param segment: MPEGTS segment to download
+        :type segment: MpegSegment
+        """
+        import aiohttp
+
+        _segment_path = segment.generate_path(Path(self.output_dir, "parts"))
+        self._log.debug("Downloading segment %s to %s", segment.url, _segment_path)
+
+        # don't bother if piece already downloaded
+        if os.path.exists(_segment_path) and await asyncio.to_thread(
+            self._record_existing_part, segment, Path(_segment_path)
+        ):
+            return
+
+        _tmp_path = self._segment_temp_path(segment)
+        _digest = ""
+
+        for _url in self._segment_urls(segment):
+            with HashingWriter(_tmp_path, TsValidator()) as _tmp_ts_file:
+                for _ in range(SEGMENT_ATTEMPTS):
+                    # resume from the end of any data written by a previous attempt
+                    _offset = _tmp_ts_file.tell()
+                    _started = monotonic()
+                    try:
+                        async with session.get(
+                            _url, headers=self._range_header(_offset)
+                        ) as _r:
+                            # retry on unexpected status code
+                            if not self._start_segment_write(_tmp_ts_file, _r.status):
+                                self._log.error(
+                                    "HTTP status %s received. %s",
+                                    _r.status,
+                                    await _r.text(),
+                                )
+                                self._record_attempt(_r.status, 0, _started)
+                                continue
+
+                            _length = self._get_segment_length(_r.status, _r.headers)
+
+                            # write downloaded chunks to temporary file
+                            async for _chunk in _r.content.iter_chunked(262144):
+                                _tmp_ts_file.write(_chunk)
+                                await limit_bandwidth_async(len(_chunk), self.vod)
+
+                        # connection closed early, retry for the remaining bytes
+                        if _length is not None and _tmp_ts_file.tell() < _length:
+                            raise aiohttp.ClientPayloadError(
+                                f"Received {_tmp_ts_file.tell()} of {_length} bytes."
+                            )
+
+                        _problem = self._check_segment_integrity(
+                            _tmp_ts_file, segment, _
+                        )
+                        if _problem:
+                            raise CorruptSegmentError(_problem)
+
+                        self._record_attempt(
+                            200, _tmp_ts_file.tell() - _offset, _started
+                        )
+                        self._log.debug(
+                            "Segment %s download completed.", Path(_segment_path).stem
+                        )
+                        _digest = _tmp_ts_file.hexdigest()
+                        self._completed_segments.add(segment)
+
+                        break
+
+                    except (
+                        aiohttp.ClientError,
+                        asyncio.TimeoutError,
+                        CorruptSegmentError,
+                    ) as exc:
+                        # corrupt data isn't a sign of congestion, so only failed requests are reported
+                        if not isinstance(exc, CorruptSegmentError):
+                            self._record_attempt(0, 0, _started)
+                        self._log.debug(
+                            "Segment %s download failed (Attempt %s). Error: %s)",
+                            Path(_segment_path).stem,
+                            _ + 1,
+                            str(exc),
+                        )
+                        await asyncio.sleep(0.1 * (_ + 1))
+                        continue
+
+            if segment in self._completed_segments:
+                break
+
+        # moving to destination storage blocks, so it is done off the event loop
+        await asyncio.to_thread(self._finalize_segment, segment, _tmp_path, _digest)
+
+    def _check_segment_integrity(
+        self, tmp_file: HashingWriter, segment: MpegSegment, attempt: int
+    ) -> str | None:
+        """Check a downloaded segment for corruption.
+
+        Corrupt segments are downloaded again straight away, rather than being found once the VOD is converted.
+        Corrupt data from the final attempt is kept as it is likely corrupt on Twitch's end, in which case it is
+        handled when converting the VOD.
+
+        :param tmp_file: open temporary file the segment was downloaded to
+        :param segment: segment which was downloaded
+        :param attempt: index of the download attempt
+        :return: description of the corruption if the segment should be downloaded again, otherwise None
+        :rtype: str or None
+        """
+        # data is validated as it is written, so the segment isn't read back
+        _problem = tmp_file.validator.result()
+        if _problem is None:
+            return None
+
+        if attempt == SEGMENT_ATTEMPTS - 1:
+            self._log.warning(
+                "Segment %s is still corrupt after %s attempts, keeping it. %s",
+                segment.id,
+                SEGMENT_ATTEMPTS,
+                _problem,
+            )
+            return None
+
+        # discard the corrupt data so the whole segment is downloaded again
+        tmp_file.seek(0)
+        tmp_file.truncate()
+        return f"Segment is corrupt. {_problem}"
+
+    @staticmethod
+    def _range_header(offset: int) -> dict:
+        """Generate the headers for a segment request.
+
+        Only the bytes after offset are requested if some of the segment has already been downloaded.
+
+        :param offset: number of bytes already downloaded
+        :return: request headers
+        :rtype: dict
+        """
+        if offset:
+            return {"Range": f"bytes={offset}-"}
+
+        return {}
+
+    @staticmethod
+    def _start_segment_write(tmp_file: HashingWriter, status: int) -> bool:
+        """Prepare the temporary file of a segment to be written to based on the status of the response.
+
+        :param tmp_file: open temporary file for the segment
+        :param status: HTTP status code of the response
+        :return: True if the response body should be written to the file
+        :rtype: bool
+        """
+        # server ignored the range request and sent the whole segment, so start again from the beginning
+        if status == 200:
+            tmp_file.seek(0)
+            tmp_file.truncate()
+            return True
+
+        # remaining bytes of a partially downloaded segment
+        if status == 206 and tmp_file.tell():
+            return True
+
+        # downloaded data no longer matches the segment, so fetch the whole segment on the next attempt
+        if status == 416:
+            tmp_file.seek(0)
+            tmp_file.truncate()
+
+        return False
 
-                        self._log.debug(
-                            "Segment %s download completed.", Path(_segment_path).stem
-                        )
-                        self._completed_segments.add(segment)
+    @staticmethod
+    def _get_segment_length(status: int, headers: Mapping) -> int | None:
+        """Fetch the full length of a segment from the headers of a response.
 
-                        break
+        :param status: HTTP status code of the response
+        :param headers: response headers
+        :return: length of the whole segment in bytes, or None if it isn't known
+        :rtype: int or None
+        """
+        try:
+            if status == 206:
+                return int(headers.get("Content-Range", "").rsplit("/", 1)[1])
 
-                    except requests.exceptions.RequestException as exc:
-                        self._log.debug(
-                            "Segment %s download failed (Attempt %s). Error: %s)",
-                            Path(_segment_path).stem,
-                            _ + 1,
-                            str(exc),
-                        )
-                        sleep(0.1 * (_ + 1))
-                        continue
+            return int(headers.get("Content-Length"))
 
-            if segment in self._completed_segments:
-                break
+        except (IndexError, TypeError, ValueError):
+            return None
 
+    def _finalize_segment(
+        self, segment: MpegSegment, tmp_path: Path, digest: str = ""
+    ) -> None:
+        """Hand a downloaded segment over to be moved to its destination, or handle the failure of its download.
+
+        :param segment: segment which was downloaded
+        :param tmp_path: temporary file the segment was downloaded to
+        :param digest: hash of the segment computed while it was downloaded
+        :raises VideoPartDownloadError: if a non-muted segment failed to download or could not be moved
+        """
         if segment not in self._completed_segments:
             if segment.muted:
                 self._log.warning(
                     "Failed to download muted segment %s. Skipping.", segment.id
                 )
                 self._muted_segments.add(segment)
+                self._skipped_segments.add(segment)
                 return
             raise VideoPartDownloadError(
                 f"Maximum retries for segment {segment.id} reached."
             )
 
+        # blocks while the move queue is full so downloads can't get too far ahead of slow storage
+        if self._mover:
+            self._mover.put(segment, tmp_path, digest)
+
+        else:
+            self._move_segment(segment, tmp_path, digest)
+
+    def _move_segment(
+        self, segment: MpegSegment, tmp_path: Path, digest: str = ""
+    ) -> None:
+        """Move a downloaded segment from $TMP to the output directory.
+
+        :param segment: segment which was downloaded
+        :param tmp_path: temporary file the segment was downloaded to
+        :param digest: hash of the segment, computed from the file if not given
+        :raises VideoPartDownloadError: if the segment could not be moved
+        """
+        _segment_path = segment.generate_path(Path(self.output_dir, "parts"))
+
         try:
+            _size = tmp_path.stat().st_size
+            _hash = digest or get_hash(tmp_path)
+
             # move part to destination storage
-            safe_move(_tmp_ts_file.name, _segment_path)
+            safe_move(tmp_path, _segment_path)
+            self._manifest.add(segment.id, _size, _hash)
             self._log.debug(
                 "Segment %s completed and moved to %s.",
                 Path(_segment_path).stem,
@@ -442,11 +1296,13 @@ class Video(Downloader):
             )
 
         except FileNotFoundError as exc:
+            self._completed_segments.discard(segment)
             raise VideoPartDownloadError(
                 f"MPEG-TS segment did not download correctly. Piece: {segment.url}"
             ) from exc
 
         except Exception as exc:
+            self._completed_segments.discard(segment)
             raise VideoPartDownloadError(
                 f"Exception encountered while moving downloaded MPEG-TS segment {segment.id}."
             ) from exc
@@ -465,8 +1321,33 @@ class Video(Downloader):
                 f"FFmpeg. Corrupt parts:\n{str(sorted(corruption))}"
             )
 
+        # segments merged before merged.ts was rewritten can't be moved back to the parts directory, so merged.ts is
+        # discarded and they are all downloaded again
+        _discarded: set[int] = set()
+        if self._merger is not None and self._merger.is_rewritten:
+            _discarded = self._merger.discard()
+            for _id in _discarded:
+                self._completed_segments.discard(_id)
+
+        # move any corrupt segments which were merged incrementally back to the parts directory
+        elif self._merger is not None:
+            for _id, _size, _hash in self._merger.restore(
+                min(_s.id for _s in corruption)
+            ):
+                self._manifest.add(_id, _size, _hash)
+
+        # hashes recorded when the corrupt segments were downloaded
+        _corrupt_hashes: dict[int, str] = {}
+
         # rename corrupt segments
         for segment in corruption:
+            # discarded segments have no part to compare the re-downloaded one to
+            if segment.id in _discarded:
+                continue
+
+            _entry = self._manifest.get(segment.id)
+            _corrupt_hashes[segment.id] = _entry["hash"] if _entry else ""
+
             # convert segment number to segment file
             segment_fp = str(f"{segment.id:05d}" + ".ts")
 
@@ -478,52 +1359,70 @@ class Video(Downloader):
 
             # remove from completed segments
             self._completed_segments.remove(segment)
+            self._manifest.remove(segment.id)
 
-        # download and combine vod again
+        # download and combine vod again, keeping re-downloaded parts so they can be compared to the corrupt ones
+        self._merge_paused = True
         try:
+            self._reset_playlist()
             self.refresh_playlist()
-            self.download_m3u8_playlist()
+            try:
+                self.download_m3u8_playlist()
+
+            finally:
+                self._shutdown_workers()
+                self._merge_paused = False
 
             # compare downloaded .ts to corrupt parts - corrupt parts SHOULD have different hashes,
             # so we can work out if a segment is corrupt on twitch's end or ours
             for segment in corruption:
-                segment_fp = str(f"{segment.id:05d}" + ".ts")
+                if segment.id in _discarded:
+                    continue
 
-                # compare hash of redownloaded segment and corrupt one
-                try:
-                    if get_hash(Path(self.output_dir, "parts", segment_fp)) == get_hash(
-                        Path(self.output_dir, "parts", segment_fp + ".corrupt")
-                    ):
-                        self._log.debug(
-                            "Re-downloaded .ts segment %s matches corrupt one, "
-                            "assuming corruption is on Twitch's end and ignoring.",
-                            segment.id,
-                        )
-                        segment.muted = True
-                        self._muted_segments.add(segment)
+                segment_fp = str(f"{segment.id:05d}" + ".ts")
 
-                    else:
-                        self._log.error(
-                            "Re-downloaded .ts segment %s does not match corrupt one.",
-                            segment.id,
-                        )
+                _segment_path = Path(self.output_dir, "parts", segment_fp)
+                _corrupt_path = Path(self.output_dir, "parts", segment_fp + ".corrupt")
+                _entry = self._manifest.get(segment.id)
 
                 # occasionally the last few pieces of a stream may not be archived to the VOD and so won't be
                 # re-downloaded. instead we just assume the corrupt segment is OK.
-                except FileNotFoundError:
+                if _entry is None or not _segment_path.exists():
                     self._log.debug(
                         "Segment %s could not be re-downloaded - it may no longer be available so the "
                         "potentially corrupt segment will be used.",
                         segment.id,
                     )
                     self._completed_segments.add(segment)
-                    shutil.move(
-                        Path(self.output_dir, "parts", segment_fp + ".corrupt"),
-                        Path(self.output_dir, "parts", segment_fp),
+                    shutil.move(_corrupt_path, _segment_path)
+                    self._manifest.add(
+                        segment.id,
+                        _segment_path.stat().st_size,
+                        _corrupt_hashes[segment.id] or get_hash(_segment_path),
+                    )
+                    segment.muted = True
+                    self._muted_segments.add(segment)
+
+                # compare hash of redownloaded segment and corrupt one, both recorded when they were downloaded
+                elif hashes_match(
+                    _entry["hash"] or get_hash(_segment_path),
+                    _corrupt_path,
+                    _corrupt_hashes[segment.id],
+                ):
+                    self._log.debug(
+                        "Re-downloaded .ts segment %s matches corrupt one, "
+                        "assuming corruption is on Twitch's end and ignoring.",
+                        segment.id,
                     )
                     segment.muted = True
                     self._muted_segments.add(segment)
 
+                else:
+                    self._log.error(
+                        "Re-downloaded .ts segment %s does not match corrupt one.",
+                        segment.id,
+                    )
+
         except CorruptPartError as exc:
             raise VideoDownloadError(
                 "Corrupt part(s) still present after retrying VOD download. Ensure VOD is still "
@@ -541,6 +1440,8 @@ class Video(Downloader):
             self._completed_segments,
             self._muted_segments,
             self._quiet,
+            incremental=self._merger,
+            pipe_parts=self.merge_mode == "pipe",
         )
 
         # attempt to merge
@@ -603,21 +1504,36 @@ class Merger:
         quiet,
         ignore_corrupt_parts=False,
         ignore_discontinuity=False,
+        incremental: "IncrementalMerger" = None,
+        pipe_parts: bool = False,
     ):
-        """
-        Class constructor.
+        """Class constructor.
+
+        :param incremental: incremental merger holding segments already appended to merged.ts, if any
+        :type incremental: IncrementalMerger
+        :param pipe_parts: whether parts are passed straight to ffmpeg when converting rather than being merged into
+            merged.ts first
+        :type pipe_parts: bool
         """
         self.vod = vod
         self._output_dir = output_dir
-        self._completed_segments = completed_segments
+        # segments are shared with the downloader so parts it repairs are picked up
+        self._completed_segments: SegmentSet = (
+            completed_segments
+            if isinstance(completed_segments, SegmentSet)
+            else SegmentSet(completed_segments)
+        )
+        self._incremental: IncrementalMerger = incremental
+        self._pipe_parts: bool = pipe_parts
         self._completed_parts = self.get_completed_parts()
-        self._muted_segment_ids = [s.id for s in muted_segments]
+        self._muted_segment_ids: SegmentSet = SegmentSet(muted_segments)
         self._ignore_corrupt_parts = ignore_corrupt_parts
         self._ignore_discontinuity = ignore_discontinuity
         self._quiet = quiet
+        self._progress = Progress()
 
     def set_muted_segments(self, segments):
-        self._muted_segment_ids = [s.id for s in segments]
+        self._muted_segment_ids = SegmentSet(segments)
 
     def merge(self):
         """
@@ -641,12 +1557,19 @@ class Merger:
         if len(self._completed_segments) == 0:
             return
 
-        # merge and remux mpegts segments to single mp4
-        self._log.info("Merging VOD parts. This may take a while.")
-        self._combine_vod_parts()
+        # parts may have been restored from merged.ts or re-downloaded since the merger was created
+        self._completed_parts = self.get_completed_parts()
+
+        # get dts offset of first available part, before merging may rewrite merged.ts
+        _dts_offset = self._get_dts_offset()
+
+        # merge and remux mpegts segments to single mp4, parts are read directly by ffmpeg when piping
+        if not self._pipe_parts:
+            self._log.info("Merging VOD parts. This may take a while.")
+            self._combine_vod_parts()
 
         self._log.info("Converting VOD to mp4. This may take a while.")
-        self._convert_vod()
+        self._convert_vod(_dts_offset)
 
     def _write_chapters(self):
         # retrieve vod chapters
@@ -670,26 +1593,32 @@ class Merger:
         """
         Combines the downloaded VOD .ts parts.
         """
-        _progress = Progress()
-
         # concat files if all pieces present, otherwise fall back to using ffmpeg
-        _final_part_id = max([_s.id for _s in self._completed_segments])
+        _dicontinuity = self._find_discontinuity()
+        # segments appended while downloading are already at the start of merged.ts
+        _merged_size = 0
+        _pt = 0
+        if self._incremental is not None:
+            _merged_size = self._incremental.size
+            _pt = len(self._incremental)
 
-        _dicontinuity = set([i for i in range(_final_part_id + 1)]).difference(
-            [_s.id for _s in self._completed_segments]
-        )
         if not _dicontinuity or self._ignore_discontinuity:
             # merge all .ts files by concatenating them
-            with open(str(Path(self._output_dir, "merged.ts")), "wb") as _merged_file:
-                _pt = 0
+            with open(
+                str(Path(self._output_dir, "merged.ts")),
+                "r+b" if _merged_size else "wb",
+            ) as _merged_file:
+                _merged_file.seek(_merged_size)
+                _merged_file.truncate()
                 for _part in sorted(self._completed_parts):
                     _pt += 1
                     # append part to merged file
-                    with open(Path(self._output_dir, "parts", _part), "rb") as _ts_part:
-                        shutil.copyfileobj(_ts_part, _merged_file)
+                    append_file(Path(self._output_dir, "parts", _part), _merged_file)
 
                     if not self._quiet:
-                        _progress.print_progress(_pt, len(self._completed_segments))
+                        self._progress.print_progress(
+                            _pt, len(self._completed_segments)
+                        )
 
         else:
             # merge all .ts files with ffmpeg concat demuxer as missing segments can cause corruption with
@@ -700,179 +1629,253 @@ class Merger:
                 _dicontinuity,
             )
 
+            # ffmpeg can't write to the file it is reading, so the incrementally merged file is written to a temporary
+            # file in 'parts', without a .ts suffix so it's never mistaken for a segment
+            _output = Path(self._output_dir, "merged.ts")
+            if _merged_size:
+                _output = Path(self._output_dir, "parts", "merged.ts.tmp")
+
             # create file with list of parts for ffmpeg
-            with open(
-                Path(self._output_dir, "parts", "segments.txt"), "w", encoding="utf8"
-            ) as _segment_file:
-                for _part in sorted(self._completed_parts):
-                    _segment_file.write(
-                        f"file '{Path(self._output_dir, 'parts', _part)}'\n"
-                    )
+            self._write_segment_list(bool(_merged_size))
+
+            _ffmpeg = FFmpeg(
+                [
+                    "-fflags",
+                    "+genpts",
+                    "-f",
+                    "concat",
+                    "-safe",
+                    "0",
+                    "-y",
+                    "-i",
+                    Path(self._output_dir, "parts", "segments.txt"),
+                    "-c",
+                    "copy",
+                    "-f",
+                    "mpegts",
+                    _output,
+                ]
+            )
+
+            # print progress bar from ffmpeg progress
+            if _ffmpeg.run(on_progress=None if self._quiet else self._print_progress):
+                self._log.error("VOD merger exited with error. Command: %s.", _ffmpeg)
+                raise VideoConvertError(
+                    f"VOD merger exited with error. Command: {_ffmpeg}."
+                )
+
+            if _merged_size:
+                os.replace(_output, Path(self._output_dir, "merged.ts"))
+                self._incremental.mark_rewritten()
+
+    def _find_discontinuity(self) -> list[int]:
+        """Find segments missing from the completed segments.
 
-            _command = (
-                f"ffmpeg -hide_banner -fflags +genpts -f concat -safe 0 -y -i "
-                f'"{str(Path(self._output_dir, "parts", "segments.txt"))}" '
-                f'-c copy "{str(Path(self._output_dir, "merged.ts"))}"'
+        :return: ids of missing segments
+        :rtype: list[int]
+        """
+        return self._completed_segments.missing()
+
+    def _write_segment_list(self, include_merged: bool = False) -> Path:
+        """Write the list of parts read by the ffmpeg concat demuxer.
+
+        :param include_merged: whether merged.ts is listed before the parts
+        :return: path to segment list
+        :rtype: Path
+        """
+        _path = Path(self._output_dir, "parts", "segments.txt")
+        with open(_path, "w", encoding="utf8") as _segment_file:
+            if include_merged:
+                _segment_file.write(f"file '{Path(self._output_dir, 'merged.ts')}'\n")
+
+            for _part in sorted(self._completed_parts):
+                _segment_file.write(
+                    f"file '{Path(self._output_dir, 'parts', _part)}'\n"
+                )
+
+        return _path
+
+    def _get_convert_input(self) -> tuple[list, list[str]]:
+        """Generate the ffmpeg input arguments used when converting the VOD.
+
+        :return: input arguments, and the parts to write to ffmpeg's stdin (if any)
+        :rtype: tuple[list, list[str]]
+        """
+        if not self._pipe_parts:
+            return ["-i", Path(self._output_dir, "merged.ts")], []
+
+        # missing segments can cause corruption when parts are simply concatenated, so use the concat demuxer
+        if self._find_discontinuity() and not self._ignore_discontinuity:
+            return (
+                [
+                    "-fflags",
+                    "+genpts",
+                    "-f",
+                    "concat",
+                    "-safe",
+                    "0",
+                    "-i",
+                    self._write_segment_list(),
+                ],
+                [],
             )
 
-            self._log.debug("FFmpeg Command: %s", _command)
+        return ["-f", "mpegts", "-i", "pipe:0"], sorted(self._completed_parts)
 
-            with subprocess.Popen(
-                sanitize_command(_command),
-                shell=True,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                encoding="cp437",
-            ) as _p:
-                # get progress from ffmpeg output and print progress bar
-                if not self._quiet:
-                    for _line in _p.stderr:
-                        if "time=" in _line.rstrip():
-                            # extract current timestamp from output
-                            _cur_time = (
-                                re.search("(?<=time=).*(?= bitrate=)", _line)
-                                .group(0)
-                                .split(":")
-                            )
-                            _cur_time = (
-                                int(_cur_time[0]) * 3600
-                                + int(_cur_time[1]) * 60
-                                + int(_cur_time[2][:2])
-                            )
+    def _feed_parts(
+        self, stdin: BinaryIO, parts: list[str], errors: list = None
+    ) -> None:
+        """Write parts to ffmpeg's stdin in order, closing it once all parts are written or writing fails.
 
-                            _progress.print_progress(int(_cur_time), self.vod.duration)
+        :param stdin: binary stdin of ffmpeg process
+        :param parts: part file names in the order they are written
+        :param errors: list which any exception raised while writing parts is added to, so it can be raised by the
+            thread running ffmpeg. Exceptions are raised if not given
+        :type errors: list[Exception]
+        """
+        try:
+            for _part in parts:
+                with open(Path(self._output_dir, "parts", _part), "rb") as _ts_part:
+                    shutil.copyfileobj(_ts_part, stdin)
 
-                if _p.returncode:
-                    self._log.error(
-                        "VOD merger exited with error. Command: %s.", _p.args
-                    )
-                    raise VideoConvertError(
-                        f"VOD merger exited with error. Command: {_p.args}."
-                    )
+        # ffmpeg exited early, the error is picked up from its return code
+        except BrokenPipeError:
+            pass
+
+        except Exception as exc:
+            if errors is None:
+                raise
+            errors.append(exc)
+
+        # ffmpeg waits for more input until stdin is closed
+        finally:
+            try:
+                stdin.close()
+
+            except BrokenPipeError:
+                pass
 
-    def _convert_vod(self):
-        """Converts the VOD from a .ts format to .mp4.
+    def _convert_vod(self, dts_offset: int = None) -> None:
+        """Convert the VOD from a .ts format to .mp4.
 
+        :param dts_offset: DTS offset of the stream, read from the first available part if not given
         :raises vodConvertError: error encountered during conversion process
         """
-        _progress = Progress()
         _corrupt_parts: set[MpegSegment] = set()
+        _cur_time = 0
 
         # get dts offset of first available part
-        _dts_offset = self._get_dts_offset()
+        _dts_offset = self._get_dts_offset() if dts_offset is None else dts_offset
 
         # create ffmpeg command
-        _ffmpeg_cmd = (
-            f'ffmpeg -hide_banner -y -i "{Path(self._output_dir, "merged.ts")}" '
-        )
+        _input, _feed = self._get_convert_input()
+        _args = ["-y", *_input]
         # insert metadata if present
         if Path(self._output_dir, "parts", "chapters.txt").exists():
-            _ffmpeg_cmd += f'-i "{Path(self._output_dir, "parts", "chapters.txt")}" -map_metadata 1 '
-
-        _ffmpeg_cmd += f'-c:a copy -c:v copy "{Path(self._output_dir, "vod.mp4")}"'
-
-        self._log.debug("FFmpeg Command: %s", _ffmpeg_cmd)
-
-        # convert merged .ts file to .mp4
-        with subprocess.Popen(
-            sanitize_command(_ffmpeg_cmd),
-            shell=True,
-            stderr=subprocess.PIPE,
-            universal_newlines=True,
-            encoding="cp437",
-        ) as _p:
-            # get progress from ffmpeg output and catch corrupt segments
-            _ffmpeg_log = ""
-            for line in _p.stderr:
-                _ffmpeg_log += line.rstrip()
-                _cur_time = 0
-
-                if "time=" in line:
-                    # extract current timestamp from output
-                    _cur_time = (
-                        re.search(r"(?<=time=).*(?= bitrate=)", line)
-                        .group(0)
-                        .split(":")
-                    )
-                    _cur_time = (
-                        int(_cur_time[0]) * 3600
-                        + int(_cur_time[1]) * 60
-                        + int(_cur_time[2][:2])
+            _args += [
+                "-i",
+                Path(self._output_dir, "parts", "chapters.txt"),
+                "-map_metadata",
+                "1",
+            ]
+
+        _args += ["-c:a", "copy", "-c:v", "copy", Path(self._output_dir, "vod.mp4")]
+        _ffmpeg = FFmpeg(_args)
+
+        def _on_progress(seconds: float) -> None:
+            nonlocal _cur_time
+            _cur_time = seconds
+            if not self._quiet:
+                self._print_progress(seconds)
+
+        # catch corrupt segments from ffmpeg output
+        def _on_output(line: str) -> None:
+            if "Packet corrupt" in line and not self._ignore_corrupt_parts:
+                try:
+                    _dts_timestamp = int(
+                        re.search(r"(?<=dts = ).*(?=\).)", line).group(0)
                     )
 
-                    if not self._quiet:
-                        _progress.print_progress(int(_cur_time), self.vod.duration)
-
-                elif "Packet corrupt" in line and not self._ignore_corrupt_parts:
-                    try:
-                        _dts_timestamp = int(
-                            re.search(r"(?<=dts = ).*(?=\).)", line).group(0)
-                        )
+                # Catch corrupt parts without timestamp, shows up as 'NOPTS'
+                except ValueError as exc:
+                    raise VideoConvertError(
+                        "Corrupt packet encountered at unknown timestamp while converting VOD. "
+                        "Delete 'parts' folder and re-download VOD."
+                    ) from exc
+
+                # The maximum value for the DTS timestamp is 2^33 - 1 (8589934591). This will get reached ~26 hours
+                # into a stream and cause corrupt part repair attempts to fail, so we need to use a different
+                # calculation for streams longer than this if corrupt parts are encountered.
+
+                # for Twitch, the final timestamp is part 09532, with the last packet timestamp being 8585279910
+                # this is then proceeded by the first timestamp in part 09533 of -4651712
+
+                # we must also add '2970' to the final packet timestamp to account for the time constant difference
+                # between each packet.
+
+                # check if we are past the expected seconds for the max value being reached, and our timestamp is
+                # under the final expected timestamp
+                if _cur_time > 95320 and _dts_timestamp < 8585279910:
+                    _corrupt_part = MpegSegment(
+                        floor(
+                            (
+                                _dts_timestamp
+                                + (8585279910 + 2970 + 4651712 - _dts_offset)
+                            )
+                            / 90000
+                            / 10
+                        ),
+                        10,
+                    )
 
-                    # Catch corrupt parts without timestamp, shows up as 'NOPTS'
-                    except ValueError as exc:
-                        raise VideoConvertError(
-                            "Corrupt packet encountered at unknown timestamp while converting VOD. "
-                            "Delete 'parts' folder and re-download VOD."
-                        ) from exc
-
-                    # The maximum value for the DTS timestamp is 2^33 - 1 (8589934591). This will get reached ~26 hours
-                    # into a stream and cause corrupt part repair attempts to fail, so we need to use a different
-                    # calculation for streams longer than this if corrupt parts are encountered.
-
-                    # for Twitch, the final timestamp is part 09532, with the last packet timestamp being 8585279910
-                    # this is then proceeded by the first timestamp in part 09533 of -4651712
-
-                    # we must also add '2970' to the final packet timestamp to account for the time constant difference
-                    # between each packet.
-
-                    # check if we are past the expected seconds for the max value being reached, and our timestamp is
-                    # under the final expected timestamp
-                    if _cur_time > 95320 and _dts_timestamp < 8585279910:
-                        _corrupt_part = MpegSegment(
-                            floor(
-                                (
-                                    _dts_timestamp
-                                    + (8585279910 + 2970 + 4651712 - _dts_offset)
-                                )
-                                / 90000
-                                / 10
-                            ),
-                            10,
-                        )
+                else:
+                    _corrupt_part = MpegSegment(
+                        floor((_dts_timestamp - _dts_offset) / 90000 / 10), 10
+                    )
 
-                    else:
-                        _corrupt_part = MpegSegment(
-                            floor((_dts_timestamp - _dts_offset) / 90000 / 10), 10
-                        )
+                # ignore if corrupt packet within ignore_corruptions range
+                if _corrupt_part.id in self._muted_segment_ids:
+                    _corrupt_part.muted = True
+                    self._log.debug(
+                        "Ignoring corrupt packet as part in whitelist. Part: %s",
+                        _corrupt_part,
+                    )
 
-                    # ignore if corrupt packet within ignore_corruptions range
-                    if _corrupt_part.id in self._muted_segment_ids:
-                        _corrupt_part.muted = True
-                        self._log.debug(
-                            "Ignoring corrupt packet as part in whitelist. Part: %s",
-                            _corrupt_part,
-                        )
+                else:
+                    _corrupt_parts.add(_corrupt_part)
+                    self._log.error(
+                        "Corrupt packet encountered. Part: %s", _corrupt_part
+                    )
 
-                    else:
-                        _corrupt_parts.add(_corrupt_part)
-                        self._log.error(
-                            "Corrupt packet encountered. Part: %s", _corrupt_part
-                        )
+            # very rare error with VOD 40790690 which is missing video parts resulting in errors and
+            # no output video.
+            elif "non-existing PPS 0 referenced" in line:
+                raise VideoFormatUnsupported
+
+        # convert merged .ts file to .mp4, parts are written from a separate thread when piping
+        _feed_errors: list[Exception] = []
+        _returncode = _ffmpeg.run(
+            on_progress=_on_progress,
+            on_output=_on_output,
+            feed_stdin=(
+                partial(self._feed_parts, parts=_feed, errors=_feed_errors)
+                if _feed
+                else None
+            ),
+        )
 
-                # very rare error with VOD 40790690 which is missing video parts resulting in errors and
-                # no output video.
-                elif "non-existing PPS 0 referenced" in line:
-                    raise VideoFormatUnsupported
+        # ffmpeg only sees its input end early if a part couldn't be written
+        if _feed_errors:
+            raise _feed_errors[0]
 
-        if _p.returncode:
+        if _returncode:
             self._log.error(
                 "FFmpeg exited with error code, output dumped to VOD directory."
             )
             with open(
                 Path(self._output_dir, "parts", "ffmpeg.log"), "w", encoding="utf8"
             ) as _ffout:
-                _ffout.write(_ffmpeg_log)
+                _ffout.write("\n".join(_ffmpeg.log))
 
             raise VideoConvertError(
                 "VOD converter exited with error. Delete 'parts' directory and re-download VOD."
@@ -882,43 +1885,74 @@ class Merger:
             # raise error so we can try to recover
             raise CorruptPartError(_corrupt_parts)
 
+    def _print_progress(self, seconds: float) -> None:
+        """Print the progress of an FFmpeg conversion of the VOD.
+
+        :param seconds: seconds of the VOD processed
+        """
+        self._progress.print_progress(int(seconds), self.vod.duration)
+
     def _get_dts_offset(self):
         """
         Finds the DTS offset for a given stream based on the lowest available part.
         """
 
         # fetch parts from dir
-        _parts = self.get_completed_parts()
+        _parts = sorted(self.get_completed_parts())
+
+        # the first part may already have been appended to merged.ts, in which case it starts with that part
+        _part_path = None
+        if self._incremental is not None and self._incremental.first_id is not None:
+            _part_id = self._incremental.first_id
+            _part_path = Path(self._output_dir, "merged.ts")
 
-        if _parts:
+        elif _parts:
             # fetch id of first part
             _part_id = int(_parts[0].replace(".ts", ""))
+            _part_path = Path(self._output_dir, "parts", _parts[0])
 
-            _command = (
-                f"ffprobe -v quiet -print_format json -show_format -show_streams "
-                f'"{Path(self._output_dir, "parts", _parts[0])}"'
-            )
+        if _part_path:
+            # read the start time directly from the first PES headers, only falling back to ffprobe if none are found
+            with open(_part_path, "rb") as _ts_file:
+                _start_pts = find_start_pts(_ts_file.read(START_PTS_READ_SIZE))
+
+            if _start_pts is None:
+                self._log.debug(
+                    "No PTS found at start of %s, probing with ffprobe.", _part_path
+                )
+                _start_pts = self._probe_start_time(_part_path) * 90000
 
-            with subprocess.Popen(
-                sanitize_command(_command),
-                shell=True,
-                stdout=subprocess.PIPE,
-                universal_newlines=True,
-                encoding="cp437",
-            ) as _p:
-                _ts_file_data = ""
-                for _line in _p.stdout:
-                    _ts_file_data += _line.rstrip()
-
-                # retrieve dts start_time of part, subtracting the offset of the part itself and multiplying the value
-                # by 90000 (default timescale)
-                return (
-                    float(json.loads(_ts_file_data)["format"]["start_time"])
-                    - (_part_id * 10)
-                ) * 90000
+            # subtract the offset of the part itself (default timescale of 90000)
+            return _start_pts - (_part_id * 10 * 90000)
 
         raise FileNotFoundError("No parts available to fetch DTS offset of stream.")
 
+    @staticmethod
+    def _probe_start_time(part_path: Path) -> float:
+        """Fetch the start time of a part with ffprobe.
+
+        :param part_path: path to part
+        :return: start time in seconds
+        :rtype: float
+        """
+        _p = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "quiet",
+                "-print_format",
+                "json",
+                "-show_format",
+                "-show_streams",
+                str(part_path),
+            ],
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+        )
+
+        return float(json.loads(_p.stdout)["format"]["start_time"])
+
     def verify_length(self):
         """Verifies the length of the downloaded VOD.
 
@@ -937,17 +1971,54 @@ class Merger:
         if self.vod.duration == 0:
             return True
 
-        _command = (
-            f'ffprobe -v quiet -i "{Path(self._output_dir, "vod.mp4")}" '
-            f"-show_entries format=duration -of default=noprint_wrappers=1:nokey=1"
+        # read duration from the mp4 header, only falling back to ffprobe if it can't be read
+        _duration = None
+        try:
+            _duration = read_mp4_duration(Path(self._output_dir, "vod.mp4"))
+
+        except OSError as exc:
+            self._log.debug("Failed to read VOD duration from mp4 header. %s", exc)
+
+        if _duration is None:
+            _duration = self._probe_vod_length()
+
+        downloaded_length = int(_duration)
+
+        self._log.debug(
+            "Downloaded VOD length is %s. Expected length is %s.",
+            downloaded_length,
+            self.vod.duration,
         )
 
+        # pass verification if downloaded file is within 2s of expected length
+        if 2 >= downloaded_length - self.vod.duration >= -2:
+            return True
+
+        return False
+
+    def _probe_vod_length(self) -> float:
+        """Fetch the length of the downloaded VOD with ffprobe.
+
+        :return: length of VOD in seconds
+        :rtype: float
+        :raises VodVerificationError: if error occurs when fetching length
+        """
         # retrieve vod file duration
         _p = subprocess.run(
-            sanitize_command(_command),
-            shell=True,
+            [
+                "ffprobe",
+                "-v",
+                "quiet",
+                "-i",
+                str(Path(self._output_dir, "vod.mp4")),
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+            ],
             capture_output=True,
-            encoding="cp437",
+            encoding="utf-8",
+            errors="replace",
         )
 
         if _p.returncode:
@@ -956,25 +2027,13 @@ class Merger:
             )
 
         try:
-            downloaded_length = int(float(_p.stdout.rstrip()))
+            return float(_p.stdout.rstrip())
 
         except Exception as exc:
             raise VideoVerificationError(
                 "Failed to fetch downloaded VOD length. See log for details."
             ) from exc
 
-        self._log.debug(
-            "Downloaded VOD length is %s. Expected length is %s.",
-            downloaded_length,
-            self.vod.duration,
-        )
-
-        # pass verification if downloaded file is within 2s of expected length
-        if 2 >= downloaded_length - self.vod.duration >= -2:
-            return True
-
-        return False
-
     def _write_thumbnail(self):
         """
         Downloads and stores the thumbnail for the VOD.
@@ -996,7 +2055,11 @@ class Merger:
 
         :return: list of segments padded to 5 digits with .ts extension
         """
-        return [f"{seg.id:05d}.ts" for seg in self._completed_segments]
+        return [
+            f"{_id:05d}.ts"
+            for _id in self._completed_segments
+            if not (self._incremental is not None and _id in self._incremental)
+        ]
 
     def cleanup_temp_files(self):
         """
@@ -1008,3 +2071,330 @@ class Merger:
 
         except FileNotFoundError:
             return
+
+
+class IncrementalMerger:
+    """Appends completed segments to a VOD's merged.ts while it is downloading.
+
+    Each part is deleted once appended so only the remaining parts need to be merged once the download finishes.
+    The offset and size of each appended segment are recorded in a journal in the 'parts' directory, allowing an
+    interrupted merge to be resumed and appended segments to be moved back to the 'parts' directory if they need to
+    be repaired.
+    """
+
+    _log = logging.getLogger()
+
+    def __init__(self, output_dir: Path) -> None:
+        """Class constructor.
+
+        :param output_dir: output directory of the VOD
+        """
+        self.path: Path = Path(output_dir, "merged.ts")
+        self._parts_dir: Path = Path(output_dir, "parts")
+        self._journal_path: Path = Path(self._parts_dir, MERGE_JOURNAL_NAME)
+
+        # offset and size of each appended segment, in the order they were appended
+        self._segments: dict[int, tuple[int, int]] = {}
+        # hash of each appended segment recorded when it was downloaded, kept for segments which are restored
+        self._hashes: dict[int, str] = {}
+        # segments appended before merged.ts was rewritten, which are in merged.ts at an unknown offset
+        self._rewritten: set[int] = set()
+        self.size: int = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """Copy the state to be pickled, leaving out the lock which can't be passed to a separate process."""
+        _state = self.__dict__.copy()
+        del _state["_lock"]
+        return _state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore pickled state, creating a new lock."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __contains__(self, segment_id: int) -> bool:
+        """Check whether a segment has been appended to merged.ts, or was before it was rewritten."""
+        return segment_id in self._segments or segment_id in self._rewritten
+
+    def __len__(self) -> int:
+        """Count the segments appended to merged.ts."""
+        return len(self._segments)
+
+    @property
+    def is_rewritten(self) -> bool:
+        """Checks whether merged.ts has been rewritten, after which appended segments can no longer be restored.
+
+        :return: True if merged.ts has been rewritten
+        :rtype: bool
+        """
+        return bool(self._rewritten)
+
+    @property
+    def first_id(self) -> int | None:
+        """Fetches the id of the first segment in merged.ts.
+
+        :return: segment id, or None if no segments have been appended
+        :rtype: int or None
+        """
+        return next(iter(self._segments), None)
+
+    def load(self) -> set[int]:
+        """Read the journal of a previous download.
+
+        Any data written to merged.ts after the last recorded segment is discarded.
+
+        :return: ids of segments already appended
+        :rtype: set[int]
+        """
+        with self._lock:
+            self._segments = {}
+            self._hashes = {}
+            self.size = 0
+
+            try:
+                with open(self._journal_path, encoding="utf8") as _f:
+                    for _line in _f:
+                        # a partially written final line belongs to an append which didn't finish
+                        if not _line.endswith("\n"):
+                            break
+
+                        _entry = json.loads(_line)
+                        self._segments[_entry["id"]] = (
+                            _entry["offset"],
+                            _entry["size"],
+                        )
+                        self._hashes[_entry["id"]] = _entry.get("hash", "")
+                        self.size = _entry["offset"] + _entry["size"]
+
+            except FileNotFoundError:
+                return set()
+
+            except (ValueError, KeyError) as exc:
+                self._log.error(
+                    "Failed to read merge journal %s, discarding merged VOD. Error: %s",
+                    self._journal_path,
+                    exc,
+                )
+                self.reset()
+                return set()
+
+            try:
+                _merged_size = self.path.stat().st_size
+
+            except FileNotFoundError:
+                _merged_size = 0
+
+            if _merged_size < self.size:
+                self._log.error(
+                    "Merged VOD %s is shorter than recorded in merge journal, discarding it.",
+                    self.path,
+                )
+                self.reset()
+                return set()
+
+            if _merged_size > self.size:
+                os.truncate(self.path, self.size)
+
+            return set(self._segments)
+
+    def append(self, segment_id: int, digest: str = "") -> None:
+        """Append a segment to merged.ts and delete its part.
+
+        :param segment_id: id of segment, which must follow the last appended segment
+        :param digest: hash of segment
+        """
+        _part_path = Path(self._parts_dir, f"{segment_id:05d}.ts")
+        with self._lock:
+            with open(self.path, "r+b" if self.size else "wb") as _merged_file:
+                # discard anything left by a failed append
+                _merged_file.seek(self.size)
+                _merged_file.truncate()
+                _size = append_file(_part_path, _merged_file)
+
+            with open(self._journal_path, "a", encoding="utf8") as _f:
+                _f.write(
+                    json.dumps(
+                        {
+                            "id": segment_id,
+                            "offset": self.size,
+                            "size": _size,
+                            "hash": digest,
+                        }
+                    )
+                    + "\n"
+                )
+
+            self._segments[segment_id] = (self.size, _size)
+            self._hashes[segment_id] = digest
+            self.size += _size
+
+        _part_path.unlink()
+
+    def restore(self, segment_id: int) -> list[tuple[int, int, str]]:
+        """Move a segment and every segment appended after it out of merged.ts and back into the 'parts' directory.
+
+        :param segment_id: id of first segment to restore
+        :return: list of restored segment ids, sizes and hashes
+        :rtype: list[tuple[int, int, str]]
+        """
+        with self._lock:
+            _restored = [
+                (_id, _size, self._hashes.get(_id, ""))
+                for _id, (_offset, _size) in self._segments.items()
+                if _id >= segment_id
+            ]
+            if not _restored:
+                return []
+
+            _truncate_at = self._segments[_restored[0][0]][0]
+            with open(self.path, "r+b") as _merged_file:
+                for _id, _size, _ in _restored:
+                    _merged_file.seek(self._segments[_id][0])
+                    with open(Path(self._parts_dir, f"{_id:05d}.ts"), "wb") as _part:
+                        _part.write(_merged_file.read(_size))
+
+                _merged_file.truncate(_truncate_at)
+
+            for _id, _, _ in _restored:
+                del self._segments[_id]
+                self._hashes.pop(_id, None)
+            self.size = _truncate_at
+
+            # write to a temporary file first so a partially written journal is never read
+            _tmp_path = Path(self._parts_dir, MERGE_JOURNAL_NAME + ".tmp")
+            with open(_tmp_path, "w", encoding="utf8") as _f:
+                for _id, (_offset, _size) in self._segments.items():
+                    _f.write(
+                        json.dumps(
+                            {
+                                "id": _id,
+                                "offset": _offset,
+                                "size": _size,
+                                "hash": self._hashes.get(_id, ""),
+                            }
+                        )
+                        + "\n"
+                    )
+            os.replace(_tmp_path, self._journal_path)
+
+            return _restored
+
+    def mark_rewritten(self) -> None:
+        """Record that merged.ts has been rewritten along with the remaining parts.
+
+        Appended segments are still in merged.ts, but their offsets are forgotten so they can't be restored.
+        """
+        with self._lock:
+            self._rewritten.update(self._segments)
+            self.reset()
+
+    def discard(self) -> set[int]:
+        """Delete merged.ts and forget all appended segments, such as when they need to be downloaded again.
+
+        :return: ids of segments which were in merged.ts
+        :rtype: set[int]
+        """
+        with self._lock:
+            _discarded = set(self._segments) | self._rewritten
+            self._rewritten = set()
+            self.reset()
+            self.path.unlink(missing_ok=True)
+
+        return _discarded
+
+    def reset(self) -> None:
+        """Forget the offsets of all appended segments and removes the journal."""
+        self._segments = {}
+        self._hashes = {}
+        self.size = 0
+        try:
+            self._journal_path.unlink()
+
+        except FileNotFoundError:
+            pass
+
+
+class SegmentMover:
+    """Pool of worker threads which move downloaded segments from $TMP to the output directory.
+
+    Download workers hand over finished segments through a bounded queue and continue with their next download.
+    """
+
+    _log = logging.getLogger()
+
+    def __init__(
+        self, move_func: Callable, workers: int = MOVE_THREADS, max_queued: int = 20
+    ) -> None:
+        """Class constructor.
+
+        :param move_func: function called with (segment, temporary path, hash) to move a segment
+        :param workers: number of move workers
+        :param max_queued: maximum number of downloaded segments waiting to be moved
+        """
+        self._move_func = move_func
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queued))
+        self._workers = [
+            threading.Thread(target=self._run, daemon=True)
+            for _ in range(max(1, workers))
+        ]
+        self._errors: list[Exception] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the move workers."""
+        for _w in self._workers:
+            _w.start()
+
+    def put(self, segment: MpegSegment, tmp_path: Path, digest: str = "") -> None:
+        """Queue a downloaded segment to be moved, blocking while the queue is full.
+
+        :param segment: downloaded segment
+        :param tmp_path: temporary file the segment was downloaded to
+        :param digest: hash of the segment
+        """
+        self._queue.put((segment, tmp_path, digest))
+
+    def join(self) -> list[Exception]:
+        """Wait for all queued segments to be moved, leaving the workers running.
+
+        :return: list of exceptions raised while moving segments since the last call
+        :rtype: list[Exception]
+        """
+        self._queue.join()
+
+        with self._lock:
+            _errors, self._errors = self._errors, []
+
+        return _errors
+
+    def stop(self) -> list[Exception]:
+        """Wait for all queued segments to be moved before stopping the workers.
+
+        :return: list of exceptions raised while moving segments
+        :rtype: list[Exception]
+        """
+        for _ in self._workers:
+            self._queue.put(None)
+
+        for _w in self._workers:
+            _w.join()
+
+        return self._errors
+
+    def _run(self) -> None:
+        while True:
+            _item = self._queue.get()
+            if _item is None:
+                break
+
+            try:
+                self._move_func(*_item)
+
+            except Exception as exc:
+                self._log.debug("Error moving segment %s: %s", _item[0].id, exc)
+                with self._lock:
+                    self._errors.append(exc)
+
+            finally:
+                self._queue.task_done()
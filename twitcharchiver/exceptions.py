@@ -125,6 +125,10 @@ class VideoPartDownloadError(VideoDownloadError):
     """Error occurred while downloading VOD part."""
 
 
+class CorruptSegmentError(VideoPartDownloadError):
+    """Downloaded VOD segment is corrupt."""
+
+
 class VideoFormatUnsupported(VideoDownloadError):
     """VOD format is not currently supported."""
 
@@ -0,0 +1,133 @@
+"""Module for running FFmpeg and reporting its progress."""
+
+import io
+import logging
+import subprocess
+import threading
+from collections import deque
+from collections.abc import Callable
+from typing import BinaryIO
+
+# default number of FFmpeg processes which may run at once
+MAX_PROCESSES = 2
+
+# number of recent lines of FFmpeg output kept for logging errors
+LOG_LINES = 200
+
+
+class FFmpeg:
+    """Runs FFmpeg with an argument list (without a shell).
+
+    Progress is reported from its '-progress' output and a bounded buffer of recent log lines is kept. The number
+    of FFmpeg processes running at once across all threads is capped, with additional conversions waiting for a
+    running one to finish.
+    """
+
+    _log = logging.getLogger()
+    _slots = threading.BoundedSemaphore(MAX_PROCESSES)
+
+    def __init__(self, args: list, log_lines: int = LOG_LINES) -> None:
+        """Class constructor.
+
+        :param args: arguments passed to FFmpeg, excluding the executable and progress options
+        :param log_lines: number of recent lines of FFmpeg output to keep
+        """
+        self.args: list[str] = [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-progress",
+            "pipe:1",
+            *[str(_a) for _a in args],
+        ]
+        self.log: deque[str] = deque(maxlen=log_lines)
+        self.returncode: int = None
+
+    def __str__(self) -> str:
+        """Format the FFmpeg command as it would be typed in a shell."""
+        return subprocess.list2cmdline(self.args)
+
+    @classmethod
+    def set_max_processes(cls, count: int) -> None:
+        """Set the number of FFmpeg processes which may run at once. Should be called before any are started.
+
+        :param count: maximum number of processes
+        """
+        cls._slots = threading.BoundedSemaphore(max(1, count))
+
+    def run(
+        self,
+        on_progress: Callable[[float], None] = None,
+        on_output: Callable[[str], None] = None,
+        feed_stdin: Callable[[BinaryIO], None] = None,
+    ) -> int:
+        """Run FFmpeg, waiting for a free slot if the maximum number of processes are already running.
+
+        :param on_progress: called with the number of seconds of output written each time FFmpeg reports progress
+        :type on_progress: Callable[[float], None]
+        :param on_output: called with each line FFmpeg logs, any exception raised stops FFmpeg and is re-raised
+        :type on_output: Callable[[str], None]
+        :param feed_stdin: called from a separate thread with FFmpeg's binary stdin, which it should write the input
+            to and close
+        :type feed_stdin: Callable[[typing.BinaryIO], None]
+        :return: FFmpeg return code
+        :rtype: int
+        """
+        self._log.debug("FFmpeg Command: %s", self)
+
+        with self._slots:
+            with subprocess.Popen(
+                self.args,
+                stdin=subprocess.PIPE if feed_stdin else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            ) as _p:
+                if feed_stdin:
+                    threading.Thread(
+                        target=feed_stdin, args=(_p.stdin,), daemon=True
+                    ).start()
+
+                # progress is written to stdout, which is read separately so neither pipe can fill up
+                _progress_reader = threading.Thread(
+                    target=self._read_progress,
+                    args=(_p.stdout, on_progress),
+                    daemon=True,
+                )
+                _progress_reader.start()
+
+                try:
+                    for _line in io.TextIOWrapper(
+                        _p.stderr, encoding="utf-8", errors="replace"
+                    ):
+                        _line = _line.rstrip()
+                        self.log.append(_line)
+                        if on_output:
+                            on_output(_line)
+
+                except BaseException:
+                    _p.kill()
+                    raise
+
+                finally:
+                    _progress_reader.join()
+
+            self.returncode = _p.returncode
+            return self.returncode
+
+    @staticmethod
+    def _read_progress(stdout: BinaryIO, on_progress: Callable[[float], None]) -> None:
+        """Read the key=value blocks FFmpeg writes with '-progress', reporting the output time at the end of each.
+
+        :param stdout: FFmpeg's stdout
+        :param on_progress: progress callback, or None
+        """
+        _seconds = 0.0
+        for _line in io.TextIOWrapper(stdout, encoding="utf-8", errors="replace"):
+            _key, _, _value = _line.strip().partition("=")
+
+            # 'out_time_ms' is also in microseconds, but is missing from older versions
+            if _key in ("out_time_us", "out_time_ms") and _value.isdigit():
+                _seconds = int(_value) / 1000000
+
+            elif _key == "progress" and on_progress:
+                on_progress(_seconds)
@@ -11,6 +11,8 @@ import sys
 import traceback
 from pathlib import Path
 
+from twitcharchiver.ratelimit import BandwidthLimiter
+
 CONSOLE_FORMATTER = logging.Formatter(
     "%(asctime)s [%(levelname)8s] %(message)s", "%Y-%m-%d %H:%M:%S"
 )
@@ -179,6 +181,10 @@ class ProcessWithLogging(multiprocessing.Process):
             log_process = ProcessLogger.get_global_logger()
         self.log_process_queue = log_process.queue
 
+        # bandwidth limiter isn't shared with `spawn`, so it is passed to the new process
+        self.bandwidth_limiter = BandwidthLimiter.get_global_limiter()
+
     def run(self):
         configure_new_process(self.log_process_queue)
+        BandwidthLimiter.set_global_limiter(self.bandwidth_limiter)
         self.target(*self.args, **self.kwargs)
@@ -0,0 +1,262 @@
+"""Module for tracking which segments of a VOD have been downloaded."""
+
+import json
+import logging
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # file locks are only used where supported (i.e. not on Windows)
+    fcntl = None
+
+# name of the manifest stored alongside downloaded segments in a VOD's 'parts' directory
+MANIFEST_NAME = "manifest.jsonl"
+# lock file held while the manifest is written, shared with archivers in other processes
+LOCK_NAME = "manifest.lock"
+
+
+class SegmentManifest:
+    """Append-only record of the segments downloaded to a VOD's 'parts' directory along with their size and hash.
+
+    Completed and removed segments are appended as JSON lines, so changes can be read back in order of the number of new
+    entries rather than listing the directory. The video and stream archivers append to the same manifest when archiving
+    a VOD in parallel, so writes are made while holding a lock on a separate lock file.
+    """
+
+    _log = logging.getLogger()
+
+    def __init__(self, parts_dir: Path) -> None:
+        """Class constructor.
+
+        :param parts_dir: directory containing downloaded segments
+        """
+        self.parts_dir: Path = Path(parts_dir)
+        self.path: Path = Path(self.parts_dir, MANIFEST_NAME)
+        self.lock_path: Path = Path(self.parts_dir, LOCK_NAME)
+
+        self._entries: dict[int, dict] = {}
+        # number of bytes of the manifest which have been read
+        self._offset: int = 0
+        # inode of the manifest which has been read, which changes if another archiver rebuilds it
+        self._inode: int | None = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """Copy the state to be pickled, leaving out the lock which can't be passed to a separate process."""
+        _state = self.__dict__.copy()
+        del _state["_lock"]
+        return _state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore pickled state, creating a new lock."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __contains__(self, segment_id: int) -> bool:
+        """Check whether a segment is recorded in the manifest."""
+        return segment_id in self._entries
+
+    def __len__(self) -> int:
+        """Count the segments recorded in the manifest."""
+        return len(self._entries)
+
+    def get(self, segment_id: int) -> dict | None:
+        """Fetch the recorded size and hash of a segment.
+
+        :param segment_id: id of segment
+        :return: dict containing 'size' and 'hash' of the segment, or None if it isn't recorded
+        :rtype: dict or None
+        """
+        return self._entries.get(segment_id)
+
+    def load(self) -> set[int]:
+        """Read the whole manifest, rebuilding it from the 'parts' directory if it is missing or inconsistent.
+
+        :return: ids of completed segments
+        :rtype: set[int]
+        """
+        with self._locked():
+            self._entries = {}
+            self._offset = 0
+
+            try:
+                self._read_new_entries()
+                if self._is_consistent():
+                    return set(self._entries)
+
+                self._log.debug(
+                    "Segment manifest %s doesn't match downloaded segments, rebuilding.",
+                    self.path,
+                )
+
+            except FileNotFoundError:
+                pass
+
+            except (ValueError, KeyError) as exc:
+                self._log.debug(
+                    "Failed to read segment manifest %s, rebuilding. Error: %s",
+                    self.path,
+                    exc,
+                )
+
+            self._rebuild()
+            return set(self._entries)
+
+    def refresh(self) -> set[int]:
+        """Read entries appended since the manifest was last read, such as those written by another archiver.
+
+        :return: ids of segments completed since the last read
+        :rtype: set[int]
+        """
+        with self._locked():
+            try:
+                return self._read_new_entries()
+
+            except FileNotFoundError:
+                return set()
+
+            except (ValueError, KeyError) as exc:
+                self._log.debug(
+                    "Failed to read segment manifest %s, rebuilding. Error: %s",
+                    self.path,
+                    exc,
+                )
+                self._rebuild()
+                return set(self._entries)
+
+    def add(self, segment_id: int, size: int, digest: str = "") -> None:
+        """Record a completed segment.
+
+        :param segment_id: id of segment
+        :param size: size of segment in bytes
+        :param digest: hash of segment, if known
+        """
+        self._append({"id": segment_id, "size": size, "hash": digest})
+
+    def remove(self, segment_id: int) -> None:
+        """Record that a segment has been removed from the 'parts' directory.
+
+        :param segment_id: id of segment
+        """
+        self._append({"id": segment_id, "removed": True})
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the manifest lock, so it isn't rebuilt while this or another archiver is writing to it.
+
+        Other processes are only excluded where file locks are supported.
+        """
+        with self._lock:
+            if fcntl is None or not self.parts_dir.exists():
+                yield
+                return
+
+            with open(self.lock_path, "a", encoding="utf8") as _f:
+                fcntl.flock(_f, fcntl.LOCK_EX)
+                try:
+                    yield
+
+                finally:
+                    fcntl.flock(_f, fcntl.LOCK_UN)
+
+    def _append(self, entry: dict) -> None:
+        _line = json.dumps(entry) + "\n"
+        with self._locked():
+            # each entry is written as a single line in append mode, so entries from other processes aren't interleaved
+            with open(self.path, "a", encoding="utf8") as _f:
+                _f.write(_line)
+
+            self._apply(entry)
+
+    def _apply(self, entry: dict) -> None:
+        if entry.get("removed"):
+            self._entries.pop(entry["id"], None)
+
+        else:
+            self._entries[entry["id"]] = {"size": entry["size"], "hash": entry["hash"]}
+
+    def _read_new_entries(self) -> set[int]:
+        """Read complete lines appended to the manifest since the last read.
+
+        :return: ids of segments added by the new entries
+        :rtype: set[int]
+        """
+        with open(self.path, "rb") as _f:
+            # the manifest was rebuilt by another archiver, so it is read again from the start
+            _inode = os.fstat(_f.fileno()).st_ino
+            if _inode != self._inode:
+                self._entries = {}
+                self._offset = 0
+                self._inode = _inode
+
+            _f.seek(self._offset)
+            _data = _f.read()
+
+        # a partially written final line is left to be read once complete
+        _end = _data.rfind(b"\n") + 1
+
+        _new = set()
+        for _line in _data[:_end].splitlines():
+            if not _line.strip():
+                continue
+
+            _entry = json.loads(_line)
+            self._apply(_entry)
+            if _entry.get("removed"):
+                _new.discard(_entry["id"])
+
+            else:
+                _new.add(_entry["id"])
+
+        self._offset += _end
+        return _new
+
+    def _is_consistent(self) -> bool:
+        """Check the most recent segment in the manifest is present with the recorded size.
+
+        :return: True if the manifest appears to match the 'parts' directory
+        :rtype: bool
+        """
+        if not self._entries:
+            return True
+
+        _id = max(self._entries)
+        try:
+            return (
+                Path(self.parts_dir, f"{_id:05d}.ts").stat().st_size
+                == self._entries[_id]["size"]
+            )
+
+        except FileNotFoundError:
+            return False
+
+    def _rebuild(self) -> None:
+        """Rebuild the manifest from the segments present in the 'parts' directory."""
+        self._entries = {}
+        self._offset = 0
+
+        if not self.parts_dir.exists():
+            return
+
+        for _p in self.parts_dir.glob("*.ts"):
+            # skip anything other than segments, such as files left by an interrupted merge
+            if not _p.stem.isdigit():
+                continue
+
+            self._entries[int(_p.stem)] = {"size": _p.stat().st_size, "hash": ""}
+
+        # write to a temporary file first so a partially written manifest is never read
+        _tmp_path = Path(self.parts_dir, MANIFEST_NAME + ".tmp")
+        with open(_tmp_path, "w", encoding="utf8") as _f:
+            for _id in sorted(self._entries):
+                _f.write(json.dumps({"id": _id, **self._entries[_id]}) + "\n")
+
+        os.replace(_tmp_path, self.path)
+        _stat = self.path.stat()
+        self._offset = _stat.st_size
+        self._inode = _stat.st_ino
@@ -0,0 +1,160 @@
+"""Module for reading MP4 metadata without needing FFmpeg."""
+
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+# values used for a duration which isn't known
+_UNKNOWN_DURATIONS = {0, 0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF}
+
+
+def read_mp4_duration(file: Path) -> float | None:
+    """Read the duration of an MP4 file from its movie header ('moov/mvhd').
+
+    The longest track media header ('moov/trak/mdia/mdhd') is used if the movie duration isn't set. Only box
+    headers and the 'moov' box are read, seeking over the media data.
+
+    :param file: path to MP4 file
+    :return: duration in seconds, or None if it couldn't be read
+    :rtype: float or None
+    """
+    with open(file, "rb") as _f:
+        _size = _f.seek(0, 2)
+        _f.seek(0)
+
+        for _type, _start, _end in _iter_boxes(_f, 0, _size):
+            if _type != b"moov":
+                continue
+
+            _f.seek(_start)
+            _moov = _f.read(_end - _start)
+            break
+
+        else:
+            return None
+
+    _duration = _read_header_duration(_find_box(_moov, [b"mvhd"]))
+    if _duration is not None:
+        return _duration
+
+    # movie duration isn't set, so use the longest track
+    _durations = [
+        _read_header_duration(_find_box(_trak, [b"mdia", b"mdhd"]))
+        for _trak in _find_boxes(_moov, b"trak")
+    ]
+    _durations = [_d for _d in _durations if _d is not None]
+    if not _durations:
+        return None
+
+    return max(_durations)
+
+
+def _iter_boxes(
+    file: BinaryIO, start: int, end: int
+) -> Iterator[tuple[bytes, int, int]]:
+    """Generate the type and contents range of each box between two offsets of a file.
+
+    :param file: binary file
+    :param start: offset of the first box
+    :param end: offset the boxes end at
+    :return: generator of (type, start of contents, end of box) tuples
+    """
+    _offset = start
+    while _offset + 8 <= end:
+        file.seek(_offset)
+        _size, _type = struct.unpack(">I4s", file.read(8))
+        _header = 8
+
+        # 64-bit size follows the type
+        if _size == 1:
+            if _offset + 16 > end:
+                return
+            _size = struct.unpack(">Q", file.read(8))[0]
+            _header = 16
+
+        # box extends to the end of the file
+        elif _size == 0:
+            _size = end - _offset
+
+        if _size < _header or _offset + _size > end:
+            return
+
+        yield _type, _offset + _header, _offset + _size
+        _offset += _size
+
+
+def _find_boxes(data: bytes, box_type: bytes) -> list[bytes]:
+    """Find the contents of every box of a given type directly within a box's contents.
+
+    :param data: contents of parent box
+    :param box_type: type of box to find
+    :return: list of box contents
+    :rtype: list[bytes]
+    """
+    _boxes = []
+    _offset = 0
+    while _offset + 8 <= len(data):
+        _size, _type = struct.unpack_from(">I4s", data, _offset)
+        _header = 8
+        if _size == 1:
+            if _offset + 16 > len(data):
+                break
+            _size = struct.unpack_from(">Q", data, _offset + 8)[0]
+            _header = 16
+        elif _size == 0:
+            _size = len(data) - _offset
+
+        if _size < _header or _offset + _size > len(data):
+            break
+
+        if _type == box_type:
+            _boxes.append(data[_offset + _header : _offset + _size])
+        _offset += _size
+
+    return _boxes
+
+
+def _find_box(data: bytes, path: list[bytes]) -> bytes | None:
+    """Find the contents of the first box at the given path within a box's contents.
+
+    :param data: contents of parent box
+    :param path: types of nested boxes to follow
+    :return: box contents, or None if not found
+    :rtype: bytes or None
+    """
+    for _box_type in path:
+        _boxes = _find_boxes(data, _box_type)
+        if not _boxes:
+            return None
+        data = _boxes[0]
+
+    return data
+
+
+def _read_header_duration(header: bytes) -> float | None:
+    """Read the duration from the contents of a movie ('mvhd') or media ('mdhd') header.
+
+    Both headers share a layout up to the duration.
+
+    :param header: contents of header box
+    :return: duration in seconds, or None if it isn't known
+    :rtype: float or None
+    """
+    if not header:
+        return None
+
+    try:
+        # version 1 headers use 64-bit creation and modification times and duration
+        if header[0] == 1:
+            _timescale, _duration = struct.unpack_from(">IQ", header, 20)
+        else:
+            _timescale, _duration = struct.unpack_from(">II", header, 12)
+
+    except struct.error:
+        return None
+
+    if not _timescale or _duration in _UNKNOWN_DURATIONS:
+        return None
+
+    return _duration / _timescale
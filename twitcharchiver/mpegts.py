@@ -0,0 +1,269 @@
+"""Module for inspecting MPEG-TS segments without needing FFmpeg."""
+
+# size of a single transport stream packet
+PACKET_SIZE = 188
+SYNC_BYTE = 0x47
+
+# PID used for padding packets, which don't follow continuity rules
+NULL_PID = 0x1FFF
+
+# PTS and DTS values are 33-bit and wrap around
+TIMESTAMP_WRAP = 1 << 33
+
+
+def find_ts_corruption(data: bytes) -> str | None:
+    """Check a transport stream segment for corruption.
+
+    Packets are checked for a sync byte every 188 bytes, the transport error indicator, continuous continuity counters
+    for each PID, and valid PES headers and timestamps.
+
+    :param data: contents of segment
+    :return: description of the first problem found, or None if the segment appears valid
+    :rtype: str or None
+    """
+    _validator = TsValidator()
+    _validator.update(data)
+    return _validator.result()
+
+
+class TsValidator:
+    """Check transport stream data for corruption as it is written.
+
+    Data is checked a whole number of packets at a time, with a trailing partial packet kept until the rest of it is
+    written, so a segment can be checked while it downloads rather than being read back once complete.
+    """
+
+    def __init__(self) -> None:
+        """Class constructor."""
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all data written, such as when the file being checked is truncated."""
+        # number of bytes written
+        self.size: int = 0
+        self._problem: str | None = None
+        self._partial: bytes = b""
+        # number of complete packets checked
+        self._packets: int = 0
+        self._counters: dict[int, int] = {}
+        self._pes_pids: set[int] = set()
+
+    def update(self, data: bytes) -> None:
+        """Check the packets completed by data appended to the stream.
+
+        :param data: data appended to the stream
+        """
+        self.size += len(data)
+        if self._problem is not None:
+            return
+
+        if self._partial:
+            data = self._partial + data
+
+        _end = len(data) - len(data) % PACKET_SIZE
+        self._partial = bytes(data[_end:])
+        if _end:
+            self._problem = _check_packets(
+                data, _end, self._packets, self._counters, self._pes_pids
+            )
+            self._packets += _end // PACKET_SIZE
+
+    def result(self) -> str | None:
+        """Fetch the first problem found in the data written.
+
+        :return: description of the first problem found, or None if the data appears valid
+        :rtype: str or None
+        """
+        if self._problem is not None:
+            return self._problem
+
+        if not self.size:
+            return "Segment is empty."
+
+        if self._partial:
+            return (
+                f"Segment length {self.size} is not a multiple of {PACKET_SIZE} bytes."
+            )
+
+        return None
+
+
+def _check_packets(
+    data: bytes, end: int, first_index: int, counters: dict, pes_pids: set
+) -> str | None:
+    """Check whole transport stream packets for corruption.
+
+    Header fields are read by slicing every 188th byte so most of the work is done by the interpreter rather than
+    per byte.
+
+    :param data: data starting with a packet
+    :param end: length of the complete packets in data
+    :param first_index: index of the first packet in the stream
+    :param counters: last continuity counter of each PID in the stream, which is updated
+    :param pes_pids: PIDs which have previously started a PES packet, which is updated
+    :return: description of the first problem found, or None if the packets appear valid
+    :rtype: str or None
+    """
+    _packets = end // PACKET_SIZE
+    _sync = data[:end:PACKET_SIZE]
+    if _sync != bytes([SYNC_BYTE]) * _packets:
+        _index = next(_i for _i, _b in enumerate(_sync) if _b != SYNC_BYTE)
+        return f"Packet {first_index + _index} is missing its sync byte."
+
+    _header_1 = data[1:end:PACKET_SIZE]
+    _header_2 = data[2:end:PACKET_SIZE]
+    _header_3 = data[3:end:PACKET_SIZE]
+
+    if max(_header_1) & 0x80:
+        _index = next(_i for _i, _b in enumerate(_header_1) if _b & 0x80)
+        return f"Packet {first_index + _index} has the transport error indicator set."
+
+    for _index, (_b1, _b2, _b3) in enumerate(
+        zip(_header_1, _header_2, _header_3, strict=True)
+    ):
+        _pid = ((_b1 & 0x1F) << 8) | _b2
+        if _pid == NULL_PID:
+            continue
+
+        _offset = _index * PACKET_SIZE
+        _adaptation = _b3 & 0x20
+        _payload = _b3 & 0x10
+        _counter = _b3 & 0x0F
+
+        _payload_start = _offset + 4
+        if _adaptation:
+            _adaptation_length = data[_offset + 4]
+            _payload_start += 1 + _adaptation_length
+
+            if _payload_start > _offset + PACKET_SIZE:
+                return f"Packet {first_index + _index} has an invalid adaptation field length."
+
+            # counter is allowed to jump when the discontinuity indicator is set
+            if _adaptation_length and data[_offset + 5] & 0x80:
+                counters.pop(_pid, None)
+
+        if _payload:
+            _last = counters.get(_pid)
+            # a single duplicate packet is allowed to repeat the previous counter
+            if _last is not None and _counter not in (_last, (_last + 1) & 0x0F):
+                return (
+                    f"Packet {first_index + _index} on PID {_pid} has continuity counter {_counter}, "
+                    f"expected {(_last + 1) & 0x0F}."
+                )
+            counters[_pid] = _counter
+
+            # payload unit start indicator
+            if _b1 & 0x40:
+                _problem = _check_pes_start(
+                    data[_payload_start : _offset + PACKET_SIZE], _pid, pes_pids
+                )
+                if _problem:
+                    return f"Packet {first_index + _index} on PID {_pid}: {_problem}"
+
+    return None
+
+
+def find_start_pts(data: bytes) -> int | None:
+    """Find the start time of a transport stream from the first PTS of each stream.
+
+    This matches the 'start_time' FFprobe reports for the segment.
+
+    :param data: start of segment, which should contain the first PES packet of each stream
+    :return: lowest first PTS of any stream in 90kHz units, or None if no PTS was found
+    :rtype: int or None
+    """
+    _first_pts: dict[int, int] = {}
+    for _offset in range(0, len(data) - PACKET_SIZE + 1, PACKET_SIZE):
+        _b1, _b2, _b3 = data[_offset + 1 : _offset + 4]
+        _pid = ((_b1 & 0x1F) << 8) | _b2
+        if (
+            data[_offset] != SYNC_BYTE
+            or not _b1 & 0x40
+            or not _b3 & 0x10
+            or _pid in _first_pts
+        ):
+            continue
+
+        _payload_start = _offset + 4
+        if _b3 & 0x20:
+            _payload_start += 1 + data[_offset + 4]
+
+        _payload = data[_payload_start : _offset + PACKET_SIZE]
+        if _payload[:3] != b"\x00\x00\x01" or len(_payload) < 14:
+            continue
+
+        _flags = _payload[7] >> 6
+        if _flags in (2, 3):
+            _pts = _read_timestamp(_payload[9:14], 0x20 if _flags == 2 else 0x30)
+            if _pts is not None:
+                _first_pts[_pid] = _pts
+
+    if not _first_pts:
+        return None
+
+    return min(_first_pts.values())
+
+
+def _check_pes_start(payload: bytes, pid: int, pes_pids: set) -> str | None:
+    """Check the start of a PES packet, recording PIDs which carry PES so a missing start code can be detected.
+
+    :param payload: payload of packet with the payload unit start indicator set
+    :param pid: PID of packet
+    :param pes_pids: PIDs which have previously started a PES packet
+    :return: description of problem, or None if valid
+    :rtype: str or None
+    """
+    if payload[:3] != b"\x00\x00\x01":
+        # PSI tables (PAT, PMT) start with a pointer field rather than a start code
+        if pid in pes_pids:
+            return "PES packet start code missing."
+        return None
+
+    pes_pids.add(pid)
+
+    # header fields of streams without optional headers (e.g padding) aren't checked
+    if len(payload) < 9 or payload[6] & 0xC0 != 0x80:
+        return None
+
+    _flags = payload[7] >> 6
+    if _flags == 1:
+        return "PES header has a DTS without a PTS."
+
+    if _flags:
+        _pts = _read_timestamp(payload[9:14], 0x20 if _flags == 2 else 0x30)
+        if _pts is None:
+            return "PES header has an invalid PTS."
+
+        if _flags == 3:
+            _dts = _read_timestamp(payload[14:19], 0x10)
+            if _dts is None:
+                return "PES header has an invalid DTS."
+
+            # presentation can't come before decoding
+            if (_pts - _dts) % TIMESTAMP_WRAP >= TIMESTAMP_WRAP // 2:
+                return f"PES header has a PTS ({_pts}) before its DTS ({_dts})."
+
+    return None
+
+
+def _read_timestamp(field: bytes, prefix: int) -> int | None:
+    """Read a 33-bit PTS or DTS from a PES header, checking its prefix and marker bits.
+
+    :param field: 5 bytes containing the timestamp
+    :param prefix: expected value of the top 4 bits of the first byte
+    :return: timestamp, or None if the field is invalid
+    :rtype: int or None
+    """
+    if len(field) < 5:
+        return None
+
+    if field[0] & 0xF0 != prefix or not field[0] & field[2] & field[4] & 0x01:
+        return None
+
+    return (
+        ((field[0] >> 1) & 0x07) << 30
+        | field[1] << 22
+        | (field[2] >> 1) << 15
+        | field[3] << 7
+        | field[4] >> 1
+    )
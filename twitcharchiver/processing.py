@@ -7,24 +7,32 @@ import os
 import shutil
 import signal
 import sys
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
+from functools import partial
 from pathlib import Path
 
 from twitcharchiver.channel import Channel
+from twitcharchiver.concurrency import AdaptiveConcurrency
 from twitcharchiver.database import Database
-from twitcharchiver.downloader import DownloadHandler, Downloader
+from twitcharchiver.downloader import Downloader, DownloadHandler
 from twitcharchiver.downloaders.chat import Chat
 from twitcharchiver.downloaders.highlight import Highlight
 from twitcharchiver.downloaders.realtime import RealTime
 from twitcharchiver.downloaders.stream import Stream
 from twitcharchiver.downloaders.video import Video
 from twitcharchiver.exceptions import (
-    VodLockedError,
-    VodAlreadyCompleted,
     VideoFormatUnsupported,
+    VodAlreadyCompleted,
+    VodLockedError,
 )
-from twitcharchiver.utils import send_push, send_discord_notification
-from twitcharchiver.vod import Vod, ArchivedVod
+from twitcharchiver.ffmpeg import FFmpeg
+from twitcharchiver.ratelimit import BandwidthLimiter
+from twitcharchiver.resolver import VodResolver
+from twitcharchiver.scheduler import PostProcessor, VodScheduler
+from twitcharchiver.utils import send_discord_notification, send_push
+from twitcharchiver.vod import ArchivedVod, Vod
 
 TEMP_BUFFER_LEN = 300
 
@@ -48,6 +56,7 @@ class Processing:
         self.live_only: bool = conf["live_only"]
         self.real_time: bool = conf["real_time_archiver"]
         self.unsorted: bool = conf["unsorted"]
+        self.full_listing: bool = conf["full_listing"]
 
         self.config_dir: str = conf["config_dir"]
         # store parent dir for creation of channel subdirectories stored in output_dir
@@ -58,6 +67,31 @@ class Processing:
         self.pushbullet_key: str = conf["pushbullet_key"]
         self.quality: str = conf["quality"]
         self.threads: int = conf["threads"]
+        self.engine: str = conf["engine"]
+        self.merge_mode: str = conf["merge_mode"]
+        self.parallel_vods: int = conf["parallel_vods"]
+        self.ffmpeg_processes: int = max(1, conf["ffmpeg_processes"])
+        FFmpeg.set_max_processes(self.ffmpeg_processes)
+        self.parallel_channels: int = max(1, conf["parallel_channels"])
+
+        # shared between video downloaders so the learned limit carries over from one VOD to the next
+        self.concurrency: AdaptiveConcurrency = None
+        if conf["adaptive_threads"]:
+            self.concurrency = AdaptiveConcurrency(
+                self.threads, conf["min_threads"], conf["max_threads"]
+            )
+
+        # limiter is global so it also applies to Api requests and is passed on to real-time archiver processes
+        if (
+            conf["bandwidth_limit"]
+            or conf["vod_bandwidth_limit"]
+            or conf["channel_bandwidth_limit"]
+        ):
+            BandwidthLimiter.create_global_limiter(
+                conf["bandwidth_limit"],
+                conf["vod_bandwidth_limit"],
+                conf["channel_bandwidth_limit"],
+            )
 
         # debug flags
         self.force_no_archive: bool = conf["force_no_archive"]
@@ -70,17 +104,67 @@ class Processing:
         signal.signal(signal.SIGTERM, signal.default_int_handler)
 
     def get_channel(self, channels: list[Channel]):
-        """
-        Download all vods from a specified channel or list of channels.
+        """Download all vods from a specified channel or list of channels.
+
+        Channels are polled for new VODs and streams concurrently, with each channel handled as soon as it has been
+        polled.
 
         :param channels: list of channels to download based on processing configuration
         """
+        _channel_queues: dict[int, list[ArchivedVod]] = {}
+        _pool = ThreadPoolExecutor(
+            max_workers=self.parallel_channels, thread_name_prefix="channel_poll"
+        )
+        try:
+            _futures = {
+                _pool.submit(self._poll_channel, _channel): _index
+                for _index, _channel in enumerate(channels)
+            }
+
+            for _future in as_completed(_futures):
+                _polled = _future.result()
+                # failed channels have been logged and are checked again on the next pass
+                if _polled:
+                    _channel_queues[_futures[_future]] = self._process_channel(*_polled)
+
+        finally:
+            _pool.shutdown(wait=False, cancel_futures=True)
+
+        # download all collected VODs in the order channels were provided
         download_queue: list[ArchivedVod] = []
-        for channel in channels:
+        for _index in sorted(_channel_queues):
+            download_queue.extend(_channel_queues[_index])
+
+        self.vod_downloader(download_queue)
+
+    def _poll_channel(
+        self, channel: Channel
+    ) -> tuple[Channel, list[ArchivedVod], list[Vod], bool] | None:
+        """Retrieve a channel's archived and available VODs and whether it is live.
+
+        Errors are logged rather than raised so a single channel failing doesn't prevent others from being checked.
+
+        :param channel: channel to poll
+        :return: channel, VODs previously archived from the channel, available VODs and whether the channel is live,
+            or None if the channel couldn't be polled
+        :rtype: tuple[Channel, list[ArchivedVod], list[Vod], bool] or None
+        """
+        try:
             self.log.info("Fetching VODs for channel '%s'.", channel.name)
             self.log.debug("Channel info: %s", channel)
-            # set output directory to subdir of channel name
-            self.output_dir = Path(self._parent_dir, channel.name)
+
+            # retrieve downloaded vods
+            with Database(Path(self.config_dir, "vods.db")) as _db:
+                # dict containing stream_id: (vod_id, video_downloaded, chat_downloaded)
+                downloaded_vods: list[ArchivedVod] = [
+                    ArchivedVod.import_from_db(v)
+                    for v in _db.execute_query(
+                        "SELECT vod_id,stream_id,created_at,chat_archived,video_archived FROM vods "
+                        "WHERE user_id IS ?",
+                        {"user_id": channel.id},
+                    )
+                ]
+            self.log.debug("Downloaded VODs: %s", len(downloaded_vods))
 
             # retrieve available vods and extract required info
             # only need the most recent VOD if running in live-only mode
@@ -90,142 +174,195 @@ class Processing:
                 if _latest_video:
                     channel_videos.append(_latest_video)
             else:
-                channel_videos: list[Vod] = channel.get_channel_archives()
-                if self.highlights:
-                    channel_videos.extend(channel.get_channel_highlights())
+                # stop listing at VODs which are already archived in all requested formats
+                _known_vods, _oldest_required = set(), 0
+                if not self.full_listing:
+                    _known_vods, _oldest_required = self._get_listing_bounds(
+                        downloaded_vods
+                    )
 
-            channel_live = channel.is_live(force_refresh=True)
-            if channel_live:
-                # fetch current stream info
-                stream: Stream = Stream(
-                    channel, Vod(), self.output_dir, self.quality, self.quiet, False
+                channel_videos: list[Vod] = channel.get_channel_archives(
+                    _known_vods, _oldest_required
                 )
+                if self.highlights:
+                    channel_videos.extend(
+                        channel.get_channel_highlights(_known_vods, _oldest_required)
+                    )
 
-                # check for debug force no archive flag
-                if self.force_no_archive:
-                    stream.vod = ArchivedVod.convert_from_vod(stream.vod)
-                    self._start_download(stream)
-                    continue
+            channel_live = channel.is_live(force_refresh=True)
 
-                # if stream length is less than TEMP_BUFFER_LEN, archive in stream-only mode for the time being
-                # while we wait for twitch's VOD api to update
-                if not stream.vod.v_id and stream.vod.duration < TEMP_BUFFER_LEN:
-                    self.log.info(
-                        "Stream began very recently, buffering initial segments until API updates."
-                    )
-                    with DownloadHandler(
-                        ArchivedVod.convert_from_vod(stream.vod)
-                    ) as _dh:
-                        # we're not setting either the video_archived or chat_archived flags here because we may want
-                        # to archive them from the VOD (if it becomes available). The stream info will be placed into
-                        # the database once the buffer is saved
-                        stream.archive_for_duration(TEMP_BUFFER_LEN)
-
-                        # stream ended before buffer time reached
-                        if stream.has_ended:
-                            stream.export_metadata()
-                            stream.merge()
-                            stream.cleanup_temp_files()
-
-                # don't bother with further checks if stream archive completed
-                if not stream.has_ended:
-                    # TEMP_BUFFER_LEN has passed, check if stream has paired VOD now...
-                    stream.match_to_channel_vod()
-
-                    # if VOD was missed by the channel video fetcher as the stream was too new we add it to the videos.
-                    # otherwise we add it to the download queue
-                    if stream.vod.v_id:
-                        self.log.debug("Current stream has a paired VOD.")
-
-                        # remove downloaded files (if any)
-                        stream.cleanup_temp_files()
-                        shutil.rmtree(Path(stream.output_dir), ignore_errors=True)
+        except Exception as err:
+            self.log.error(
+                "Failed to fetch VODs for channel '%s', skipping. Error: %s",
+                channel.name,
+                err,
+            )
+            return None
+
+        return channel, downloaded_vods, channel_videos, channel_live
+
+    def _process_channel(
+        self,
+        channel: Channel,
+        downloaded_vods: list[ArchivedVod],
+        channel_videos: list[Vod],
+        channel_live: bool,
+    ) -> list[ArchivedVod]:
+        """Archive a polled channel's current stream if required, and find which of its VODs need downloading.
+
+        :param channel: channel which was polled
+        :param downloaded_vods: VODs previously archived from the channel
+        :param channel_videos: VODs available from the channel
+        :param channel_live: whether the channel is live
+        :return: VODs to download from the channel
+        :rtype: list[ArchivedVod]
+        """
+        # set output directory to subdir of channel name
+        self.output_dir = Path(self._parent_dir, channel.name)
 
-                        if stream.vod.v_id not in [v.v_id for v in channel_videos]:
-                            channel_videos.insert(0, Vod(stream.vod.v_id))
+        if channel_live:
+            # fetch current stream info
+            stream: Stream = Stream(
+                channel, Vod(), self.output_dir, self.quality, self.quiet, False
+            )
 
-                    # no paired VOD exists, so we archive the stream before moving onto VODs
-                    elif self.archive_video and not self.archive_only:
-                        self.log.debug(
-                            "Current stream has no paired VOD - beginning stream downloader."
-                        )
-                        stream.vod = ArchivedVod.convert_from_vod(stream.vod)
-                        self._start_download(stream)
+            # check for debug force no archive flag
+            if self.force_no_archive:
+                stream.vod = ArchivedVod.convert_from_vod(stream.vod)
+                self._start_download(stream)
+                return []
 
-            # move on if channel offline and `live-only` set
-            elif self.live_only:
+            # if stream length is less than TEMP_BUFFER_LEN, archive in stream-only mode for the time being
+            # while we wait for twitch's VOD api to update
+            if not stream.vod.v_id and stream.vod.duration < TEMP_BUFFER_LEN:
                 self.log.info(
-                    "%s is offline and `live-only` argument provided.", channel.name
+                    "Stream began very recently, buffering initial segments until API updates."
                 )
-                continue
+                with DownloadHandler(ArchivedVod.convert_from_vod(stream.vod)) as _dh:
+                    # we're not setting either the video_archived or chat_archived flags here because we may want
+                    # to archive them from the VOD (if it becomes available). The stream info will be placed into
+                    # the database once the buffer is saved
+                    stream.archive_for_duration(TEMP_BUFFER_LEN)
+
+                    # stream ended before buffer time reached
+                    if stream.has_ended:
+                        stream.export_metadata()
+                        stream.merge()
+                        stream.cleanup_temp_files()
 
-            self.log.debug(
-                "Available VODs: %s",
-                [v.v_id for v in channel_videos] if channel_videos else "None",
-            )
+            # don't bother with further checks if stream archive completed
+            if not stream.has_ended:
+                # TEMP_BUFFER_LEN has passed, check if stream has paired VOD now...
+                stream.match_to_channel_vod()
 
-            # retrieve downloaded vods
-            with Database(Path(self.config_dir, "vods.db")) as _db:
-                # dict containing stream_id: (vod_id, video_downloaded, chat_downloaded)
-                downloaded_vods: list[ArchivedVod] = [
-                    ArchivedVod.import_from_db(v)
-                    for v in _db.execute_query(
-                        "SELECT vod_id,stream_id,created_at,chat_archived,video_archived FROM vods "
-                        "WHERE user_id IS ?",
-                        {"user_id": channel.id},
+                # if VOD was missed by the channel video fetcher as the stream was too new we add it to the videos.
+                # otherwise we add it to the download queue
+                if stream.vod.v_id:
+                    self.log.debug("Current stream has a paired VOD.")
+
+                    # remove downloaded files (if any)
+                    stream.cleanup_temp_files()
+                    shutil.rmtree(Path(stream.output_dir), ignore_errors=True)
+
+                    if stream.vod.v_id not in [v.v_id for v in channel_videos]:
+                        channel_videos.insert(0, Vod(stream.vod.v_id))
+
+                # no paired VOD exists, so we archive the stream before moving onto VODs
+                elif self.archive_video and not self.archive_only:
+                    self.log.debug(
+                        "Current stream has no paired VOD - beginning stream downloader."
                     )
+                    stream.vod = ArchivedVod.convert_from_vod(stream.vod)
+                    self._start_download(stream)
+
+        # move on if channel offline and `live-only` set
+        elif self.live_only:
+            self.log.info(
+                "%s is offline and `live-only` argument provided.", channel.name
+            )
+            return []
+
+        self.log.debug(
+            "Available VODs: %s",
+            [v.v_id for v in channel_videos] if channel_videos else "None",
+        )
+
+        # generate vod queue using downloaded and available vods
+        _channel_download_queue: list[ArchivedVod] = []
+        for _vod in channel_videos:
+            self.log.debug("Processing VOD %s.", _vod.v_id)
+            # insert channel data
+            _vod.channel = channel
+
+            # add any vods not already archived
+            if _vod.v_id not in [v.v_id for v in downloaded_vods]:
+                self.log.debug("VOD added to download queue.")
+                _channel_download_queue.append(ArchivedVod.convert_from_vod(_vod))
+
+            # if VOD already downloaded, add it to the queue if formats are missing
+            else:
+                # get downloaded VOD from list of downloaded VODs
+                _downloaded_vod = downloaded_vods[
+                    [v.v_id for v in downloaded_vods].index(_vod.v_id)
                 ]
-            self.log.debug("Downloaded VODs: %s", len(downloaded_vods))
 
-            # generate vod queue using downloaded and available vods
-            _channel_download_queue: list[ArchivedVod] = []
-            for _vod in channel_videos:
-                self.log.debug("Processing VOD %s.", _vod.v_id)
-                # insert channel data
-                _vod.channel = channel
+                # check if any requested format is missing
+                if (
+                    not _downloaded_vod.chat_archived
+                    and self.archive_chat
+                    or not _downloaded_vod.video_archived
+                    and self.archive_video
+                ):
+                    self.log.debug(
+                        "VOD already archived but requested format(s) missing - adding them to download queue."
+                    )
+                    _channel_download_queue.append(
+                        ArchivedVod.convert_from_vod(
+                            _vod,
+                            _downloaded_vod.chat_archived,
+                            _downloaded_vod.video_archived,
+                        )
+                    )
+
+        # exit if vod queue empty
+        if not _channel_download_queue:
+            self.log.info(
+                "No new VODs are available in the requested formats for %s.",
+                channel.name,
+            )
 
-                # add any vods not already archived
-                if _vod.v_id not in [v.v_id for v in downloaded_vods]:
-                    self.log.debug("VOD added to download queue.")
-                    _channel_download_queue.append(ArchivedVod.convert_from_vod(_vod))
+        return _channel_download_queue
 
-                # if VOD already downloaded, add it to the queue if formats are missing
-                else:
-                    # get downloaded VOD from list of downloaded VODs
-                    _downloaded_vod = downloaded_vods[
-                        [v.v_id for v in downloaded_vods].index(_vod.v_id)
-                    ]
-
-                    # check if any requested format is missing
-                    if (
-                        not _downloaded_vod.chat_archived
-                        and self.archive_chat
-                        or not _downloaded_vod.video_archived
-                        and self.archive_video
-                    ):
-                        self.log.debug(
-                            "VOD already archived but requested format(s) missing - adding them to download queue."
-                        )
-                        _channel_download_queue.append(
-                            ArchivedVod.convert_from_vod(
-                                _vod,
-                                _downloaded_vod.chat_archived,
-                                _downloaded_vod.video_archived,
-                            )
-                        )
+    def _get_listing_bounds(
+        self, downloaded_vods: list[ArchivedVod]
+    ) -> tuple[set[int], int]:
+        """Find where a channel's video listing can stop, as videos are listed newest first.
 
-            # exit if vod queue empty
-            if not _channel_download_queue:
-                self.log.info(
-                    "No new VODs are available in the requested formats for %s.",
-                    channel.name,
-                )
+        Listing can stop once it reaches a VOD which is archived in every requested format, provided it has also reached
+        any archived VODs which are missing a requested format.
+
+        :param downloaded_vods: VODs previously archived from the channel
+        :return: IDs of VODs archived in every requested format, and ID of the oldest VOD missing a format or 0
+        :rtype: tuple[set[int], int]
+        """
+        _complete: set[int] = set()
+        _incomplete: list[int] = []
+        for _vod in downloaded_vods:
+            # streams archived without a VOD can't be matched to the listing
+            if not _vod.v_id:
+                continue
 
+            if (
+                not _vod.chat_archived
+                and self.archive_chat
+                or not _vod.video_archived
+                and self.archive_video
+            ):
+                _incomplete.append(int(_vod.v_id))
             else:
-                download_queue.extend(_channel_download_queue)
+                _complete.add(int(_vod.v_id))
 
-        # download all collected VODs
-        self.vod_downloader(download_queue)
+        return _complete, min(_incomplete, default=0)
 
     def vod_downloader(self, download_queue: list[ArchivedVod]):
         """
@@ -236,15 +373,102 @@ class Processing:
         self.log.info("%s VOD(s) in download queue.", len(download_queue))
         self.log.debug("VOD queue: %s", [v.v_id for v in download_queue])
 
-        _video_download_queue: list = []
-        _chat_download_queue: list = []
+        # reverse the download queue so that the oldest vods are downloaded first unless the '--unsorted' argument is provided.
+        if not self.unsorted:
+            download_queue.reverse()
 
-        # cache channels with associated broadcast VOD IDs
-        _channel_cache: list[Channel] = []
+        self._download_queue(download_queue)
+
+    def vod_id_downloader(self, vod_ids: list) -> None:
+        """Retrieve and download a given list of VODs according to the settings stored inside the class.
+
+        VODs are retrieved in batches in the background, with downloads beginning as soon as the first VODs are
+        retrieved.
+
+        :param vod_ids: IDs of VODs to download
+        :type vod_ids: list[int or str]
+        """
+        self.log.info("%s VOD(s) in download queue.", len(vod_ids))
+        self.log.debug("VOD queue: %s", vod_ids)
 
         # reverse the download queue so that the oldest vods are downloaded first unless the '--unsorted' argument is provided.
         if not self.unsorted:
-            download_queue.reverse()
+            vod_ids = list(reversed(vod_ids))
+
+        self._download_queue(
+            ArchivedVod.convert_from_vod(_vod)
+            for _vod in VodResolver().resolve(vod_ids)
+        )
+
+    def _download_queue(self, download_queue: Iterable[ArchivedVod]) -> None:
+        """Download VODs in the order provided.
+
+        :param download_queue: ArchivedVod objects, which may be generated while earlier VODs are downloading
+        """
+        _chat_download_queue: list = []
+
+        # VODs share the scheduler's download workers, which the async engine doesn't use
+        _scheduler: VodScheduler = None
+        if self.engine == "threads":
+            _scheduler = VodScheduler(
+                self.threads, self.parallel_vods, self.concurrency
+            )
+
+        # video downloaders are created as the previous VODs start downloading, chat downloads run afterward
+        self._download_videos(
+            self._queue_downloads(download_queue, _chat_download_queue, _scheduler),
+            _scheduler,
+        )
+
+        if _chat_download_queue:
+            _worker_pool = ThreadPoolExecutor(max_workers=self.threads)
+            try:
+                self.log.debug(
+                    "Beginning bulk chat archival with %s threads.", self.threads
+                )
+                # create threadpool for chat downloads
+                futures = []
+                for _downloader in _chat_download_queue:
+                    futures.append(
+                        _worker_pool.submit(self._start_download, _downloader)
+                    )
+
+                for future in futures:
+                    if future.exception():
+                        self.log.debug(
+                            "Exception occurred in chat download pool: %s",
+                            future.exception(),
+                        )
+
+            except KeyboardInterrupt:
+                self.log.debug(
+                    "Chat downloader caught interrupt, shutting down workers..."
+                )
+                _worker_pool.shutdown(wait=False, cancel_futures=True)
+                sys.exit(0)
+
+            finally:
+                _worker_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _queue_downloads(
+        self,
+        download_queue: Iterable[ArchivedVod],
+        chat_download_queue: list,
+        scheduler: VodScheduler = None,
+    ) -> Iterator[Video]:
+        """Generate a video downloader for each VOD which needs its video archived.
+
+        Chat downloaders are added to the provided list. Live VODs are archived with the real-time archiver as they
+        are reached.
+
+        :param download_queue: ArchivedVod objects to download
+        :param chat_download_queue: list which chat downloaders are added to
+        :param scheduler: scheduler shared by the video downloaders
+        :return: generator of video downloaders
+        :rtype: collections.abc.Iterator[Video]
+        """
+        # cache channels with associated broadcast VOD IDs
+        _channel_cache: list[Channel] = []
 
         # begin processing each available vod
         for _vod in download_queue:
@@ -287,6 +511,9 @@ class Processing:
                             self.archive_chat,
                             self.quality,
                             self.threads,
+                            self.engine,
+                            self.concurrency,
+                            self.merge_mode,
                         )
                         self._start_download(_real_time_archiver)
                         continue
@@ -294,67 +521,83 @@ class Processing:
             if not _vod.video_archived and self.archive_video:
                 self.log.debug("Adding VOD to video archive queue.")
                 if _vod.type == "HIGHLIGHT":
-                    _video_download_queue.append(
-                        Highlight(
-                            _vod,
-                            _vod_output_dir,
-                            self.quality,
-                            self.threads,
-                            self.quiet,
-                        )
+                    yield Highlight(
+                        _vod,
+                        _vod_output_dir,
+                        self.quality,
+                        self.threads,
+                        self.quiet,
+                        self.engine,
+                        self.concurrency,
+                        self.merge_mode,
+                        scheduler,
                     )
 
                 else:
-                    _video_download_queue.append(
-                        Video(
-                            _vod,
-                            _vod_output_dir,
-                            self.quality,
-                            self.threads,
-                            self.quiet,
-                        )
+                    yield Video(
+                        _vod,
+                        _vod_output_dir,
+                        self.quality,
+                        self.threads,
+                        self.quiet,
+                        self.engine,
+                        self.concurrency,
+                        self.merge_mode,
+                        scheduler,
                     )
 
             if not _vod.chat_archived and self.archive_chat:
                 self.log.debug("Adding VOD to chat archive queue.")
-                _chat_download_queue.append(Chat(_vod, _vod_output_dir, self.quiet))
+                chat_download_queue.append(Chat(_vod, _vod_output_dir, self.quiet))
 
-        for _downloader in _video_download_queue:
-            self._start_download(_downloader)
+    def _download_videos(
+        self, downloaders: Iterable[Video], scheduler: VodScheduler = None
+    ) -> None:
+        """Download the video of each VOD.
 
-        if _chat_download_queue:
-            _worker_pool = ThreadPoolExecutor(max_workers=self.threads)
-            try:
-                self.log.debug(
-                    "Beginning bulk chat archival with %s threads.", self.threads
-                )
-                # create threadpool for chat downloads
-                futures = []
-                for _downloader in _chat_download_queue:
-                    futures.append(
-                        _worker_pool.submit(self._start_download, _downloader)
-                    )
+        Finished downloads are post-processed in the background while the next VOD downloads.
 
-                for future in futures:
-                    if future.exception():
-                        self.log.debug(
-                            "Exception occurred in chat download pool: %s",
-                            future.exception(),
-                        )
+        :param downloaders: video downloaders to run, which may be generated as earlier VODs start downloading
+        :param scheduler: scheduler used to download several VODs at once, otherwise VODs are downloaded in turn
+        """
+        _post_processor = PostProcessor(
+            self._finish_download, workers=self.ffmpeg_processes
+        )
+        _post_processor.start()
+        _job = partial(self._start_download, post_processor=_post_processor)
+        try:
+            if scheduler:
+                # the next VOD starts downloading while the previous one drains
+                scheduler.run(downloaders, _job)
 
-            except KeyboardInterrupt:
-                self.log.debug(
-                    "Chat downloader caught interrupt, shutting down workers..."
-                )
-                _worker_pool.shutdown(wait=False, cancel_futures=True)
-                sys.exit(0)
+            else:
+                for _downloader in downloaders:
+                    _job(_downloader)
 
-            finally:
-                _worker_pool.shutdown(wait=False, cancel_futures=True)
+        except KeyboardInterrupt:
+            self.log.info("Termination signal received, halting VOD downloader.")
+            _post_processor.stop(cancel=True)
+            sys.exit(0)
 
-    def _start_download(self, _downloader: Downloader):
-        try:
-            with DownloadHandler(_downloader.vod) as _dh:
+        # VODs which finished downloading are still post-processed if another VOD exited
+        finally:
+            _post_processor.stop()
+
+        if _post_processor.exit_code is not None:
+            sys.exit(_post_processor.exit_code)
+
+    def _start_download(
+        self, _downloader: Downloader, post_processor: PostProcessor = None
+    ) -> None:
+        """Download a VOD, then merge it and clean up its temporary files.
+
+        :param _downloader: downloader to run
+        :param post_processor: optional post-processor which finished downloads are handed to, holding the VOD's lock
+            until post-processing finishes and the VOD is added to the database
+        """
+        with self._handle_download_errors(_downloader):
+            with ExitStack() as _context:
+                _context.enter_context(DownloadHandler(_downloader.vod))
                 if _downloader.vod.v_id:
                     self.log.debug(
                         "Beginning download of VOD %s.", _downloader.vod.v_id
@@ -364,9 +607,41 @@ class Processing:
                         "Beginning download of Stream %s.", _downloader.vod.s_id
                     )
                 _downloader.start()
-                _downloader.export_metadata()
-                _downloader.merge()
-                _downloader.cleanup_temp_files()
+
+                if post_processor:
+                    post_processor.put(_downloader, _context.pop_all())
+                    return
+
+                self._post_process(_downloader)
+
+    def _finish_download(self, _downloader: Downloader, context: ExitStack) -> None:
+        """Post-process a downloaded VOD, closing the context it was downloaded in once finished.
+
+        :param _downloader: downloader which has finished downloading
+        :param context: context holding the VOD's download handler
+        """
+        with self._handle_download_errors(_downloader):
+            with context:
+                self._post_process(_downloader)
+
+    @staticmethod
+    def _post_process(_downloader: Downloader) -> None:
+        """Export metadata for a downloaded VOD, merge it and delete its temporary files.
+
+        :param _downloader: downloader which has finished downloading
+        """
+        _downloader.export_metadata()
+        _downloader.merge()
+        _downloader.cleanup_temp_files()
+
+    @contextmanager
+    def _handle_download_errors(self, _downloader: Downloader) -> Iterator[None]:
+        """Handle errors raised while archiving a VOD, exiting on unrecoverable ones.
+
+        :param _downloader: downloader being run
+        """
+        try:
+            yield
 
         except VodAlreadyCompleted:
             return
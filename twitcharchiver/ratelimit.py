@@ -0,0 +1,244 @@
+"""Module for limiting the bandwidth used by downloads."""
+
+import asyncio
+import multiprocessing
+import threading
+from time import monotonic, sleep
+
+
+class TokenBucket:
+    """Token bucket allowing an average of `rate` bytes per second, with bursts of up to `burst` bytes.
+
+    Downloaded bytes are taken from the bucket after being received and the caller is told how long to wait for the
+    bucket to refill, so large reads can take it below zero rather than having to be split up.
+
+    A shared bucket keeps its state in shared memory so the limit holds across processes. It must be created before
+    the processes using it are started.
+    """
+
+    def __init__(self, rate: float, burst: float = None, shared: bool = False) -> None:
+        """Class constructor.
+
+        :param rate: average number of bytes per second allowed
+        :param burst: number of bytes which can be taken at once from a full bucket (default: one second's worth)
+        :param shared: whether the bucket should be shared between processes
+        """
+        self.rate: float = float(rate)
+        self.burst: float = float(burst or rate)
+        self.shared: bool = shared
+
+        # [available tokens, monotonic time of last update]
+        if shared:
+            self._state = multiprocessing.Array("d", [self.burst, monotonic()])
+            self._lock = self._state.get_lock()
+
+        else:
+            self._state = [self.burst, monotonic()]
+            self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """Copy the state to be pickled, leaving out the thread lock which can't be passed to a separate process.
+
+        Shared buckets are only pickled when starting a new process.
+        """
+        _state = self.__dict__.copy()
+        if not self.shared:
+            del _state["_lock"]
+        return _state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore pickled state, creating a new thread lock if the bucket isn't shared."""
+        self.__dict__.update(state)
+        if not self.shared:
+            self._lock = threading.Lock()
+
+    def reserve(self, size: int) -> float:
+        """Take the given number of bytes from the bucket.
+
+        :param size: number of bytes downloaded
+        :return: number of seconds to wait before downloading any more
+        :rtype: float
+        """
+        with self._lock:
+            _now = monotonic()
+            _tokens = min(
+                self.burst, self._state[0] + (_now - self._state[1]) * self.rate
+            )
+            self._state[0] = _tokens - size
+            self._state[1] = _now
+
+            return max(0.0, -self._state[0] / self.rate)
+
+
+class BandwidthLimiter:
+    """Limits the combined bandwidth used by video, stream and chat downloads.
+
+    Optional limits can also be set for each VOD or channel.
+
+    One limiter is created for the process with create_global_limiter() and passed on to new processes by
+    ProcessWithLogging, similar to the ProcessLogger.
+    """
+
+    _global_limiter = None
+
+    def __init__(
+        self, rate: float = 0, vod_rate: float = 0, channel_rate: float = 0
+    ) -> None:
+        """Class constructor.
+
+        :param rate: bytes per second allowed across all downloads, or 0 for no limit
+        :param vod_rate: bytes per second allowed for each VOD, or 0 for no limit
+        :param channel_rate: bytes per second allowed for each channel, or 0 for no limit
+        """
+        self.rate: float = rate
+        self.vod_rate: float = vod_rate
+        self.channel_rate: float = channel_rate
+
+        self._bucket: TokenBucket = None
+        if rate:
+            self._bucket = TokenBucket(rate, shared=True)
+
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """Copy the state to be pickled, leaving out the lock which can't be passed to a separate process."""
+        _state = self.__dict__.copy()
+        del _state["_lock"]
+        return _state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore pickled state, creating a new lock."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_global_limiter(cls) -> "BandwidthLimiter | None":
+        """Fetch the limiter used by the current process.
+
+        :return: global limiter, or None if bandwidth isn't limited
+        :rtype: BandwidthLimiter or None
+        """
+        return cls._global_limiter
+
+    @classmethod
+    def set_global_limiter(cls, limiter: "BandwidthLimiter") -> None:
+        """Set the limiter used by the current process, such as one inherited from a parent process.
+
+        :param limiter: limiter to use, or None to remove the limit
+        :type limiter: BandwidthLimiter or None
+        """
+        cls._global_limiter = limiter
+
+    @classmethod
+    def create_global_limiter(
+        cls, rate: float = 0, vod_rate: float = 0, channel_rate: float = 0
+    ) -> "BandwidthLimiter":
+        """Create the limiter used by the current process and any processes it starts.
+
+        :param rate: bytes per second allowed across all downloads, or 0 for no limit
+        :param vod_rate: bytes per second allowed for each VOD, or 0 for no limit
+        :param channel_rate: bytes per second allowed for each channel, or 0 for no limit
+        :return: global limiter
+        :rtype: BandwidthLimiter
+        """
+        cls._global_limiter = BandwidthLimiter(rate, vod_rate, channel_rate)
+        return cls._global_limiter
+
+    def share(self, vod: "Vod") -> None:
+        """Create shared buckets for a VOD and its channel so they are limited across the processes archiving it.
+
+        Must be called before those processes are started.
+
+        :param vod: VOD which will be downloaded by multiple processes
+        :type vod: twitcharchiver.vod.Vod
+        """
+        with self._lock:
+            for _key, _rate in self._scopes(vod):
+                _bucket = self._buckets.get(_key)
+                if _bucket is None or not _bucket.shared:
+                    self._buckets[_key] = TokenBucket(_rate, shared=True)
+
+    def unshare(self, vod: "Vod") -> None:
+        """Remove the shared bucket created for a VOD once the processes archiving it have finished.
+
+        Channel buckets are kept for the channel's next VOD.
+
+        :param vod: VOD previously passed to share()
+        :type vod: twitcharchiver.vod.Vod
+        """
+        with self._lock:
+            self._buckets.pop(("vod", str(vod.v_id or vod.s_id)), None)
+
+    def reserve(self, size: int, vod: "Vod" = None) -> float:
+        """Take the given number of bytes from the global bucket and the buckets of the VOD and its channel (if any).
+
+        :param size: number of bytes downloaded
+        :param vod: VOD the bytes were downloaded for
+        :type vod: twitcharchiver.vod.Vod
+        :return: number of seconds to wait before downloading any more
+        :rtype: float
+        """
+        _delay = 0.0
+        if self._bucket:
+            _delay = self._bucket.reserve(size)
+
+        if vod is not None:
+            for _key, _rate in self._scopes(vod):
+                _delay = max(_delay, self._get_bucket(_key, _rate).reserve(size))
+
+        return _delay
+
+    def _scopes(self, vod: "Vod") -> list[tuple[tuple[str, str], float]]:
+        """Generate the keys and rates of the per-VOD and per-channel buckets which apply to a VOD.
+
+        :param vod: VOD to generate keys for
+        :return: list of (key, rate) tuples
+        :rtype: list[tuple[tuple[str, str], float]]
+        """
+        _scopes = []
+        if self.vod_rate:
+            _scopes.append((("vod", str(vod.v_id or vod.s_id)), self.vod_rate))
+
+        if self.channel_rate:
+            _scopes.append((("channel", vod.channel.name), self.channel_rate))
+
+        return _scopes
+
+    def _get_bucket(self, key: tuple[str, str], rate: float) -> TokenBucket:
+        with self._lock:
+            _bucket = self._buckets.get(key)
+            if _bucket is None:
+                _bucket = self._buckets[key] = TokenBucket(rate)
+
+            return _bucket
+
+
+def limit_bandwidth(size: int, vod: "Vod" = None) -> None:
+    """Wait as required by the global bandwidth limiter (if any) after downloading the given number of bytes.
+
+    :param size: number of bytes downloaded
+    :param vod: VOD the bytes were downloaded for
+    :type vod: twitcharchiver.vod.Vod
+    """
+    _limiter = BandwidthLimiter.get_global_limiter()
+    if _limiter:
+        _delay = _limiter.reserve(size, vod)
+        if _delay:
+            sleep(_delay)
+
+
+async def limit_bandwidth_async(size: int, vod: "Vod" = None) -> None:
+    """Wait as required by the global bandwidth limiter (if any) after downloading the given number of bytes.
+
+    The running event loop isn't blocked while waiting.
+
+    :param size: number of bytes downloaded
+    :param vod: VOD the bytes were downloaded for
+    :type vod: twitcharchiver.vod.Vod
+    """
+    _limiter = BandwidthLimiter.get_global_limiter()
+    if _limiter:
+        _delay = _limiter.reserve(size, vod)
+        if _delay:
+            await asyncio.sleep(_delay)
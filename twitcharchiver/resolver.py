@@ -0,0 +1,187 @@
+"""Module for retrieving the metadata of many VODs at once."""
+
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from twitcharchiver.api import GQL_BATCH_SIZE, Api
+from twitcharchiver.channel import Channel
+from twitcharchiver.exceptions import RequestError, TwitchAPIError
+from twitcharchiver.vod import Vod
+
+# default number of batched requests which may be in progress at once
+MAX_RESOLVE_REQUESTS = 4
+
+# GQL operations fetched for each VOD, the rest are fetched individually when needed
+RESOLVE_OPERATIONS = ("metadata", "streaming")
+
+
+class VodResolver:
+    """Retrieves the metadata of many VODs with batched GQL requests, several of which are sent at once.
+
+    VODs are returned in the order requested as soon as they are resolved, so downloads can begin while later VODs are
+    still being fetched. Only a limited number of batches are fetched ahead of the VODs which have been returned.
+
+    VODs which can't be retrieved are logged and skipped without affecting the others. VODs belonging to the same
+    channel share a single Channel, so each channel is only fetched once.
+    """
+
+    _log = logging.getLogger()
+
+    def __init__(
+        self,
+        max_requests: int = MAX_RESOLVE_REQUESTS,
+        batch_size: int = GQL_BATCH_SIZE // len(RESOLVE_OPERATIONS),
+    ) -> None:
+        """Class constructor.
+
+        :param max_requests: number of batched requests which may be in progress at once
+        :param batch_size: number of VODs retrieved in each request
+        """
+        self.max_requests: int = max(1, max_requests)
+        self.batch_size: int = max(1, batch_size)
+
+        self._api: Api = Api()
+        self._channels: dict[int, Channel] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, vod_ids: list) -> Iterator[Vod]:
+        """Generate a Vod with its metadata filled for each VOD ID, skipping any which couldn't be retrieved.
+
+        :param vod_ids: IDs of VODs to retrieve, in the order they should be returned
+        :type vod_ids: list[int or str]
+        :return: generator of resolved VODs
+        :rtype: collections.abc.Iterator[Vod]
+        """
+        _vod_ids = [int(_v) for _v in vod_ids]
+        _batches = iter(
+            [
+                _vod_ids[_i : _i + self.batch_size]
+                for _i in range(0, len(_vod_ids), self.batch_size)
+            ]
+        )
+
+        _pool = ThreadPoolExecutor(max_workers=self.max_requests)
+        try:
+            _futures: deque[Future] = deque()
+
+            # keep a batch queued behind each request in progress
+            for _batch in _batches:
+                _futures.append(_pool.submit(self._resolve_batch, _batch))
+                if len(_futures) >= self.max_requests * 2:
+                    break
+
+            while _futures:
+                _resolved = _futures.popleft().result()
+
+                _batch = next(_batches, None)
+                if _batch:
+                    _futures.append(_pool.submit(self._resolve_batch, _batch))
+
+                yield from _resolved
+
+        finally:
+            _pool.shutdown(wait=False, cancel_futures=True)
+
+    def _resolve_batch(self, vod_ids: list[int]) -> list[Vod]:
+        """Retrieve the metadata of a batch of VODs in a single request.
+
+        :param vod_ids: IDs of VODs to retrieve
+        :return: VODs which were retrieved
+        :rtype: list[Vod]
+        """
+        _operations = []
+        for _vod_id in vod_ids:
+            _vod = Vod()
+            _vod.v_id = _vod_id
+            _vod_operations = _vod.gql_operations()
+            _operations.extend(_vod_operations[_name] for _name in RESOLVE_OPERATIONS)
+
+        try:
+            _results = self._api.gql_batch(_operations)
+
+        # VODs are retrieved individually instead
+        except (RequestError, TwitchAPIError) as err:
+            self._log.error(
+                "Failed to retrieve batch of %s VODs, retrying individually. Error: %s",
+                len(vod_ids),
+                err,
+            )
+            _results = [{} for _ in _operations]
+
+        _resolved = []
+        for _index, _vod_id in enumerate(vod_ids):
+            _start = _index * len(RESOLVE_OPERATIONS)
+            _vod = self._resolve_vod(
+                _vod_id,
+                dict(
+                    zip(
+                        RESOLVE_OPERATIONS,
+                        _results[_start : _start + len(RESOLVE_OPERATIONS)],
+                        strict=True,
+                    )
+                ),
+            )
+            if _vod:
+                _resolved.append(_vod)
+
+        self._log.debug("Resolved %s of %s VODs.", len(_resolved), len(vod_ids))
+        return _resolved
+
+    def _resolve_vod(self, vod_id: int, results: dict) -> Vod | None:
+        """Create a VOD from the results of its GQL operations.
+
+        :param vod_id: ID of VOD
+        :param results: dict of operation name and GQL operation result
+        :return: VOD, or None if it couldn't be retrieved
+        :rtype: Vod or None
+        """
+        try:
+            _vod = Vod.from_prefetched(vod_id, results)
+
+            _channel = self._get_channel(results.get("streaming"))
+            if _channel:
+                _vod.channel = _channel
+
+            return _vod
+
+        # VOD was likely deleted
+        except TypeError:
+            self._log.error(
+                "Failed to retrieve VOD %s, skipping. VOD was likely deleted.", vod_id
+            )
+
+        except (RequestError, TwitchAPIError) as err:
+            self._log.error(
+                "Failed to retrieve VOD %s, skipping. Error: %s", vod_id, err
+            )
+
+        return None
+
+    def _get_channel(self, result: dict) -> Channel | None:
+        """Fetch the channel which owns a VOD from the result of its streaming query.
+
+        Channels which have already been fetched are reused.
+
+        :param result: result of the VOD's streaming GQL operation
+        :return: channel, or None if the owner isn't known
+        :rtype: Channel or None
+        """
+        try:
+            _owner = result["data"]["video"]["owner"]
+
+        except (KeyError, TypeError):
+            return None
+
+        # some VODs may not have an owner
+        if not _owner:
+            return None
+
+        _channel_id = int(_owner["id"])
+        with self._lock:
+            if _channel_id not in self._channels:
+                self._channels[_channel_id] = Channel(channel_id=_channel_id)
+
+            return self._channels[_channel_id]
@@ -0,0 +1,279 @@
+"""Module for downloading the video of several VODs at once.
+
+VODs share a single concurrency budget and are post-processed in the background.
+"""
+
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from twitcharchiver.concurrency import AdaptiveConcurrency
+from twitcharchiver.ffmpeg import MAX_PROCESSES
+
+# default number of VODs which may be queueing segments at once
+MAX_ACTIVE_VODS = 1
+
+# number of downloaded VODs which may wait for post-processing before downloads are held back
+POST_PROCESS_QUEUE = 4
+
+
+class VodScheduler:
+    """Runs the archival of queued VODs so the download workers are never left idle between them.
+
+    Segment downloads of every VOD share a single pool of workers, and the next VOD is started as soon as the previous
+    one has queued all of its segments, so its downloads fill the workers freed while the previous VOD drains. VODs
+    which are only draining don't count towards the number of VODs allowed at once.
+    Downloaded VODs are handed to a PostProcessor, so merging runs in the background while the following VODs continue
+    downloading.
+
+    Video downloaders signal when they have queued all of their segments and when their download has finished with
+    segments_queued() and download_finished().
+    """
+
+    _log = logging.getLogger()
+
+    def __init__(
+        self,
+        threads: int,
+        max_vods: int = MAX_ACTIVE_VODS,
+        concurrency: AdaptiveConcurrency = None,
+    ) -> None:
+        """Class constructor.
+
+        :param threads: number of segments downloaded at once across all VODs
+        :param max_vods: number of VODs which may be queueing segments at once
+        :param concurrency: optional adaptive controller shared by the VODs, in which case its maximum is used for
+            the number of workers
+        """
+        self.threads: int = concurrency.maximum if concurrency else threads
+        self.max_vods: int = max(1, max_vods)
+
+        self._pool: ThreadPoolExecutor = None
+        self._cond = threading.Condition()
+        # admitted VODs which haven't yet queued all of their segments
+        self._queueing: set = set()
+        self._active: list = []
+        # exit code of the first VOD which exited, after which no more VODs are started
+        self._exit_code = None
+
+    def get_pool(self) -> ThreadPoolExecutor:
+        """Fetch the segment download workers shared by all VODs, creating them on first use.
+
+        :return: segment download workers
+        :rtype: ThreadPoolExecutor
+        """
+        with self._cond:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.threads)
+
+            return self._pool
+
+    def segments_queued(self, downloader: "Video") -> None:
+        """Record that a VOD has queued all of its known segments, allowing the next VOD to start.
+
+        :param downloader: video downloader
+        :type downloader: twitcharchiver.downloaders.video.Video
+        """
+        with self._cond:
+            if downloader in self._queueing:
+                self._queueing.discard(downloader)
+                self._cond.notify_all()
+
+    def download_finished(self, downloader: "Video") -> None:
+        """Record that a VOD has finished downloading, freeing its place if it hadn't queued all of its segments.
+
+        :param downloader: video downloader
+        :type downloader: twitcharchiver.downloaders.video.Video
+        """
+        with self._cond:
+            self._queueing.discard(downloader)
+            self._cond.notify_all()
+
+    def run(self, downloaders: list, job: Callable) -> None:
+        """Archive each VOD with the provided function.
+
+        Each VOD is started once fewer than `max_vods` VODs are still queueing segments, so with one VOD at a time the
+        next starts as soon as the previous VOD has queued all of its segments. Blocks until every started VOD has
+        finished.
+
+        :param downloaders: video downloaders to run, in order
+        :param job: function called with each downloader from a separate thread to download it
+        :raises SystemExit: if a VOD exited, once the VODs already running have finished
+        """
+        _threads: list[threading.Thread] = []
+        try:
+            for _downloader in downloaders:
+                with self._cond:
+                    self._cond.wait_for(self._can_start)
+                    if self._exit_code is not None:
+                        break
+
+                    self._queueing.add(_downloader)
+                    self._active.append(_downloader)
+
+                _thread = threading.Thread(
+                    target=self._run_job, args=(_downloader, job), daemon=True
+                )
+                _thread.start()
+                _threads.append(_thread)
+
+            for _thread in _threads:
+                _thread.join()
+
+        except KeyboardInterrupt:
+            self._log.debug("VOD scheduler caught interrupt, cancelling downloads...")
+            with self._cond:
+                _active = list(self._active)
+
+            # downloaders raise KeyboardInterrupt on their own thread so their lock files are removed
+            for _downloader in _active:
+                _downloader.cancel()
+
+            for _thread in _threads:
+                _thread.join()
+
+            raise
+
+        finally:
+            with self._cond:
+                _pool, self._pool = self._pool, None
+
+            if _pool:
+                _pool.shutdown(wait=False, cancel_futures=True)
+
+        if self._exit_code is not None:
+            raise SystemExit(self._exit_code)
+
+    def _can_start(self) -> bool:
+        return self._exit_code is not None or len(self._queueing) < self.max_vods
+
+    def _run_job(self, downloader: "Video", job: Callable) -> None:
+        """Run the archival of a single VOD, recording if it exited.
+
+        :param downloader: video downloader
+        :param job: function called to download the VOD
+        """
+        try:
+            job(downloader)
+
+        # errors are handled by the job, which exits on unrecoverable ones
+        except SystemExit as exc:
+            with self._cond:
+                if self._exit_code is None:
+                    self._exit_code = exc.code
+
+        finally:
+            self.download_finished(downloader)
+            with self._cond:
+                self._active.remove(downloader)
+
+
+class PostProcessor:
+    """Pool of worker threads which merge, convert and clean up downloaded VODs.
+
+    This lets the next VOD download while FFmpeg runs. Downloaders hand over finished VODs through a bounded queue
+    along with the context (lock file and database insertion) they were downloaded in, which is only closed once
+    post-processing has finished.
+
+    FFmpeg runs in its own process, so the workers only wait on it. The number of workers matches the number of
+    FFmpeg processes allowed at once.
+    """
+
+    _log = logging.getLogger()
+
+    def __init__(
+        self,
+        job: Callable,
+        workers: int = MAX_PROCESSES,
+        max_queued: int = POST_PROCESS_QUEUE,
+    ) -> None:
+        """Class constructor.
+
+        :param job: function called with (downloader, context) to post-process a VOD, which must close the context
+        :param workers: number of post-processing workers
+        :param max_queued: maximum number of downloaded VODs waiting to be post-processed
+        """
+        self._job = job
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queued))
+        self._workers = [
+            threading.Thread(target=self._run) for _ in range(max(1, workers))
+        ]
+        self._started: bool = False
+        # exit code of the first job which exited
+        self.exit_code = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the post-processing workers."""
+        self._started = True
+        for _w in self._workers:
+            _w.start()
+
+    def put(self, downloader: "Video", context: ExitStack) -> None:
+        """Queue a downloaded VOD to be post-processed, blocking while the queue is full.
+
+        :param downloader: downloader which has finished downloading
+        :type downloader: twitcharchiver.downloader.Downloader
+        :param context: context the VOD was downloaded in, closed once post-processing finishes
+        """
+        self._queue.put((downloader, context))
+
+    def stop(self, cancel: bool = False) -> None:
+        """Wait for all queued VODs to be post-processed before stopping the workers.
+
+        :param cancel: whether VODs which haven't started post-processing are abandoned instead, closing their
+            context as failed so they aren't added to the database
+        """
+        if cancel:
+            self._cancel_queued()
+
+        if not self._started:
+            return
+
+        for _ in self._workers:
+            self._queue.put(None)
+
+        for _w in self._workers:
+            _w.join()
+
+        self._started = False
+
+    def _cancel_queued(self) -> None:
+        while True:
+            try:
+                _item = self._queue.get_nowait()
+
+            except queue.Empty:
+                return
+
+            if _item is not None:
+                _downloader, _context = _item
+                self._log.debug(
+                    "Abandoning post-processing of VOD %s.", _downloader.vod
+                )
+                _exc = KeyboardInterrupt()
+                _context.__exit__(type(_exc), _exc, None)
+
+            self._queue.task_done()
+
+    def _run(self) -> None:
+        while True:
+            _item = self._queue.get()
+            if _item is None:
+                self._queue.task_done()
+                break
+
+            try:
+                self._job(*_item)
+
+            # errors are handled by the job, which exits on unrecoverable ones
+            except SystemExit as exc:
+                with self._lock:
+                    if self.exit_code is None:
+                        self.exit_code = exc.code
+
+            finally:
+                self._queue.task_done()
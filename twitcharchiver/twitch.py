@@ -3,6 +3,8 @@ Class for storing various basic objects used for information handling.
 """
 
 import re
+import threading
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 import m3u8
@@ -243,6 +245,9 @@ class Segment:
     A segment of a video is a portion of it described with a position from the start, and a duration.
     """
 
+    # a VOD can have tens of thousands of segments, so attributes are stored without a per-instance dict
+    __slots__ = ("position", "duration")
+
     def __init__(self, position: float = 0.0, duration: float = 0.0):
         """
         Class constructor.
@@ -269,6 +274,8 @@ class MpegSegment(Segment):
     provides useful methods for handling them.
     """
 
+    __slots__ = ("muted", "id", "url")
+
     def __init__(
         self,
         segment_id: int() = 0,
@@ -362,3 +369,182 @@ class MpegSegment(Segment):
         Generates a path based on the segment's ID and a provided base path
         """
         return Path(base_path, self.id_padded() + ".ts")
+
+
+class SegmentSet:
+    """Set of MpegSegment ids stored as a bitmap.
+
+    One bit is used per segment up to the highest id rather than an object per segment, so finding missing segments
+    of even very long VODs only requires scanning a few kilobytes. Segments or their ids can be added and checked
+    for, with iteration returning ids in ascending order.
+
+    Segments are added and removed by the download and move workers of a VOD at once, so changes are made while
+    holding a lock.
+    """
+
+    __slots__ = ("_bits", "_count", "_lock")
+
+    def __init__(self, segments: Iterable = ()) -> None:
+        """Class constructor.
+
+        :param segments: MpegSegments or segment ids to add
+        :type segments: Iterable[MpegSegment or int]
+        """
+        self._bits: bytearray = bytearray()
+        self._count: int = 0
+        self._lock = threading.Lock()
+        self.update(segments)
+
+    def __getstate__(self) -> tuple[bytearray, int]:
+        """Copy the state to be pickled, leaving out the lock which can't be passed to a separate process."""
+        return self._bits, self._count
+
+    def __setstate__(self, state: tuple[bytearray, int]) -> None:
+        """Restore pickled state, creating a new lock."""
+        self._bits, self._count = state
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Format the set with its segment ids."""
+        return f"SegmentSet({list(self)})"
+
+    def __len__(self) -> int:
+        """Count the segments in the set."""
+        return self._count
+
+    def __contains__(self, segment: MpegSegment | int) -> bool:
+        """Check whether a segment or segment id is in the set."""
+        _id = self._get_id(segment)
+        if _id < 0 or _id >> 3 >= len(self._bits):
+            return False
+
+        return bool(self._bits[_id >> 3] & (1 << (_id & 7)))
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the segment ids in ascending order."""
+        for _byte_index, _byte in enumerate(self._bits):
+            if not _byte:
+                continue
+
+            for _bit in range(8):
+                if _byte & (1 << _bit):
+                    yield (_byte_index << 3) | _bit
+
+    def __eq__(self, other: object) -> bool:
+        """Compare two sets by the segment ids they contain."""
+        if isinstance(other, SegmentSet):
+            return self._bits.rstrip(b"\x00") == other._bits.rstrip(b"\x00")
+
+        return NotImplemented
+
+    @staticmethod
+    def _get_id(segment: MpegSegment | int) -> int:
+        if isinstance(segment, int):
+            return segment
+
+        return segment.id
+
+    def add(self, segment: MpegSegment | int) -> None:
+        """Add a segment to the set.
+
+        :param segment: MpegSegment or segment id
+        """
+        _id = self._get_id(segment)
+        if _id < 0:
+            raise ValueError(f"Invalid segment id {_id}.")
+
+        _index = _id >> 3
+        _mask = 1 << (_id & 7)
+        with self._lock:
+            if _index >= len(self._bits):
+                self._bits.extend(bytes(_index + 1 - len(self._bits)))
+
+            if not self._bits[_index] & _mask:
+                self._bits[_index] |= _mask
+                self._count += 1
+
+    def update(self, segments: Iterable) -> None:
+        """Add multiple segments to the set.
+
+        :param segments: MpegSegments or segment ids
+        """
+        for _segment in segments:
+            self.add(_segment)
+
+    def discard(self, segment: MpegSegment | int) -> None:
+        """Remove a segment from the set if present.
+
+        :param segment: MpegSegment or segment id
+        """
+        with self._lock:
+            self._discard(self._get_id(segment))
+
+    def remove(self, segment: MpegSegment | int) -> None:
+        """Remove a segment from the set.
+
+        :param segment: MpegSegment or segment id
+        :raises KeyError: if the segment isn't in the set
+        """
+        _id = self._get_id(segment)
+        with self._lock:
+            if not self._discard(_id):
+                raise KeyError(_id)
+
+    def _discard(self, segment_id: int) -> bool:
+        """Remove a segment id from the set if present. Must be called with the lock held.
+
+        :param segment_id: id of segment
+        :return: True if the segment was in the set
+        :rtype: bool
+        """
+        if segment_id not in self:
+            return False
+
+        self._bits[segment_id >> 3] &= ~(1 << (segment_id & 7)) & 0xFF
+        self._count -= 1
+        return True
+
+    def clear(self) -> None:
+        """Remove all segments from the set."""
+        with self._lock:
+            self._bits = bytearray()
+            self._count = 0
+
+    def max(self) -> int | None:
+        """Fetch the highest segment id in the set.
+
+        :return: highest id, or None if the set is empty
+        :rtype: int or None
+        """
+        _bits = self._bits.rstrip(b"\x00")
+        if not _bits:
+            return None
+
+        return ((len(_bits) - 1) << 3) | (_bits[-1].bit_length() - 1)
+
+    def missing(self, stop: int = None) -> list[int]:
+        """Find the ids missing from the set, skipping over full bytes of the bitmap.
+
+        :param stop: id to search up to (exclusive), defaulting to the highest id in the set
+        :return: missing ids in ascending order
+        :rtype: list[int]
+        """
+        if stop is None:
+            _max = self.max()
+            stop = 0 if _max is None else _max + 1
+
+        _missing = []
+        for _byte_index in range((stop + 7) >> 3):
+            _byte = self._bits[_byte_index] if _byte_index < len(self._bits) else 0
+            if _byte == 0xFF:
+                continue
+
+            for _bit in range(8):
+                _id = (_byte_index << 3) | _bit
+                if _id >= stop:
+                    break
+
+                if not _byte & (1 << _bit):
+                    _missing.append(_id)
+
+        return _missing
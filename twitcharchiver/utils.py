@@ -2,6 +2,7 @@
 Various utility functions for modifying, retrieving and saving information.
 """
 
+import errno
 import hashlib
 import json
 import logging
@@ -16,9 +17,11 @@ from itertools import groupby
 from math import ceil, floor
 from pathlib import Path
 from textwrap import dedent
+from typing import BinaryIO
 
 import requests
 
+from twitcharchiver.mpegts import TsValidator
 from twitcharchiver.twitch import Chapters
 
 log = logging.getLogger()
@@ -177,6 +180,22 @@ def convert_to_seconds(duration):
     return int()
 
 
+def convert_to_bytes(size: str | int) -> int:
+    """Convert a given size with an optional K, M or G suffix (e.g 500K, 2.5M) to bytes.
+
+    :param size: size to be converted
+    :return: size in bytes
+    :raises ValueError: if the size can't be parsed
+    """
+    size = str(size).strip().upper().removesuffix("B")
+    multiplier = {"K": 1024, "M": 1024**2, "G": 1024**3}.get(size[-1:], 1)
+
+    if multiplier != 1:
+        size = size[:-1]
+
+    return int(float(size) * multiplier)
+
+
 def convert_to_hms(seconds):
     """Converts a given time in seconds to the format HHhMMmSSs.
 
@@ -375,15 +394,57 @@ def send_push(pushbullet_key, title, body=""):
         log.error("Error sending push. Error: %s", exc)
 
 
+def new_hash(algorithm: str = None) -> tuple[str, object]:
+    """Create a hash object for segment checksums.
+
+    xxHash is used if installed, otherwise BLAKE2, falling back to MD5 if neither is available.
+
+    :param algorithm: name of algorithm to use instead of the fastest available ('xxh3_128', 'blake2b' or 'md5')
+    :return: name of the algorithm used, and hash object
+    :rtype: tuple[str, Any]
+    """
+    if algorithm in (None, "xxh3_128"):
+        try:
+            import xxhash
+
+            return "xxh3_128", xxhash.xxh3_128()
+
+        except ImportError:
+            if algorithm:
+                raise
+
+    if algorithm in (None, "blake2b") and hasattr(hashlib, "blake2b"):
+        return "blake2b", hashlib.blake2b(digest_size=16)
+
+    if algorithm not in (None, "md5"):
+        raise ValueError(f"Hash algorithm {algorithm} is unavailable.")
+
+    return "md5", hashlib.md5()
+
+
+def hash_algorithm(digest: str) -> str:
+    """Retrieve the algorithm used to create a hash returned by get_hash() or HashingWriter.
+
+    Hashes without an algorithm were created with MD5 by older versions.
+
+    :param digest: hash of a file
+    :return: name of algorithm
+    :rtype: str
+    """
+    _algorithm, _, _hex = digest.rpartition(":")
+    return _algorithm or "md5"
+
+
 # reference:
 #   https://www.geeksforgeeks.org/compare-two-files-using-hashing-in-python/
-def get_hash(file):
-    """Retrieves the hash for a given file.
+def get_hash(file: Path, algorithm: str = None) -> str:
+    """Retrieve the hash for a given file.
 
     :param file: path to file to hash
-    :return: hash of provided file
+    :param algorithm: name of algorithm to use instead of the fastest available
+    :return: hash of provided file, prefixed with the algorithm used
     """
-    f_hash = hashlib.md5()
+    _algorithm, f_hash = new_hash(algorithm)
 
     with open(Path(file), "rb") as f:
         while True:
@@ -395,7 +456,292 @@ def get_hash(file):
 
             f_hash.update(_d)
 
-        return f_hash.hexdigest()
+        return f"{_algorithm}:{f_hash.hexdigest()}"
+
+
+def hashes_match(digest: str, file: Path, other_digest: str = None) -> bool:
+    """Check if a file matches a hash.
+
+    The file is only read if its hash isn't known or was created with a different algorithm.
+
+    :param digest: hash to compare against
+    :param file: path to file
+    :param other_digest: recorded hash of the file, if known
+    :return: True if the hashes match
+    :rtype: bool
+    """
+    if not other_digest or hash_algorithm(other_digest) != hash_algorithm(digest):
+        other_digest = get_hash(file, hash_algorithm(digest))
+
+    return digest.rpartition(":")[2] == other_digest.rpartition(":")[2]
+
+
+class HashingWriter:
+    """Binary file which hashes data as it is written, so the hash of a file is known without reading it back.
+
+    Data can also be passed to a validator as it is written, such as to check a segment for corruption. Truncating the
+    file rehashes (and validates again) the data which is kept.
+    """
+
+    def __init__(self, file: Path, validator: TsValidator = None) -> None:
+        """Class constructor, opens the file for writing.
+
+        :param file: path to file
+        :param validator: optional validator which is updated with the data written to the file
+        """
+        self.name = str(file)
+        self.validator = validator
+        self._file = open(file, "wb")
+        self._algorithm, self._hash = new_hash()
+        # number of bytes which have been hashed
+        self._hashed: int = 0
+
+    def __enter__(self) -> "HashingWriter":
+        """Enter the runtime context, returning the file."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the file."""
+        self.close()
+
+    def write(self, data: bytes) -> int:
+        """Write data to the end of the file, updating the hash.
+
+        :param data: data to write
+        :return: number of bytes written
+        :rtype: int
+        """
+        if self._file.tell() != self._hashed:
+            self._file.seek(self._hashed)
+
+        self._hash.update(data)
+        if self.validator is not None:
+            self.validator.update(data)
+
+        self._hashed += len(data)
+        return self._file.write(data)
+
+    def truncate(self, size: int = None) -> int:
+        """Truncate the file, by default to the current position.
+
+        :param size: size to truncate the file to
+        :return: new size of the file
+        :rtype: int
+        """
+        _size = self._file.truncate(size)
+        if _size < self._hashed:
+            self._rehash(_size)
+
+        return _size
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Move the position of the file. Data written after seeking back is hashed from the end of the file.
+
+        :param offset: offset to move to
+        :param whence: position the offset is relative to
+        :return: new position of the file
+        :rtype: int
+        """
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        """Retrieve the current position of the file.
+
+        :return: position of the file
+        :rtype: int
+        """
+        return self._file.tell()
+
+    def flush(self) -> None:
+        """Flush written data to the file."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+    def hexdigest(self) -> str:
+        """Retrieve the hash of the data written to the file.
+
+        :return: hash prefixed with the algorithm used, matching get_hash()
+        :rtype: str
+        """
+        return f"{self._algorithm}:{self._hash.hexdigest()}"
+
+    def _rehash(self, size: int) -> None:
+        """Rehash the start of the file after it is truncated.
+
+        :param size: number of bytes to hash
+        """
+        _, self._hash = new_hash(self._algorithm)
+        self._hashed = 0
+        if self.validator is not None:
+            self.validator.reset()
+
+        if not size:
+            return
+
+        _position = self._file.tell()
+        self._file.flush()
+        with open(self.name, "rb") as _f:
+            while self._hashed < size:
+                _d = _f.read(min(65536, size - self._hashed))
+                if not _d:
+                    break
+
+                self._hash.update(_d)
+                if self.validator is not None:
+                    self.validator.update(_d)
+
+                self._hashed += len(_d)
+
+        self._file.seek(_position)
+
+
+# ioctl request for cloning a range of one file into another (FICLONERANGE from linux/fs.h)
+FICLONERANGE = 0x4020940D
+
+# size of the chunks read when copying through Python
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# errors returned when a copy method isn't supported for the given files, in which case the next is tried
+_UNSUPPORTED_COPY_ERRORS = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EXDEV,
+}
+
+
+def append_file(src_file: Path, dst: BinaryIO, methods: list = None) -> int:
+    """Append the contents of a file to a file opened for writing, copying within the kernel where possible.
+
+    On Linux, data is reflinked (shared rather than copied) if both files are on the same copy-on-write filesystem
+    such as btrfs or XFS and the destination is block-aligned, otherwise copy_file_range() or sendfile() is used.
+    Copying through Python is used as a fallback on other platforms or if none of these are supported. If a method
+    copies less than the whole file, the rest is copied by the next method.
+
+    :param src_file: path to file to append
+    :param dst: binary file opened for writing (but not appending), positioned where the data is written
+    :param methods: copy functions to try in order, defaults to all
+    :return: number of bytes appended
+    :rtype: int
+    :raises OSError: if the whole file couldn't be appended, such as if it was truncated while being copied
+    """
+    if methods is None:
+        methods = [_reflink, _copy_file_range, _sendfile, _copy_buffered]
+
+    dst.flush()
+    _offset = dst.tell()
+    _copied = 0
+    with open(src_file, "rb") as _src:
+        _size = os.fstat(_src.fileno()).st_size
+        for _method in methods:
+            try:
+                _copied += _method(
+                    _src, dst, _copied, _offset + _copied, _size - _copied
+                )
+
+            except OSError as exc:
+                if exc.errno not in _UNSUPPORTED_COPY_ERRORS or _method is methods[-1]:
+                    raise
+
+            if _copied >= _size:
+                break
+
+    dst.seek(_offset + _copied)
+    if _copied < _size:
+        raise OSError(
+            errno.EIO, f"Only {_copied} of {_size} bytes of {src_file} were appended."
+        )
+
+    return _copied
+
+
+def _reflink(
+    src: BinaryIO, dst: BinaryIO, src_offset: int, dst_offset: int, size: int
+) -> int:
+    """Clone the rest of the source file into the destination at the given offset."""
+    try:
+        import fcntl
+        import struct
+    except ImportError as exc:
+        raise OSError(errno.ENOSYS, "Reflinks are not supported.") from exc
+
+    # struct file_clone_range {s64 src_fd; u64 src_offset; u64 src_length; u64 dest_offset;}, length 0 is until EOF
+    fcntl.ioctl(
+        dst.fileno(),
+        FICLONERANGE,
+        struct.pack("qQQQ", src.fileno(), src_offset, 0, dst_offset),
+    )
+    return size
+
+
+def _copy_file_range(
+    src: BinaryIO, dst: BinaryIO, src_offset: int, dst_offset: int, size: int
+) -> int:
+    """Copy part of the source file into the destination at the given offset with copy_file_range()."""
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range() is not supported.")
+
+    _copied = 0
+    while _copied < size:
+        _n = os.copy_file_range(
+            src.fileno(),
+            dst.fileno(),
+            size - _copied,
+            src_offset + _copied,
+            dst_offset + _copied,
+        )
+        # nothing more could be copied, e.g. as the source was truncated while copying
+        if _n == 0:
+            break
+
+        _copied += _n
+
+    return _copied
+
+
+def _sendfile(
+    src: BinaryIO, dst: BinaryIO, src_offset: int, dst_offset: int, size: int
+) -> int:
+    """Copy part of the source file into the destination at the given offset with sendfile()."""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.ENOSYS, "sendfile() to files is not supported.")
+
+    os.lseek(dst.fileno(), dst_offset, os.SEEK_SET)
+    _copied = 0
+    while _copied < size:
+        _n = os.sendfile(
+            dst.fileno(), src.fileno(), src_offset + _copied, size - _copied
+        )
+        if _n == 0:
+            break
+
+        _copied += _n
+
+    return _copied
+
+
+def _copy_buffered(
+    src: BinaryIO, dst: BinaryIO, src_offset: int, dst_offset: int, size: int
+) -> int:
+    """Copy part of the source file into the destination at the given offset through Python."""
+    src.seek(src_offset)
+    dst.seek(dst_offset)
+    _copied = 0
+    while _copied < size:
+        _d = src.read(min(COPY_BUFFER_SIZE, size - _copied))
+        if not _d:
+            break
+
+        dst.write(_d)
+        _copied += len(_d)
+
+    dst.flush()
+    return _copied
 
 
 # reference:
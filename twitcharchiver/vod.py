@@ -5,16 +5,19 @@ Class for retrieving and storing a Twitch VOD and its associated information.
 import logging
 from datetime import datetime, timezone
 from random import randrange
-from time import sleep
+from time import monotonic, sleep
 
 import m3u8
 
-from twitcharchiver.api import Api
+from twitcharchiver.api import GQL_CLIENT_ID, GQL_URL, Api
 from twitcharchiver.channel import Channel
-from twitcharchiver.exceptions import TwitchAPIErrorForbidden, TwitchAPIError
+from twitcharchiver.exceptions import TwitchAPIError, TwitchAPIErrorForbidden
 from twitcharchiver.twitch import Category, Chapters, MpegSegment
 from twitcharchiver.utils import parse_twitch_timestamp, time_since_date
 
+# seconds for which prefetched GQL results are used before being fetched again
+PREFETCH_MAX_AGE = 60
+
 
 class Vod:
     """
@@ -48,6 +51,10 @@ class Vod:
 
         self._channel = Channel()
 
+        # results of GQL operations fetched together by prefetch()
+        self._prefetched: dict[str, dict] = {}
+        self._prefetched_at: float = 0
+
         if vod_id:
             self._setup(vod_id)
 
@@ -90,6 +97,7 @@ class Vod:
         :param vod_id: VOD ID of VOD
         """
         self.v_id = int(vod_id)
+        self.prefetch()
         self._fetch_metadata()
 
     def _parse_dict(self, vod_info: dict):
@@ -128,17 +136,105 @@ class Vod:
         if "broadcastType" in vod_info.keys():
             self.type = vod_info["broadcastType"]
 
+    def gql_operations(self) -> dict[str, dict]:
+        """Generate the GQL operations used to retrieve information about the VOD.
+
+        :return: dict of operation name and GQL operation
+        :rtype: dict[str, dict]
+        """
+        return {
+            "metadata": Api.gql_operation(
+                "VideoMetadata",
+                "45111672eea2e507f8ba44d101a61862f9c56b11dee09a15634cb75cb9b9084d",
+                # video is looked up by ID alone, so the channel isn't fetched just for its name
+                {"channelLogin": self._channel.name, "videoID": str(self.v_id)},
+            ),
+            "streaming": Api.gql_operation(
+                "ComscoreStreamingQuery",
+                "e1edae8122517d013405f237ffcc124515dc6ded82480a88daef69c83b53ac01",
+                {
+                    "channel": "",
+                    "clipSlug": "",
+                    "isClip": False,
+                    "isLive": False,
+                    "isVodOrCollection": True,
+                    "vodID": str(self.v_id),
+                },
+            ),
+            "chapters": Api.gql_operation(
+                "VideoPlayer_ChapterSelectButtonVideo",
+                "8d2793384aac3773beab5e59bd5d6f585aedb923d292800119e03d40cd0f9b41",
+                {"includePrivate": False, "videoID": str(self.v_id)},
+            ),
+            "muted_segments": Api.gql_operation(
+                "VideoPlayer_MutedSegmentsAlertOverlay",
+                "c36e7400657815f4704e6063d265dff766ed8fc1590361c6d71e4368805e0b49",
+                {"includePrivate": False, "vodID": str(self.v_id)},
+            ),
+            "seek_preview": Api.gql_operation(
+                "VideoPlayer_VODSeekbarPreviewVideo",
+                "07e99e4d56c5a7c67117a154777b0baf85a5ffefa393b213f4bc712ccaf85dd6",
+                {"includePrivate": False, "videoID": str(self.v_id)},
+            ),
+            "access_token": {
+                "query": f'{{videoPlaybackAccessToken(id: "{self.v_id}", params: {{platform: "web", '
+                f'playerBackend: "mediaplayer", playerType: "site"}}) {{signature value}} }}'
+            },
+        }
+
+    def prefetch(self) -> None:
+        """Retrieve the results of all GQL operations used for the VOD in a single request.
+
+        Results are used in place of individual requests for PREFETCH_MAX_AGE seconds, with any operations which failed
+        being requested again individually when needed.
+        """
+        if not self.v_id:
+            return
+
+        _operations = self.gql_operations()
+        _results = self._api.gql_batch(list(_operations.values()), attempts=1)
+        self.set_prefetched(dict(zip(_operations.keys(), _results, strict=True)))
+
+    def set_prefetched(self, results: dict) -> None:
+        """Store results of the VOD's GQL operations which were fetched together, ignoring any which failed.
+
+        :param results: dict of operation name from gql_operations() and GQL operation result
+        """
+        self._prefetched = {
+            _name: _result
+            for _name, _result in results.items()
+            if _result and "errors" not in _result.keys()
+        }
+        self._prefetched_at = monotonic()
+
+    def _query(self, name: str) -> dict:
+        """Retrieve the result of one of the VOD's GQL operations, using the prefetched result if recent.
+
+        :param name: name of operation from gql_operations()
+        :return: GQL operation result
+        :rtype: dict
+        """
+        if (
+            name in self._prefetched
+            and monotonic() - self._prefetched_at < PREFETCH_MAX_AGE
+        ):
+            return self._prefetched[name]
+
+        _operation = self.gql_operations()[name]
+
+        # access token uses a plain query which is posted alone
+        if "query" in _operation.keys():
+            return self._api.post_request(
+                GQL_URL, j=_operation, h={"Client-Id": GQL_CLIENT_ID}
+            ).json()
+
+        return self._api.gql_query(_operation)
+
     def _fetch_metadata(self):
         """
         Retrieves metadata for a given VOD ID. Formatting is done to ensure backwards compatibility.
         """
-        _r = self._api.gql_request(
-            "VideoMetadata",
-            "45111672eea2e507f8ba44d101a61862f9c56b11dee09a15634cb75cb9b9084d",
-            {"channelLogin": self.channel.name, "videoID": str(self.v_id)},
-        )
-
-        _vod_info = _r.json()[0]["data"]["video"]
+        _vod_info = self._query("metadata")["data"]["video"]
         self._parse_dict(_vod_info)
 
         self._log.debug("Filled metadata for VOD %s: %s", self.v_id, self.to_dict())
@@ -158,6 +254,9 @@ class Vod:
         """
         Refreshes metadata for VOD.
         """
+        # cached results are removed as they change while the VOD is live
+        self._prefetched.pop("metadata", None)
+        self._api.invalidate_cache(self.v_id)
         try:
             self._fetch_metadata()
 
@@ -189,20 +288,7 @@ class Vod:
         :return: name of category / game
         :rtype: Category
         """
-        _r = self._api.gql_request(
-            "ComscoreStreamingQuery",
-            "e1edae8122517d013405f237ffcc124515dc6ded82480a88daef69c83b53ac01",
-            {
-                "channel": "",
-                "clipSlug": "",
-                "isClip": False,
-                "isLive": False,
-                "isVodOrCollection": True,
-                "vodID": str(self.v_id),
-            },
-        )
-
-        _vod_category = Category(_r.json()[0]["data"]["video"]["game"])
+        _vod_category = Category(self._query("streaming")["data"]["video"]["game"])
         self._log.debug("Category for VOD %s is %s", self.v_id, _vod_category)
 
         return _vod_category
@@ -231,6 +317,7 @@ class Vod:
                 self.v_id,
                 self.channel.name,
             )
+            self._api.invalidate_cache(self.v_id)
             return True
 
         # fallback to stream created time matching vod created time
@@ -251,6 +338,7 @@ class Vod:
                         self.created_at,
                         _stream_created_time,
                     )
+                    self._api.invalidate_cache(self.v_id)
                     return True
 
             except IndexError:
@@ -289,18 +377,11 @@ class Vod:
             return _chapters
 
         try:
-            _r = self._api.gql_request(
-                "VideoPlayer_ChapterSelectButtonVideo",
-                "8d2793384aac3773beab5e59bd5d6f585aedb923d292800119e03d40cd0f9b41",
-                {"includePrivate": False, "videoID": str(self.v_id)},
-            )
+            _r = self._query("chapters")
 
             # extract and return list of moments from returned json
             _chapters = Chapters(
-                [
-                    node["node"]
-                    for node in _r.json()[0]["data"]["video"]["moments"]["edges"]
-                ]
+                [node["node"] for node in _r["data"]["video"]["moments"]["edges"]]
             )
 
             if _chapters:
@@ -331,13 +412,8 @@ class Vod:
         if not self.v_id:
             return []
 
-        _r = self._api.gql_request(
-            "VideoPlayer_MutedSegmentsAlertOverlay",
-            "c36e7400657815f4704e6063d265dff766ed8fc1590361c6d71e4368805e0b49",
-            {"includePrivate": False, "vodID": str(self.v_id)},
-        )
-
-        _segments = _r.json()[0]["data"]["video"]["muteInfo"]["mutedSegmentConnection"]
+        _r = self._query("muted_segments")
+        _segments = _r["data"]["video"]["muteInfo"]["mutedSegmentConnection"]
 
         if _segments:
             _muted_segments = [
@@ -360,22 +436,11 @@ class Vod:
         if not self.v_id:
             return Channel()
 
-        _r = self._api.gql_request(
-            "ComscoreStreamingQuery",
-            "e1edae8122517d013405f237ffcc124515dc6ded82480a88daef69c83b53ac01",
-            {
-                "channel": "",
-                "clipSlug": "",
-                "isClip": False,
-                "isLive": False,
-                "isVodOrCollection": True,
-                "vodID": str(self.v_id),
-            },
-        )
+        _owner = self._query("streaming")["data"]["video"]["owner"]
 
         # some VODs may not have an owner (1009197665), possibly due to channel name changes
-        if _r.json()[0]["data"]["video"]["owner"]:
-            return Channel(channel_id=_r.json()[0]["data"]["video"]["owner"]["id"])
+        if _owner:
+            return Channel(channel_id=_owner["id"])
 
         return Channel()
 
@@ -461,13 +526,7 @@ class Vod:
         :return: seek preview URL
         :rtype: str
         """
-        _r = self._api.gql_request(
-            "VideoPlayer_VODSeekbarPreviewVideo",
-            "07e99e4d56c5a7c67117a154777b0baf85a5ffefa393b213f4bc712ccaf85dd6",
-            {"includePrivate": False, "videoID": str(self.v_id)},
-        )
-
-        return _r.json()[0]["data"]["video"]["seekPreviewsURL"]
+        return self._query("seek_preview")["data"]["video"]["seekPreviewsURL"]
 
     def get_index_url(self, quality="best"):
         """
@@ -537,24 +596,14 @@ class Vod:
         :return: dictionary of playback access token values if any
         :rtype: dict
         """
-        # only accepts the default client ID for non-authenticated clients
-        _h = {"Client-Id": "ue6666qo983tsx6so1t0vnawi233wa"}
-        _q = (
-            f'{{videoPlaybackAccessToken(id: "{self.v_id}", params: {{platform: "web", playerBackend: "mediaplayer", '
-            f'playerType: "site"}}) {{signature value}} }}'
-        )
-
-        _r = self._api.post_request("https://gql.twitch.tv/gql", j={"query": _q}, h=_h)
-
-        _token = _r.json()["data"]["videoPlaybackAccessToken"]
+        _r = self._query("access_token")
+        _token = _r["data"]["videoPlaybackAccessToken"]
 
         if _token:
             self._log.debug("Token retrieved for VOD %s: %s", self.v_id, _token)
             return _token
 
-        self._log.debug(
-            "Token could not be retrieved for VOD %s: %s", self.v_id, _r.text
-        )
+        self._log.debug("Token could not be retrieved for VOD %s: %s", self.v_id, _r)
         return ""
 
     def get_index_playlist(self, index_url: str):
@@ -653,6 +702,24 @@ class Vod:
 
         return index_of_best
 
+    @staticmethod
+    def from_prefetched(vod_id: int, results: dict) -> "Vod":
+        """Generate a Vod object from results of its GQL operations which were fetched elsewhere.
+
+        This allows results to be fetched alongside those of other VODs.
+
+        :param vod_id: Numeric VOD ID of the archive
+        :param results: dict of operation name from gql_operations() and GQL operation result
+        :return: Vod with metadata filled
+        :rtype: Vod
+        """
+        _vod = Vod()
+        _vod.v_id = int(vod_id)
+        _vod.set_prefetched(results)
+        _vod._fetch_metadata()
+
+        return _vod
+
     @staticmethod
     def from_stream_json(stream_json: dict):
         """